@@ -6,12 +6,12 @@ A modern, interactive UI for generating personalized travel itineraries
 
 import streamlit as st
 from datetime import datetime, timedelta
+import importlib
+import itertools
 import os
-from pathlib import Path
+import threading
 import warnings
 from dotenv import load_dotenv
-from io import BytesIO
-import zipfile
 
 # Load environment variables
 load_dotenv()
@@ -19,7 +19,12 @@ load_dotenv()
 # Suppress warnings
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
-from ai_travel_agent.crew import AiTravelAgent
+# Only lightweight modules load up front so the page renders right away; the crew
+# stack (crewai, tools, icalendar, pytz) and the OpenAI SDK load on first use
+from ai_travel_agent.cache import AnswerCache, ResultCache, text_hash
+from ai_travel_agent.qa_context import build_messages, cache_history
+from ai_travel_agent.ui_theme import THEME_CSS
+from ai_travel_agent.workspace import RunWorkspace, prune_runs
 
 # Page configuration
 st.set_page_config(
@@ -30,358 +35,7 @@ st.set_page_config(
 )
 
 # Custom CSS for dark professional theme
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
-    
-    * {
-        font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
-    }
-    
-    /* Hide Streamlit branding */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    
-    /* Main app background */
-    .main {
-        background-color: #0f1419;
-    }
-    
-    /* Header styling - Dark theme */
-    .main-header {
-        background: linear-gradient(135deg, #1a1f2e 0%, #2d3748 100%);
-        padding: 2.5rem;
-        border-radius: 12px;
-        color: #e2e8f0;
-        text-align: center;
-        margin-bottom: 2rem;
-        border: 1px solid #2d3748;
-    }
-    
-    .main-header h1 {
-        margin: 0;
-        font-size: 2.5rem;
-        font-weight: 700;
-        letter-spacing: -0.5px;
-        color: #ffffff;
-    }
-    
-    .main-header p {
-        margin: 0.75rem 0 0 0;
-        font-size: 1.05rem;
-        opacity: 0.8;
-        font-weight: 400;
-        color: #94a3b8;
-    }
-    
-    /* Sidebar dark theme */
-    section[data-testid="stSidebar"] {
-        background-color: #1a1f2e;
-        border-right: 1px solid #2d3748;
-    }
-    
-    section[data-testid="stSidebar"] > div {
-        padding: 2rem 1rem;
-    }
-    
-    /* Sidebar headings */
-    section[data-testid="stSidebar"] h1 {
-        color: #ffffff;
-        font-size: 1.5rem;
-        font-weight: 700;
-        margin-bottom: 1.5rem;
-    }
-    
-    section[data-testid="stSidebar"] h3 {
-        color: #e2e8f0;
-        font-weight: 700;
-        margin-top: 0.5rem;
-    }
-    
-    /* Sidebar text */
-    section[data-testid="stSidebar"] label {
-        color: #cbd5e1;
-        font-weight: 600;
-        font-size: 0.9rem;
-    }
-    
-    section[data-testid="stSidebar"] p {
-        color: #94a3b8;
-    }
-    
-    /* Chat message styling - Dark theme */
-    .chat-message {
-        padding: 1.25rem 1.5rem;
-        border-radius: 10px;
-        margin-bottom: 1rem;
-        border: 1px solid #2d3748;
-        animation: fadeIn 0.3s ease-in;
-        line-height: 1.6;
-    }
-    
-    @keyframes fadeIn {
-        from { opacity: 0; transform: translateY(10px); }
-        to { opacity: 1; transform: translateY(0); }
-    }
-    
-    .user-message {
-        background-color: #1e293b;
-        border-left: 3px solid #3b82f6;
-        margin-left: 2rem;
-        color: #e2e8f0;
-        font-weight: 400;
-    }
-    
-    .assistant-message {
-        background-color: #1a2332;
-        border-left: 3px solid #10b981;
-        margin-right: 2rem;
-        color: #e2e8f0;
-        font-weight: 400;
-    }
-    
-    .system-message {
-        background-color: #1f2937;
-        border-left: 3px solid #f59e0b;
-        color: #e2e8f0;
-        font-weight: 400;
-    }
-    
-    .chat-message strong {
-        display: block;
-        margin-bottom: 0.5rem;
-        font-size: 0.75rem;
-        font-weight: 600;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-        opacity: 0.7;
-        color: #94a3b8;
-    }
-    
-    /* Button styling - Dark theme */
-    .stButton > button {
-        border-radius: 8px;
-        padding: 0.65rem 1.5rem;
-        font-weight: 600;
-        transition: all 0.2s ease;
-        border: 1px solid #2d3748;
-        font-size: 0.95rem;
-        width: 100%;
-        background-color: #1e293b;
-        color: #ffffff;
-    }
-    
-    .stButton > button:hover {
-        background-color: #334155;
-        border-color: #475569;
-        transform: translateY(-1px);
-    }
-    
-    /* Primary button */
-    button[kind="primary"] {
-        background-color: #3b82f6 !important;
-        color: white !important;
-        border: 1px solid #2563eb !important;
-    }
-    
-    button[kind="primary"]:hover {
-        background-color: #2563eb !important;
-        border-color: #1d4ed8 !important;
-    }
-    
-    /* Control section styling - Dark theme */
-    .control-header {
-        font-size: 0.85rem;
-        font-weight: 700;
-        color: #94a3b8;
-        margin: 1.5rem 0 1rem 0;
-        padding-bottom: 0.5rem;
-        border-bottom: 1px solid #2d3748;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-    }
-    
-    /* Stats box - Dark theme */
-    .stats-container {
-        background-color: #1e293b;
-        padding: 1.25rem;
-        border-radius: 10px;
-        margin-top: 1rem;
-        border: 1px solid #2d3748;
-        border-left: 3px solid #3b82f6;
-    }
-    
-    .stats-container h3 {
-        margin: 0 0 0.75rem 0;
-        font-size: 0.85rem;
-        font-weight: 700;
-        color: #cbd5e1;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-    }
-    
-    .stats-container p {
-        margin: 0.4rem 0;
-        font-size: 0.9rem;
-        color: #94a3b8;
-        font-weight: 400;
-    }
-    
-    .stats-container strong {
-        color: #e2e8f0;
-    }
-    
-    /* Info boxes - Dark theme */
-    .info-box {
-        background-color: #1e293b;
-        padding: 1.25rem;
-        border-radius: 10px;
-        border-left: 3px solid #10b981;
-        border: 1px solid #2d3748;
-        margin: 1rem 0;
-    }
-    
-    .success-box {
-        background-color: #1e293b;
-        padding: 1.75rem;
-        border-radius: 10px;
-        border: 1px solid #10b981;
-        margin: 1rem 0;
-    }
-    
-    /* Tab styling - Dark theme */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 8px;
-        background-color: #1a1f2e;
-        padding: 0.5rem;
-        border-radius: 10px;
-        border-bottom: 1px solid #2d3748;
-    }
-    
-    .stTabs [data-baseweb="tab"] {
-        border-radius: 8px;
-        padding: 0.75rem 1.5rem;
-        font-weight: 600;
-        color: #94a3b8;
-        background-color: transparent;
-    }
-    
-    .stTabs [data-baseweb="tab"][aria-selected="true"] {
-        background-color: #1e293b;
-        color: #e2e8f0;
-    }
-    
-    /* Input fields - Dark theme */
-    .stTextInput input, .stTextArea textarea, .stNumberInput input {
-        border-radius: 8px;
-        border: 1px solid #2d3748;
-        padding: 0.6rem;
-        font-size: 0.95rem;
-        background-color: #1e293b;
-        color: #e2e8f0;
-    }
-    
-    .stTextInput input:focus, .stTextArea textarea:focus, .stNumberInput input:focus {
-        border-color: #3b82f6;
-        box-shadow: 0 0 0 2px rgba(59, 130, 246, 0.2);
-        background-color: #1e293b;
-    }
-    
-    /* Expander - Dark theme */
-    .streamlit-expanderHeader {
-        background-color: #1e293b !important;
-        border-radius: 8px;
-        font-weight: 600;
-        border: 1px solid #2d3748 !important;
-        color: #e2e8f0 !important;
-    }
-    
-    .streamlit-expanderHeader:hover {
-        border-color: #3b82f6 !important;
-        background-color: #1e293b !important;
-    }
-    
-    /* Expander content */
-    .streamlit-expanderContent {
-        background-color: #1a1f2e !important;
-        border: 1px solid #2d3748;
-        border-top: none;
-        border-radius: 0 0 8px 8px;
-        padding: 1.5rem !important;
-    }
-    
-    /* Ensure all sidebar inputs are visible - Dark theme */
-    section[data-testid="stSidebar"] input,
-    section[data-testid="stSidebar"] textarea,
-    section[data-testid="stSidebar"] [data-baseweb="select"],
-    section[data-testid="stSidebar"] [data-baseweb="input"] {
-        background-color: #1e293b !important;
-        color: #e2e8f0 !important;
-        border: 1px solid #2d3748 !important;
-    }
-    
-    section[data-testid="stSidebar"] input:focus,
-    section[data-testid="stSidebar"] textarea:focus {
-        border-color: #3b82f6 !important;
-        background-color: #1e293b !important;
-        box-shadow: 0 0 0 2px rgba(59, 130, 246, 0.2) !important;
-    }
-    
-    /* Date picker in sidebar */
-    section[data-testid="stSidebar"] [data-testid="stDateInput"] > div > div {
-        background-color: #1e293b !important;
-        border-color: #2d3748 !important;
-    }
-    
-    section[data-testid="stSidebar"] [data-testid="stDateInput"] input {
-        color: #e2e8f0 !important;
-        background-color: #1e293b !important;
-    }
-    
-    /* Number input in sidebar */
-    section[data-testid="stSidebar"] [data-testid="stNumberInput"] input {
-        background-color: #1e293b !important;
-        color: #e2e8f0 !important;
-    }
-    
-    /* Sidebar dividers */
-    section[data-testid="stSidebar"] hr {
-        margin: 1.5rem 0;
-        border-color: #2d3748;
-    }
-    
-    /* Streamlit specific overrides for dark theme */
-    [data-testid="stMarkdownContainer"] {
-        color: #e2e8f0;
-    }
-    
-    .stMarkdown {
-        color: #e2e8f0;
-    }
-    
-    /* Alert boxes dark theme */
-    .stAlert {
-        background-color: #1e293b;
-        border: 1px solid #2d3748;
-        color: #e2e8f0;
-    }
-    
-    .stWarning {
-        background-color: #1e293b;
-        border-left: 3px solid #f59e0b;
-    }
-    
-    .stInfo {
-        background-color: #1e293b;
-        border-left: 3px solid #3b82f6;
-    }
-    
-    .stSuccess {
-        background-color: #1e293b;
-        border-left: 3px solid #10b981;
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(THEME_CSS, unsafe_allow_html=True)
 
 # Initialize session state
 def init_session_state():
@@ -396,6 +50,8 @@ def init_session_state():
         st.session_state.conversation_context = []
     if 'last_inputs' not in st.session_state:
         st.session_state.last_inputs = None
+    if 'artifacts' not in st.session_state:
+        st.session_state.artifacts = None
 
 def clear_session():
     """Clear all session data"""
@@ -404,77 +60,18 @@ def clear_session():
     st.session_state.current_itinerary = None
     st.session_state.conversation_context = []
     st.session_state.last_inputs = None
+    st.session_state.artifacts = None
     st.rerun()
 
-def rename_export_files(destination, start_date):
-    """Rename exported files to include destination and start date for uniqueness"""
-    # Clean up destination name for filename
-    clean_dest = destination.replace(', ', '_').replace(' ', '_')
-    date_prefix = start_date.replace('-', '')
-    
-    # Rename itinerary markdown file
-    old_itinerary = 'exports/travel_itinerary.md'
-    new_itinerary = f'exports/{date_prefix}_{clean_dest}_itinerary.md'
-    if os.path.exists(old_itinerary):
-        # Remove old file if it exists
-        if os.path.exists(new_itinerary):
-            os.remove(new_itinerary)
-        os.rename(old_itinerary, new_itinerary)
-    
-    # Rename calendar events text file
-    old_events = 'exports/calendar_events.txt'
-    new_events = f'exports/{date_prefix}_{clean_dest}_calendar_events.txt'
-    if os.path.exists(old_events):
-        # Remove old file if it exists
-        if os.path.exists(new_events):
-            os.remove(new_events)
-        os.rename(old_events, new_events)
-    
-    return new_itinerary, new_events
-
-def get_export_filenames(destination, start_date):
-    """Get the expected export filenames based on destination and start date"""
-    clean_dest = destination.replace(', ', '_').replace(' ', '_')
-    date_prefix = start_date.replace('-', '')
-    
-    return {
-        'itinerary': f'exports/{date_prefix}_{clean_dest}_itinerary.md',
-        'calendar_events': f'exports/{date_prefix}_{clean_dest}_calendar_events.txt',
-        'ics': f'exports/{clean_dest}_itinerary.ics'
-    }
-
 def create_download_zip():
-    """Create a ZIP file containing both itinerary and calendar files"""
-    destination = st.session_state.last_inputs.get('destination', 'itinerary').replace(', ', '_').replace(' ', '_')
-    start_date = st.session_state.last_inputs.get('start_date', '').replace('-', '')
-    
-    # Get expected filenames
-    filenames = get_export_filenames(
-        st.session_state.last_inputs.get('destination', 'itinerary'),
-        st.session_state.last_inputs.get('start_date', '')
-    )
-    
-    # Create a BytesIO object to store the zip file
-    zip_buffer = BytesIO()
+    """Create a ZIP file containing the itinerary and calendar files"""
+    artifacts = st.session_state.artifacts
     
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        # Add itinerary markdown file
-        if os.path.exists(filenames['itinerary']):
-            zip_file.write(filenames['itinerary'], os.path.basename(filenames['itinerary']))
-        
-        # Add calendar events text file
-        if os.path.exists(filenames['calendar_events']):
-            zip_file.write(filenames['calendar_events'], os.path.basename(filenames['calendar_events']))
-        
-        # Add ICS calendar file
-        if os.path.exists(filenames['ics']):
-            zip_file.write(filenames['ics'], os.path.basename(filenames['ics']))
-    
-    zip_buffer.seek(0)
-    return zip_buffer.getvalue(), f"{start_date}_{destination}_trip_files.zip"
+    # Built from memory once per generation, not re-read from disk on every rerun
+    return artifacts.to_zip(), artifacts.zip_filename
 
-def display_message(role, content, icon=None):
-    """Display a chat message with styling"""
+def display_message(role, content, icon=None, target=None):
+    """Display a chat message with styling (in ``target``, e.g. a placeholder, if given)"""
     if role == "user":
         css_class = "user-message"
         default_icon = "👤"
@@ -487,14 +84,66 @@ def display_message(role, content, icon=None):
     
     icon = icon or default_icon
     
-    st.markdown(f"""
+    (target or st).markdown(f"""
     <div class="chat-message {css_class}">
         <strong>{icon} {role.title()}:</strong><br/>
         {content}
     </div>
     """, unsafe_allow_html=True)
 
-def generate_itinerary(destination, days, start_date, preferences):
+# Friendly progress labels for each crew task
+TASK_LABELS = {
+    'research_destination_task': '🔍 Researching destination',
+    'research_attractions_task': '🏛️ Researching attractions',
+    'research_dining_task': '🍽️ Researching restaurants',
+    'research_lodging_task': '🏨 Researching accommodation',
+    'research_transport_task': '🚇 Researching transportation',
+    'research_weather_task': '🌦️ Checking the weather',
+    'plan_itinerary_task': '🗓️ Planning your day-by-day itinerary',
+    'format_calendar_task': '📆 Preparing calendar events',
+}
+
+@st.cache_resource
+def preload_crew_stack():
+    """Import the crew stack in the background once per process, after the first page is up"""
+    thread = threading.Thread(target=importlib.import_module, args=('ai_travel_agent.crew',), daemon=True)
+    thread.start()
+    return thread
+
+@st.cache_resource
+def get_crew_factory():
+    """Shared configs, search tool and caches for every session; each run still gets its own crew"""
+    from ai_travel_agent.crew import CrewFactory
+    return CrewFactory(output_dir=None)
+
+def run_crew_with_progress(inputs, live_area):
+    """Run the crew, showing task progress and the itinerary as it is written"""
+    from ai_travel_agent.streaming import final_answer_text
+    
+    with live_area.container():
+        status = st.status('🔍 Researching destination and planning your perfect trip...', expanded=True)
+        plan_placeholder = st.empty()
+    
+    # Exports stay in memory; the caller decides whether to persist them
+    travel_agent = get_crew_factory().create()
+    plan_text = ""
+    for event in travel_agent.stream(inputs):
+        label = TASK_LABELS.get(event.task_name, event.task_name.replace('_', ' ').capitalize())
+        if event.kind == 'task_started':
+            status.update(label=f"{label}...")
+            status.write(f"⏳ {label}...")
+        elif event.kind == 'task_completed':
+            status.write(f"✅ {label}")
+        elif event.kind == 'token' and event.task_name == 'plan_itinerary_task':
+            # Render the day-by-day plan while the planner is still writing it
+            plan_text += event.text
+            plan_placeholder.markdown(final_answer_text(plan_text))
+        elif event.kind == 'done':
+            status.update(label='✅ Itinerary ready!', state='complete', expanded=False)
+    
+    return travel_agent.artifacts()
+
+def generate_itinerary(destination, days, start_date, preferences, live_area=None):
     """Generate travel itinerary using CrewAI agents"""
     inputs = {
         'destination': destination,
@@ -506,93 +155,135 @@ def generate_itinerary(destination, days, start_date, preferences):
     # Store inputs for context
     st.session_state.last_inputs = inputs
     
-    with st.spinner('🔍 Researching destination and planning your perfect trip...'):
-        try:
-            # Run the crew
-            crew = AiTravelAgent()
-            result = crew.crew().kickoff(inputs=inputs)
-            
-            # Rename files to include destination and date for uniqueness
-            itinerary_file, events_file = rename_export_files(destination, start_date)
-            
-            # Read generated files from exports folder
-            itinerary_content = ""
-            if os.path.exists(itinerary_file):
-                with open(itinerary_file, 'r', encoding='utf-8') as f:
-                    itinerary_content = f.read()
-            
-            # Store in session state
-            st.session_state.current_itinerary = itinerary_content
-            st.session_state.itinerary_generated = True
-            
-            # Add to conversation context
-            context_summary = f"Generated itinerary for {destination} ({days} days starting {start_date})"
-            st.session_state.conversation_context.append({
-                'type': 'itinerary_generation',
-                'inputs': inputs,
-                'timestamp': datetime.now().isoformat(),
-                'summary': context_summary
-            })
-            
-            return True, itinerary_content
-        except Exception as e:
-            return False, str(e)
+    result_cache = ResultCache()
+    live_area = live_area or st.empty()
+    
+    try:
+        artifacts = result_cache.get(inputs)
+        if not artifacts:
+            # Run the crew, streaming progress to the page
+            artifacts = run_crew_with_progress(inputs, live_area)
+            result_cache.put(inputs, artifacts)
+        
+        # Keep a copy on disk in this run's own folder so concurrent sessions never collide,
+        # dropping the oldest folders beyond the retention limit
+        artifacts.persist(RunWorkspace.create().directory)
+        prune_runs()
+        
+        itinerary_content = artifacts.itinerary
+        st.session_state.artifacts = artifacts
+        
+        # Store in session state
+        st.session_state.current_itinerary = itinerary_content
+        st.session_state.itinerary_generated = True
+        
+        # Add to conversation context
+        context_summary = f"Generated itinerary for {destination} ({days} days starting {start_date})"
+        st.session_state.conversation_context.append({
+            'type': 'itinerary_generation',
+            'inputs': inputs,
+            'timestamp': datetime.now().isoformat(),
+            'summary': context_summary
+        })
+        
+        return True, itinerary_content
+    except Exception as e:
+        return False, str(e)
+
+@st.cache_resource
+def get_openai_client():
+    """One connection-pooled OpenAI client shared by all sessions"""
+    from ai_travel_agent.openai_client import create_client
+    return create_client()
+
+def chat_streaming_enabled():
+    """Stream chat answers token by token unless TRAVEL_AGENT_CHAT_STREAMING is off"""
+    return os.getenv('TRAVEL_AGENT_CHAT_STREAMING', '1').lower() not in ('0', 'false', 'no')
+
+def prepare_question(question):
+    """Return the itinerary, model, chat history the answer depends on and chat messages for a question"""
+    itinerary = st.session_state.current_itinerary or ''
+    model = os.getenv('MODEL', 'gpt-4')  # Default to gpt-4 if not set
+    
+    # The question itself was already appended to the chat history
+    history = st.session_state.messages
+    if history and history[-1].get('role') == 'user' and history[-1].get('content') == question:
+        history = history[:-1]
+    
+    # The same system message for every question about an itinerary, so the prompt prefix is cacheable
+    return itinerary, model, cache_history(question, history), build_messages(itinerary, question, history)
+
+def record_answer(question, answer):
+    """Add a finished answer to the conversation context"""
+    st.session_state.conversation_context.append({
+        'type': 'qa',
+        'question': question,
+        'answer': answer,
+        'timestamp': datetime.now().isoformat()
+    })
 
 def answer_question(question):
     """Answer questions about the itinerary using GPT"""
-    from openai import OpenAI
+    itinerary, model, history, context_messages = prepare_question(question)
     
-    # Build context from conversation history
-    context_messages = []
+    # Repeated questions about the same itinerary are answered from the cache (follow-ups only after the same turns)
+    answer_cache = AnswerCache()
+    answer = answer_cache.get(itinerary, question, model, history)
     
-    # Add itinerary context
-    if st.session_state.current_itinerary:
-        context_messages.append({
-            "role": "system",
-            "content": f"""You are a helpful travel assistant. You have generated the following itinerary:
-
-{st.session_state.current_itinerary}
+    try:
+        if answer is None:
+            client = get_openai_client()
+            response = client.chat.completions.create(
+                model=model,
+                messages=context_messages,
+                temperature=0.7,
+                max_tokens=1000,
+                # Routes questions about the same itinerary to the same prompt cache
+                extra_body={'prompt_cache_key': text_hash(itinerary)[:32]},
+            )
+            
+            answer = response.choices[0].message.content
+            answer_cache.put(itinerary, question, model, answer, history)
+        
+        record_answer(question, answer)
+        return answer
+    except Exception as e:
+        return f"Sorry, I encountered an error: {str(e)}"
 
-Answer questions about this itinerary, provide suggestions, and help the user modify their plans. Be concise, helpful, and friendly."""
-        })
+def stream_answer(question):
+    """Yield the answer to a question as it is generated, recording the full text at the end"""
+    itinerary, model, history, context_messages = prepare_question(question)
     
-    # Add conversation history
-    for msg in st.session_state.messages[-5:]:  # Last 5 messages for context
-        if msg['role'] in ['user', 'assistant']:
-            context_messages.append({
-                "role": msg['role'],
-                "content": msg['content']
-            })
-    
-    # Add current question
-    context_messages.append({
-        "role": "user",
-        "content": question
-    })
+    answer_cache = AnswerCache()
+    answer = answer_cache.get(itinerary, question, model, history)
+    if answer is not None:
+        yield answer
+        record_answer(question, answer)
+        return
     
     try:
-        client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-        model = os.getenv('MODEL', 'gpt-4')  # Default to gpt-4 if not set
-        response = client.chat.completions.create(
+        client = get_openai_client()
+        stream = client.chat.completions.create(
             model=model,
             messages=context_messages,
             temperature=0.7,
-            max_tokens=1000
+            max_tokens=1000,
+            stream=True,
+            extra_body={'prompt_cache_key': text_hash(itinerary)[:32]},
         )
         
-        answer = response.choices[0].message.content
+        parts = []
+        for chunk in stream:
+            text = chunk.choices[0].delta.content if chunk.choices else None
+            if text:
+                parts.append(text)
+                yield text
         
-        # Add to conversation context
-        st.session_state.conversation_context.append({
-            'type': 'qa',
-            'question': question,
-            'answer': answer,
-            'timestamp': datetime.now().isoformat()
-        })
-        
-        return answer
+        answer = ''.join(parts)
+        answer_cache.put(itinerary, question, model, answer, history)
+        record_answer(question, answer)
     except Exception as e:
-        return f"Sorry, I encountered an error: {str(e)}"
+        yield f"Sorry, I encountered an error: {str(e)}"
 
 def main():
     """Main application"""
@@ -606,6 +297,9 @@ def main():
     </div>
     """, unsafe_allow_html=True)
     
+    # Live generation progress is shown here, above the tabs
+    live_area = st.empty()
+    
     # Sidebar
     with st.sidebar:
         # Logo and title
@@ -661,7 +355,8 @@ Pace: Relaxed, with downtime""",
                     destination,
                     days,
                     start_date.strftime('%Y-%m-%d'),
-                    preferences
+                    preferences,
+                    live_area
                 )
                 
                 if success:
@@ -739,8 +434,21 @@ Pace: Relaxed, with downtime""",
                     })
                     
                     # Get answer
-                    with st.spinner('🤔 Thinking...'):
-                        answer = answer_question(question)
+                    if chat_streaming_enabled():
+                        # Show the answer as it is written instead of after the whole completion
+                        display_message('user', question)
+                        answer_placeholder = st.empty()
+                        answer = ""
+                        with st.spinner('🤔 Thinking...'):
+                            answer_stream = stream_answer(question)
+                            first_text = next(answer_stream, "")
+                        for text in itertools.chain([first_text], answer_stream):
+                            answer += text
+                            display_message('assistant', answer + " ▌", target=answer_placeholder)
+                        display_message('assistant', answer, target=answer_placeholder)
+                    else:
+                        with st.spinner('🤔 Thinking...'):
+                            answer = answer_question(question)
                     
                     # Add assistant response
                     st.session_state.messages.append({
@@ -758,19 +466,13 @@ Pace: Relaxed, with downtime""",
             st.markdown(st.session_state.current_itinerary)
             
             # Download just the itinerary file
-            filenames = get_export_filenames(
-                st.session_state.last_inputs.get('destination', 'itinerary'),
-                st.session_state.last_inputs.get('start_date', '')
-            )
+            artifacts = st.session_state.artifacts
             
-            if os.path.exists(filenames['itinerary']):
-                with open(filenames['itinerary'], 'r', encoding='utf-8') as f:
-                    itinerary_content = f.read()
-                
+            if artifacts and artifacts.itinerary:
                 st.download_button(
                     label="📥 Download Itinerary (Text)",
-                    data=itinerary_content,
-                    file_name=os.path.basename(filenames['itinerary']),
+                    data=artifacts.itinerary,
+                    file_name=artifacts.filenames['itinerary'],
                     mime="text/markdown",
                     use_container_width=True,
                     type="primary",
@@ -786,7 +488,7 @@ Pace: Relaxed, with downtime""",
             st.markdown("""
             <div class="success-box">
                 <h4>✅ Files Generated Successfully!</h4>
-                <p>Your trip files have been created with unique names in the exports folder:</p>
+                <p>Your trip files have been created with unique names in their own folder under exports/runs:</p>
                 <ul>
                     <li><strong>[date]_[destination]_itinerary.md</strong> - Complete day-by-day itinerary</li>
                     <li><strong>[date]_[destination]_calendar_events.txt</strong> - Event details for calendar import</li>
@@ -847,6 +549,9 @@ Pace: Relaxed, with downtime""",
         <p>Built with ❤️ using CrewAI & Streamlit | Powered by OpenAI GPT-4o</p>
     </div>
     """, unsafe_allow_html=True)
+    
+    # The shell is on screen; warm up the crew stack so the first generation does not wait for it
+    preload_crew_stack()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark for calendar event parsing.
+
+Compares the original CalendarGeneratorTool parsing (a startswith chain per
+line, and every strptime format tried from scratch for each start and end
+time) with the current tokenizer and memoized, format-learning date parsing.
+
+Usage:
+    python benchmarks/calendar_parsing.py [--events 1000] [--repeat 5]
+"""
+
+import argparse
+import re
+import timeit
+import warnings
+from datetime import datetime, timedelta
+
+warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
+
+from ai_travel_agent.tools.custom_tool import CalendarGeneratorTool, DocumentFormats
+
+SLOTS = [('8:00 AM', '9:00 AM'), ('9:30 AM', '12:00 PM'), ('12:30 PM', '1:30 PM'),
+         ('2:00 PM', '5:00 PM'), ('7:00 PM', '9:00 PM'), ('9:30 PM', '10:30 PM'),
+         ('10:00 AM', '11:00 AM'), ('3:00 PM', '4:00 PM')]
+
+
+def make_events_text(count: int) -> str:
+    """Build a multi-week events document in the calendar task's format."""
+    start = datetime(2025, 6, 1)
+    blocks = []
+    for i in range(count):
+        day = start + timedelta(days=i // len(SLOTS))
+        start_time, end_time = SLOTS[i % len(SLOTS)]
+        blocks.append('\n'.join([
+            f"- Title: Activity {i}",
+            f"- Date: {day.strftime('%B %d, %Y')}",
+            f"- Start Time: {start_time}",
+            f"- End Time: {end_time}",
+            f"- Location: Venue {i % 40}",
+            f"- Description: Details for activity {i}",
+        ]))
+    return '\n\n'.join(blocks)
+
+
+def legacy_parse_events(events_data: str):
+    """The original line-by-line startswith parser."""
+    events, current_event = [], {}
+    for line in events_data.strip().split('\n'):
+        line = line.strip()
+        if not line:
+            if current_event:
+                events.append(current_event)
+                current_event = {}
+            continue
+        if line.startswith('- Title:') or line.startswith('Title:'):
+            if current_event:
+                events.append(current_event)
+            current_event = {'title': line.split(':', 1)[1].strip()}
+        elif line.startswith('- Date:') or line.startswith('Date:'):
+            current_event['date'] = line.split(':', 1)[1].strip()
+        elif line.startswith('- Start Time:') or line.startswith('Start Time:'):
+            current_event['start_time'] = line.split(':', 1)[1].strip()
+        elif line.startswith('- End Time:') or line.startswith('End Time:'):
+            current_event['end_time'] = line.split(':', 1)[1].strip()
+        elif line.startswith('- Location:') or line.startswith('Location:'):
+            current_event['location'] = line.split(':', 1)[1].strip()
+        elif line.startswith('- Description:') or line.startswith('Description:'):
+            current_event['description'] = line.split(':', 1)[1].strip()
+    if current_event:
+        events.append(current_event)
+    return events
+
+
+def legacy_create_datetime(date_str: str, time_str: str) -> datetime:
+    """The original exception-driven date/time parsing."""
+    date_obj = None
+    for fmt in ['%Y-%m-%d', '%B %d, %Y', '%b %d, %Y', '%d/%m/%Y', '%m/%d/%Y']:
+        try:
+            date_obj = datetime.strptime(date_str, fmt)
+            break
+        except ValueError:
+            continue
+    if not date_obj:
+        date_match = re.search(r'(\d{4})-(\d{2})-(\d{2})', date_str)
+        if date_match:
+            date_obj = datetime(int(date_match.group(1)), int(date_match.group(2)), int(date_match.group(3)))
+    time_obj = None
+    for fmt in ['%I:%M %p', '%H:%M', '%I %p', '%H']:
+        try:
+            time_obj = datetime.strptime(time_str.strip(), fmt)
+            break
+        except ValueError:
+            continue
+    if date_obj and time_obj:
+        return datetime.combine(date_obj.date(), time_obj.time())
+    return date_obj or datetime.now()
+
+
+def legacy_pipeline(text: str):
+    return [
+        (legacy_create_datetime(e['date'], e['start_time']), legacy_create_datetime(e['date'], e['end_time']))
+        for e in legacy_parse_events(text)
+    ]
+
+
+def current_pipeline(tool: CalendarGeneratorTool, text: str):
+    formats = DocumentFormats()
+    return [
+        (tool._create_datetime(e['date'], e['start_time'], formats),
+         tool._create_datetime(e['date'], e['end_time'], formats))
+        for e in tool._parse_events(text, '')
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark calendar event parsing.")
+    parser.add_argument('--events', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    text = make_events_text(args.events)
+    tool = CalendarGeneratorTool(output_dir=None)
+    assert legacy_pipeline(text) == current_pipeline(tool, text), "parsers disagree"
+
+    results = {
+        'legacy': min(timeit.repeat(lambda: legacy_pipeline(text), number=1, repeat=args.repeat)),
+        'current': min(timeit.repeat(lambda: current_pipeline(tool, text), number=1, repeat=args.repeat)),
+    }
+
+    print(f"Parsing {args.events} events (best of {args.repeat}):")
+    for name, seconds in results.items():
+        print(f"  {name:<8} {seconds * 1000:8.2f} ms")
+    print(f"  speedup  {results['legacy'] / results['current']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
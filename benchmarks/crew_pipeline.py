@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+"""
+Offline benchmark of the full AiTravelAgent pipeline.
+
+Runs the real crew (task orchestration, stage cache, calendar generation,
+artifact collection) with the LLM and web search replaced by local stand-ins
+that replay recorded responses after a configurable latency. Reports
+end-to-end and per-stage timings, throughput with N concurrent crews and the
+peak Python memory of a single run for every destination x trip length
+combination, without network access or API keys.
+
+Usage:
+    python benchmarks/crew_pipeline.py [--destinations 'Tokyo, Japan;Paris, France'] [--days 3,14]
+        [--concurrency 1,4] [--repeat 2] [--llm-latency 0.05] [--search-latency 0.02]
+        [--research-mode single] [--calendar-mode agent] [--recordings FILE] [--json OUT]
+
+Recordings are a JSON object mapping "<destination>|<days>|<task name>" or
+"<task name>" to the agent's final answer; tasks without a recording get
+synthetic answers shaped like real output.
+"""
+
+import os
+
+# Nothing leaves the machine: no telemetry, and placeholder keys for clients that insist on one
+os.environ.setdefault('CREWAI_DISABLE_TELEMETRY', 'true')
+os.environ.setdefault('OTEL_SDK_DISABLED', 'true')
+os.environ.setdefault('OPENAI_API_KEY', 'offline-benchmark')
+os.environ.setdefault('SERPER_API_KEY', 'offline-benchmark')
+
+import argparse
+import contextlib
+import io
+import json
+import time
+import tracemalloc
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from statistics import median
+
+warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
+
+from fakes import ReplayLLM, ReplaySearchTool, load_recordings
+
+from ai_travel_agent.cache import StageCache
+from ai_travel_agent.crew import AiTravelAgent
+from ai_travel_agent.instrumentation import MemorySink, percentile
+from ai_travel_agent.tools.search_cache_tool import CachedSearchTool, FixtureSearchStore
+
+
+def run_once(trip, args, recordings, sink):
+    """Run one crew end to end; returns its wall time in seconds."""
+    started = time.perf_counter()
+    travel_agent = AiTravelAgent(
+        stage_cache=StageCache(ttl_seconds=0),
+        research_mode=args.research_mode,
+        output_dir=None,
+        calendar_mode=args.calendar_mode,
+        metrics_sinks=[sink],
+        search_tool=CachedSearchTool(
+            search_tool=ReplaySearchTool(latency=args.search_latency), store=FixtureSearchStore()
+        ),
+    )
+    crew = travel_agent.crew()
+    crew.verbose = False
+    for member in crew.agents:
+        member.llm = ReplayLLM(trip, latency=args.llm_latency, recordings=recordings)
+        member.verbose = False
+
+    crew.kickoff(inputs=trip)
+    artifacts = travel_agent.artifacts()
+    if not artifacts.ics:
+        raise RuntimeError(f"No calendar was produced for {trip['destination']} ({trip['days']} days)")
+    return time.perf_counter() - started
+
+
+def run_cell(trip, concurrency, args, recordings):
+    """Run ``repeat`` rounds of ``concurrency`` simultaneous crews for one trip."""
+    sink = MemorySink()
+    started = time.perf_counter()
+    # Keep crewai's console output out of the report (sys.stdout is process-wide, so swap it once here)
+    with contextlib.redirect_stdout(io.StringIO()), ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(run_once, trip, args, recordings, sink) for _ in range(concurrency * args.repeat)]
+        latencies = [future.result() for future in futures]
+    wall = time.perf_counter() - started
+
+    stages = {}
+    for record in sink.records:
+        if record.kind == 'task':
+            stages.setdefault(record.agent, []).append(record.duration_s)
+    return {
+        'destination': trip['destination'],
+        'days': int(trip['days']),
+        'concurrency': concurrency,
+        'runs': len(latencies),
+        'p50_s': median(latencies),
+        'p95_s': percentile(latencies, 0.95),
+        'throughput_per_min': len(latencies) / wall * 60,
+        'stages_p95_s': {agent: percentile(durations, 0.95) for agent, durations in sorted(stages.items())},
+    }
+
+
+def peak_memory(trip, args, recordings):
+    """Peak Python allocations (MB) of one run, measured apart from the timings since tracing slows it down."""
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_once(trip, args, recordings, MemorySink())
+        return tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the crew pipeline offline with replayed LLM and search.")
+    parser.add_argument('--destinations', default='Tokyo, Japan;Paris, France',
+                        help="Destinations separated by ';'")
+    parser.add_argument('--days', default='3,14')
+    parser.add_argument('--concurrency', default='1,4')
+    parser.add_argument('--repeat', type=int, default=2)
+    parser.add_argument('--start-date', default='2025-06-01')
+    parser.add_argument('--llm-latency', type=float, default=0.05, help="Seconds per LLM call")
+    parser.add_argument('--search-latency', type=float, default=0.02, help="Seconds per search")
+    parser.add_argument('--research-mode', default='single', choices=['single', 'fanout'])
+    parser.add_argument('--calendar-mode', default='agent', choices=['agent', 'structured', 'compiled'])
+    parser.add_argument('--recordings', help="JSON file of recorded responses")
+    parser.add_argument('--json', help="Also write the results to this file")
+    args = parser.parse_args()
+
+    destinations = [d.strip() for d in args.destinations.split(';') if d.strip()]
+    recordings = load_recordings(args.recordings)
+
+    results = []
+    print(f"{'destination':<18} {'days':>4} {'conc':>4} {'runs':>4} {'p50 s':>7} {'p95 s':>7} "
+          f"{'runs/min':>9} {'peak MB':>8}  per-agent p95 s")
+    for destination in destinations:
+        for days in (int(d) for d in args.days.split(',')):
+            trip = {'destination': destination, 'days': str(days), 'start_date': args.start_date,
+                    'preferences': 'Benchmark traveler: food, museums, moderate budget'}
+            peak_mb = peak_memory(trip, args, recordings)
+            for concurrency in (int(c) for c in args.concurrency.split(',')):
+                result = run_cell(trip, concurrency, args, recordings)
+                result['peak_mb'] = peak_mb
+                results.append(result)
+                stages = ', '.join(f"{agent} {p95:.2f}" for agent, p95 in result['stages_p95_s'].items())
+                print(f"{destination[:18]:<18} {days:>4} {concurrency:>4} {result['runs']:>4} "
+                      f"{result['p50_s']:>7.2f} {result['p95_s']:>7.2f} {result['throughput_per_min']:>9.1f} "
+                      f"{result['peak_mb']:>8.1f}  {stages}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
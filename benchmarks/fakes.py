@@ -0,0 +1,155 @@
+"""
+Offline stand-ins for the LLM and the web search used by the benchmarks.
+
+ReplayLLM answers every agent turn from recorded responses (or synthetic ones
+shaped like real output) after a configurable delay, and reports token usage
+the same way litellm does, so the crew's token accounting still works.
+ReplaySearchTool does the same for Serper queries. Neither touches the network.
+"""
+
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Type
+
+from crewai.llms.base_llm import BaseLLM
+from crewai.tools import BaseTool
+from litellm.types.utils import Usage
+from pydantic import BaseModel, Field
+
+from ai_travel_agent.qa_context import estimate_tokens
+from ai_travel_agent.tools.search_cache_tool import CachedSearchInput
+
+SLOTS = [
+    ('9:00 AM', '11:30 AM', 'Morning visit to {place}'),
+    ('12:00 PM', '1:30 PM', 'Lunch at {place} market'),
+    ('2:00 PM', '5:00 PM', 'Afternoon walk through {place}'),
+    ('7:00 PM', '9:00 PM', 'Dinner in {place}'),
+]
+
+SEARCH_THOUGHT = 'I should search first.'
+
+
+def synthetic_research(destination: str) -> str:
+    attractions = '\n'.join(f"- Attraction {i} in {destination}: a local highlight worth two hours." for i in range(15))
+    return f"# Research report: {destination}\n\n## Attractions\n{attractions}\n\n## Dining\n- Local food hall\n"
+
+
+def synthetic_plan(destination: str, days: int, start_date: str) -> str:
+    start = datetime.strptime(start_date, '%Y-%m-%d')
+    blocks = []
+    for day in range(days):
+        date = (start + timedelta(days=day)).strftime('%B %d, %Y')
+        lines = [f"## Day {day + 1}: {date}"]
+        for start_time, end_time, title in SLOTS:
+            place = f"{destination} district {day % 7 + 1}"
+            lines.append(f"- {start_time} - {end_time}: {title.format(place=place)}")
+            lines.append(f"  Location: {place}")
+        lines.append(f"Estimated daily cost: ${100 + day * 5}")
+        blocks.append('\n'.join(lines))
+    return '\n\n'.join(blocks) + f"\n\n## Total estimated trip cost\n${days * 120}"
+
+
+def synthetic_events(destination: str, days: int, start_date: str, as_json: bool) -> str:
+    start = datetime.strptime(start_date, '%Y-%m-%d')
+    events = []
+    for day in range(days):
+        date = (start + timedelta(days=day)).strftime('%Y-%m-%d')
+        for start_time, end_time, title in SLOTS:
+            place = f"{destination} district {day % 7 + 1}"
+            events.append({
+                'title': title.format(place=place), 'date': date,
+                'start_time': datetime.strptime(start_time, '%I:%M %p').strftime('%H:%M'),
+                'end_time': datetime.strptime(end_time, '%I:%M %p').strftime('%H:%M'),
+                'location': place, 'description': 'Synthetic benchmark event',
+            })
+    if as_json:
+        return json.dumps({'events': events})
+    return '\n\n'.join(
+        '\n'.join(f"- {label}: {event[key]}" for label, key in (
+            ('Title', 'title'), ('Date', 'date'), ('Start Time', 'start_time'), ('End Time', 'end_time'),
+            ('Location', 'location'), ('Description', 'description'),
+        ))
+        for event in events
+    )
+
+
+class ReplayLLM(BaseLLM):
+    """An LLM that replays recorded responses per task.
+
+    ``recordings`` maps "<destination>|<days>|<task name>" or just "<task name>"
+    to a response; anything not recorded gets a synthetic response of realistic
+    shape for the trip. Researchers run one search before answering, so the
+    tool path is exercised too.
+    """
+
+    def __init__(self, trip: Dict[str, str], latency: float = 0.0,
+                 recordings: Optional[Dict[str, str]] = None, model: str = 'gpt-4o-mini'):
+        super().__init__(model=model)
+        self.trip = trip
+        self.latency = latency
+        self.recordings = recordings or {}
+
+    def _response(self, task: Any) -> str:
+        name = getattr(task, 'name', '') or ''
+        destination, days = self.trip['destination'], int(self.trip['days'])
+        for key in (f"{destination}|{days}|{name}", name):
+            if key in self.recordings:
+                return self.recordings[key]
+        if name.startswith('research_'):
+            return synthetic_research(destination)
+        if name == 'plan_itinerary_task':
+            return synthetic_plan(destination, days, self.trip['start_date'])
+        if name == 'format_calendar_task':
+            as_json = getattr(task, 'output_pydantic', None) is not None
+            return synthetic_events(destination, days, self.trip['start_date'], as_json)
+        return 'Done.'
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None):
+        time.sleep(self.latency)
+        prompt = messages if isinstance(messages, str) else '\n'.join(str(m.get('content', '')) for m in messages)
+        name = getattr(from_task, 'name', '') or ''
+        # crewai's format instructions mention "Observation:" too, so look for our own search turn
+        searched = SEARCH_THOUGHT in prompt
+        # crewai does not always pass the agent to custom LLMs; the task knows it
+        agent = from_agent or getattr(from_task, 'agent', None)
+
+        if name.startswith('research_') and not searched and agent is not None and agent.tools:
+            tool = agent.tools[0].name
+            query = json.dumps({'search_query': f"{self.trip['destination']} {name.split('_')[1]}"})
+            text = f"Thought: {SEARCH_THOUGHT}\nAction: {tool}\nAction Input: {query}"
+        else:
+            text = f"Thought: I now know the final answer\nFinal Answer: {self._response(from_task)}"
+
+        usage = Usage(prompt_tokens=estimate_tokens(prompt), completion_tokens=estimate_tokens(text))
+        for callback in callbacks or []:
+            if hasattr(callback, 'log_success_event'):
+                callback.log_success_event({}, {'usage': usage}, 0, 0)
+        return text
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+
+class ReplaySearchTool(BaseTool):
+    """Stands in for SerperDevTool, answering every query after a fixed delay."""
+    name: str = "Replay search"
+    description: str = "Returns recorded search results."
+    args_schema: Type[BaseModel] = CachedSearchInput
+    latency: float = Field(default=0.0)
+    results: Dict[str, Any] = Field(default_factory=dict)
+
+    def _run(self, search_query: str, **kwargs: Any) -> Any:
+        time.sleep(self.latency)
+        return self.results.get(search_query) or {
+            'organic': [{'title': f"{search_query} guide", 'snippet': f"Everything about {search_query}."}],
+        }
+
+
+def load_recordings(path: Optional[str]) -> Dict[str, str]:
+    if not path:
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""
+Import-time benchmark for the app shell and the crew stack.
+
+Runs each target in a fresh interpreter with ``python -X importtime`` and
+reports its wall time, total import time and the slowest imports. The app
+shell (everything ``app.py`` loads before the first page renders) must not
+pull in the crew stack: the run fails if it imports any of the ``--forbid``
+modules or goes over ``--budget-ms``, so a stray top-level import is caught.
+
+Usage:
+    python benchmarks/import_time.py [--repeat 3] [--top 10] [--budget-ms 1500]
+        [--forbid crewai,crewai_tools,litellm,openai,icalendar,pytz]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+from statistics import median
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Target name -> code run in a fresh interpreter
+TARGETS = {
+    # Streamlit runs app.py top to bottom; outside `streamlit run` it renders nothing
+    'app shell': f"import runpy; runpy.run_path({os.path.join(ROOT, 'app.py')!r})",
+    'crew': "import ai_travel_agent.crew",
+}
+
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+
+
+def measure(code: str):
+    """Run code under -X importtime; returns wall seconds and {module: (self_us, cumulative_us, depth)}."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [os.path.join(ROOT, 'src'),
+                                                                   os.environ.get('PYTHONPATH')])))
+    env.setdefault('CREWAI_DISABLE_TELEMETRY', 'true')
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-W', 'ignore', '-c', code],
+                            capture_output=True, text=True, env=env, cwd=ROOT)
+    wall = time.perf_counter() - started
+    if result.returncode:
+        raise RuntimeError(f"{code!r} failed:\n{result.stderr[-2000:]}")
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules[name] = (int(self_us), int(cumulative_us), (len(indent) - 1) // 2)
+    return wall, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark import time of the app shell and the crew stack.")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--top', type=int, default=10, help="Slowest imports to list per target")
+    parser.add_argument('--budget-ms', type=float, default=1500, help="Maximum import time of the app shell")
+    parser.add_argument('--forbid', default='crewai,crewai_tools,litellm,openai,icalendar,pytz',
+                        help="Modules the app shell must not import")
+    args = parser.parse_args()
+
+    failures = []
+    for target, code in TARGETS.items():
+        runs = [measure(code) for _ in range(args.repeat)]
+        walls = [wall for wall, _ in runs]
+        # Total import time: the sum of the top-level imports' cumulative times
+        totals = [sum(cum for _, cum, depth in modules.values() if depth == 0) / 1000 for _, modules in runs]
+        modules = runs[-1][1]
+
+        print(f"{target} (median of {args.repeat}): {median(walls) * 1000:.0f} ms wall, "
+              f"{median(totals):.0f} ms importing {len(modules)} modules")
+        slowest = sorted(modules.items(), key=lambda item: item[1][1], reverse=True)
+        # Top-level imports and what they import directly
+        for name, (_, cumulative_us, _) in [item for item in slowest if item[1][2] <= 1][:args.top]:
+            print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+        if target == 'app shell':
+            forbidden = [name for name in args.forbid.split(',') if name and name in modules]
+            if forbidden:
+                failures.append(f"the app shell imports {', '.join(forbidden)}")
+            if median(totals) > args.budget_ms:
+                failures.append(f"the app shell takes {median(totals):.0f} ms to import (budget {args.budget_ms:.0f} ms)")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
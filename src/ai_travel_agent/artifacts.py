@@ -0,0 +1,81 @@
+"""
+In-memory trip exports.
+
+A crew run produces three artifacts: the itinerary markdown, the calendar
+events text and the .ics calendar. They are carried in memory from the crew to
+the UI, the ZIP download and the result cache, and only touch the filesystem
+when explicitly persisted.
+"""
+
+import os
+import zipfile
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import Dict, Optional
+
+
+def export_basename(destination: str) -> str:
+    """Filesystem-friendly form of a destination, e.g. 'Paris, France' -> 'Paris_France'."""
+    return destination.replace(', ', '_').replace(' ', '_')
+
+
+@dataclass
+class ItineraryArtifacts:
+    """The three export artifacts produced by one crew run."""
+    itinerary: str
+    calendar_events: str
+    ics: bytes = b''
+    destination: str = ''
+    start_date: str = ''
+    _zip: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def filenames(self) -> Dict[str, str]:
+        """Download names that include the destination and start date."""
+        clean_dest = export_basename(self.destination or 'itinerary')
+        date_prefix = self.start_date.replace('-', '')
+        return {
+            'itinerary': f'{date_prefix}_{clean_dest}_itinerary.md',
+            'calendar_events': f'{date_prefix}_{clean_dest}_calendar_events.txt',
+            'ics': f'{clean_dest}_itinerary.ics',
+        }
+
+    @property
+    def zip_filename(self) -> str:
+        return f"{self.start_date.replace('-', '')}_{export_basename(self.destination or 'itinerary')}_trip_files.zip"
+
+    def to_zip(self) -> bytes:
+        """Build (once) a ZIP archive holding every non-empty artifact."""
+        if self._zip is None:
+            names = self.filenames
+            buffer = BytesIO()
+            with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+                if self.itinerary:
+                    zip_file.writestr(names['itinerary'], self.itinerary)
+                if self.calendar_events:
+                    zip_file.writestr(names['calendar_events'], self.calendar_events)
+                if self.ics:
+                    zip_file.writestr(names['ics'], self.ics)
+            self._zip = buffer.getvalue()
+        return self._zip
+
+    def persist(self, directory: str) -> Dict[str, str]:
+        """Write the artifacts into directory under their download names and return the paths."""
+        paths = {key: os.path.join(directory, name) for key, name in self.filenames.items()}
+        self.write_files(paths['itinerary'], paths['calendar_events'], paths['ics'])
+        return paths
+
+    def write_files(self, itinerary_path: str, events_path: str, ics_path: str) -> None:
+        """Write the artifacts to the given file paths."""
+        for path in (itinerary_path, events_path, ics_path):
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        with open(itinerary_path, 'w', encoding='utf-8') as f:
+            f.write(self.itinerary)
+        with open(events_path, 'w', encoding='utf-8') as f:
+            f.write(self.calendar_events)
+        if self.ics:
+            with open(ics_path, 'wb') as f:
+                f.write(self.ics)
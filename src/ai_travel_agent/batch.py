@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+"""
+Batch itinerary generation.
+
+Reads many trip specs from a JSONL or CSV file and runs crews concurrently in a
+bounded thread or process pool. Each finished trip is written to its own folder in the
+output directory as soon as it completes, and a summary with per-trip timings
+and failures is written at the end.
+
+Usage:
+    run_batch trips.jsonl --output-dir batch_exports --workers 4
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+import traceback
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List
+
+warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
+
+REQUIRED_FIELDS = ('destination', 'days', 'start_date')
+
+EXECUTORS = {
+    'thread': ThreadPoolExecutor,
+    'process': ProcessPoolExecutor,
+}
+
+
+def load_trip_specs(path: str) -> List[Dict[str, str]]:
+    """Load trip specs from a .jsonl or .csv file."""
+    specs = []
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if path.lower().endswith('.csv'):
+            rows = list(csv.DictReader(f))
+        else:
+            rows = [json.loads(line) for line in f if line.strip()]
+
+    seen_ids: Dict[str, int] = {}
+    for index, row in enumerate(rows, start=1):
+        missing = [field for field in REQUIRED_FIELDS if not str(row.get(field) or '').strip()]
+        if missing:
+            raise ValueError(f"Trip #{index} in {path} is missing: {', '.join(missing)}")
+
+        spec_id = str(row.get('id') or '').strip() or trip_id(index, row)
+        # The id names the trip's output folder: it must stay inside the output directory and be unique
+        # (compared case-insensitively, as on macOS and Windows filesystems)
+        if spec_id in ('.', '..') or os.path.basename(spec_id) != spec_id:
+            raise ValueError(f"Trip #{index} in {path} has an id that is not a folder name: {spec_id!r}")
+        if spec_id.casefold() in seen_ids:
+            raise ValueError(f"Trip #{index} in {path} repeats the id of trip #{seen_ids[spec_id.casefold()]}: {spec_id!r}")
+        seen_ids[spec_id.casefold()] = index
+
+        specs.append({
+            'id': spec_id,
+            'destination': str(row['destination']).strip(),
+            'days': str(row['days']).strip(),
+            'start_date': str(row['start_date']).strip(),
+            'preferences': str(row.get('preferences') or '').strip(),
+        })
+    return specs
+
+
+def trip_id(index: int, spec: Dict) -> str:
+    """Build a filesystem-safe identifier for a trip."""
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', str(spec.get('destination', 'trip'))).strip('_')
+    date_prefix = str(spec.get('start_date', '')).replace('-', '')
+    return f"{index:04d}_{date_prefix}_{slug}"
+
+
+def run_trip(spec: Dict[str, str], trip_dir: str) -> Dict:
+    """Generate one itinerary into trip_dir and report how it went."""
+    from ai_travel_agent.cache import ResultCache
+    from ai_travel_agent.crew import crew_factory
+    from ai_travel_agent.workspace import RunWorkspace
+
+    inputs = {key: spec[key] for key in ('destination', 'days', 'start_date', 'preferences')}
+    record = {'id': spec['id'], 'destination': spec['destination'], 'output_dir': trip_dir}
+
+    started = time.perf_counter()
+    try:
+        workspace = RunWorkspace(run_id=spec['id'], directory=trip_dir)
+
+        result_cache = ResultCache()
+        artifacts = result_cache.get(inputs)
+        if artifacts:
+            record['status'] = 'cached'
+        else:
+            # Worker processes run many trips; configs, caches and the search tool are set up once per worker
+            travel_agent = crew_factory(output_dir=None).create()
+            travel_agent.crew().kickoff(inputs=inputs)
+            artifacts = travel_agent.artifacts()
+            result_cache.put(inputs, artifacts)
+            record['status'] = 'ok'
+
+        artifacts.write_files(
+            workspace.itinerary_path, workspace.calendar_events_path, workspace.ics_path(inputs['destination'])
+        )
+    except Exception as e:
+        record['status'] = 'failed'
+        record['error'] = f"{type(e).__name__}: {e}"
+        record['traceback'] = traceback.format_exc()
+    finally:
+        record['seconds'] = round(time.perf_counter() - started, 3)
+    return record
+
+
+def run_specs(specs: List[Dict[str, str]], output_dir: str, workers: int, executor: str = 'thread') -> Dict:
+    """Run all trips with a bounded worker pool, streaming results as they finish."""
+    output_dir = os.path.abspath(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+
+    results_path = os.path.join(output_dir, 'results.jsonl')
+    records = []
+    started = time.perf_counter()
+
+    with open(results_path, 'w', encoding='utf-8') as results_file, \
+            EXECUTORS[executor](max_workers=workers) as pool:
+        futures = {
+            pool.submit(run_trip, spec, os.path.join(output_dir, spec['id'])): spec
+            for spec in specs
+        }
+        for future in as_completed(futures):
+            spec = futures[future]
+            try:
+                record = future.result()
+            except Exception as e:
+                # The worker itself died (e.g. a process killed for running out of memory)
+                record = {'id': spec['id'], 'destination': spec['destination'],
+                          'status': 'failed', 'error': f"{type(e).__name__}: {e}", 'seconds': None}
+
+            records.append(record)
+            results_file.write(json.dumps(record, ensure_ascii=False) + '\n')
+            results_file.flush()
+
+            icon = '❌' if record['status'] == 'failed' else '✅'
+            print(f"{icon} [{len(records)}/{len(specs)}] {record['id']} - {record['status']} ({record['seconds']}s)")
+
+    failed = [r for r in records if r['status'] == 'failed']
+    summary = {
+        'finished_at': datetime.now().isoformat(),
+        'total': len(records),
+        'succeeded': len(records) - len(failed),
+        'cached': sum(1 for r in records if r['status'] == 'cached'),
+        'failed': len(failed),
+        'workers': workers,
+        'executor': executor,
+        'wall_seconds': round(time.perf_counter() - started, 3),
+        'trips': sorted(records, key=lambda r: r['id']),
+    }
+    with open(os.path.join(output_dir, 'summary.json'), 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    return summary
+
+
+def run_batch():
+    """
+    Generate itineraries for every trip in a JSONL/CSV file.
+
+    Each row needs destination, days and start_date; preferences and id are optional.
+    """
+    parser = argparse.ArgumentParser(description="Generate many travel itineraries concurrently.")
+    parser.add_argument('trips', help="Path to a .jsonl or .csv file of trip specs")
+    parser.add_argument('--output-dir', default='batch_exports', help="Where to write per-trip results")
+    parser.add_argument('--workers', type=int, default=4,
+                        help="Maximum number of crews running at once (crews mostly wait on APIs)")
+    parser.add_argument('--executor', choices=sorted(EXECUTORS), default='thread',
+                        help="Run crews in threads of this process or in separate processes")
+    args = parser.parse_args()
+
+    specs = load_trip_specs(args.trips)
+    print(f"🌍 Generating {len(specs)} itineraries with {args.workers} workers → {args.output_dir}")
+
+    summary = run_specs(specs, args.output_dir, max(1, args.workers), args.executor)
+
+    print(f"\n✅ {summary['succeeded']}/{summary['total']} succeeded "
+          f"({summary['cached']} from cache, {summary['failed']} failed) in {summary['wall_seconds']}s")
+    print(f"📄 Summary written to {os.path.join(args.output_dir, 'summary.json')}")
+
+    if summary['failed']:
+        sys.exit(1)
+    return summary
+
+
+if __name__ == "__main__":
+    run_batch()
@@ -0,0 +1,348 @@
+"""
+On-disk caches for AI Travel Agent runs.
+
+A full crew run costs three sequential agent calls, so repeated requests for
+the same trip are served from a persistent, content-addressed cache instead.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from typing import Dict, Optional, Sequence
+
+from ai_travel_agent.artifacts import ItineraryArtifacts
+
+DEFAULT_CACHE_DIR = os.path.join('.cache', 'ai_travel_agent')
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_MAX_MB = 100
+
+
+def env_float(name: str, default: float) -> float:
+    """Read a numeric setting from the environment, falling back on bad values."""
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+def cache_root() -> str:
+    """Return the base directory for all on-disk caches."""
+    return os.getenv('TRAVEL_AGENT_CACHE_DIR', DEFAULT_CACHE_DIR)
+
+
+def normalize_trip_inputs(inputs: Dict) -> Dict[str, str]:
+    """Canonicalize trip inputs so equivalent form submissions map to one key."""
+    destination = ' '.join(str(inputs.get('destination', '')).split()).casefold()
+
+    days = str(inputs.get('days', '')).strip()
+    if days.isdigit():
+        days = str(int(days))
+
+    start_date = str(inputs.get('start_date', '')).strip()
+
+    # Collapse indentation and blank lines (the CLI passes a triple-quoted block)
+    preferences = '\n'.join(
+        ' '.join(line.split())
+        for line in str(inputs.get('preferences', '')).splitlines()
+        if line.strip()
+    ).casefold()
+
+    return {
+        'destination': destination,
+        'days': days,
+        'start_date': start_date,
+        'preferences': preferences,
+    }
+
+
+def hash_payload(payload) -> str:
+    """Return a stable SHA-256 hex digest of a JSON-serializable payload."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def crew_model() -> str:
+    """The model crew agents run on, resolved from the environment the way crewai does."""
+    return (
+        os.getenv('MODEL')
+        or os.getenv('MODEL_NAME')
+        or os.getenv('OPENAI_MODEL_NAME')
+        # crewai's DEFAULT_LLM_MODEL; read here without importing crewai
+        or 'gpt-4o-mini'
+    )
+
+
+def crew_settings(research_mode: Optional[str] = None, calendar_mode: Optional[str] = None) -> Dict[str, str]:
+    """The settings that shape a crew's output, with the same defaults as ``AiTravelAgent``."""
+    return {
+        'model': crew_model(),
+        'research_mode': research_mode or os.getenv('TRAVEL_AGENT_RESEARCH_MODE', 'single'),
+        'calendar_mode': calendar_mode or os.getenv('TRAVEL_AGENT_CALENDAR_MODE', 'agent'),
+    }
+
+
+def trip_cache_key(inputs: Dict, settings: Optional[Dict[str, str]] = None) -> str:
+    """Return the content hash identifying a trip request run under the given crew settings."""
+    return hash_payload({
+        'inputs': normalize_trip_inputs(inputs),
+        'settings': settings if settings is not None else crew_settings(),
+    })
+
+
+class DiskCache:
+    """A directory of JSON entries with TTL expiry and LRU size eviction.
+
+    Entry recency is tracked through file modification times, which are bumped
+    on every hit, so the least recently used entries are evicted first once the
+    directory grows past ``max_bytes``.
+    """
+
+    def __init__(self, directory: str, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        self.directory = os.path.abspath(directory)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_bytes > 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached value for key, or None if missing or expired."""
+        if not self.enabled:
+            return None
+
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - entry.get('created', 0) > self.ttl_seconds:
+            self._remove(path)
+            return None
+
+        # Mark as recently used for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry.get('value')
+
+    def set(self, key: str, value: Dict) -> None:
+        """Store value under key, evicting old entries if over the size limit."""
+        if not self.enabled:
+            return
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write to a temp file first so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'created': time.time(), 'value': value}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception:
+            self._remove(tmp_path)
+            raise
+
+        self._evict(keep=path)
+
+    def clear(self) -> None:
+        """Remove every entry in the cache."""
+        for path, _, _ in self._entries():
+            self._remove(path)
+
+    def _entries(self):
+        """Yield (path, size, mtime) for every stored entry."""
+        if not os.path.isdir(self.directory):
+            return
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if not entry.name.endswith('.json'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                yield entry.path, stat.st_size, stat.st_mtime
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        entries = [e for e in self._entries() if e[0] != keep]
+        total = sum(size for _, size, _ in entries)
+        if keep and os.path.exists(keep):
+            total += os.path.getsize(keep)
+        if total <= self.max_bytes:
+            return
+
+        # Drop least recently used entries until we are back under the limit
+        for path, size, _ in sorted(entries, key=lambda e: e[2]):
+            self._remove(path)
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class _CacheBase:
+    """A DiskCache in ``<cache dir>/<subdirectory>`` configured by the ``TRAVEL_AGENT_CACHE_*`` settings."""
+
+    subdirectory = ''
+
+    def __init__(self, directory: Optional[str] = None, ttl_seconds: Optional[float] = None,
+                 max_bytes: Optional[int] = None):
+        if directory is None:
+            directory = os.path.join(cache_root(), self.subdirectory)
+        if ttl_seconds is None:
+            ttl_seconds = env_float('TRAVEL_AGENT_CACHE_TTL', DEFAULT_TTL_SECONDS)
+        if max_bytes is None:
+            max_bytes = int(env_float('TRAVEL_AGENT_CACHE_MAX_MB', DEFAULT_MAX_MB) * 1024 * 1024)
+        self.store = DiskCache(directory, ttl_seconds, max_bytes)
+
+    @property
+    def enabled(self) -> bool:
+        return self.store.enabled
+
+
+class ResultCache(_CacheBase):
+    """Persistent cache of full crew results keyed on normalized trip inputs.
+
+    The key also covers the model and crew modes (see ``crew_settings``), so
+    switching either never serves an itinerary built under the old settings.
+    Configured through ``TRAVEL_AGENT_CACHE_DIR``, ``TRAVEL_AGENT_CACHE_TTL``
+    (seconds, 0 disables caching) and ``TRAVEL_AGENT_CACHE_MAX_MB``.
+    """
+
+    subdirectory = 'results'
+
+    def get(self, inputs: Dict, settings: Optional[Dict[str, str]] = None) -> Optional[ItineraryArtifacts]:
+        """Return the stored result for these trip inputs and crew settings (default: from the environment), if any."""
+        value = self.store.get(trip_cache_key(inputs, settings))
+        if not value:
+            return None
+        return ItineraryArtifacts(
+            itinerary=value.get('itinerary', ''),
+            calendar_events=value.get('calendar_events', ''),
+            ics=base64.b64decode(value.get('ics', '')),
+            destination=inputs.get('destination', ''),
+            start_date=inputs.get('start_date', ''),
+        )
+
+    def put(self, inputs: Dict, result: ItineraryArtifacts, settings: Optional[Dict[str, str]] = None) -> None:
+        """Store a finished run's exports for these trip inputs and crew settings."""
+        if not result.itinerary:
+            return
+        settings = settings if settings is not None else crew_settings()
+        self.store.set(trip_cache_key(inputs, settings), {
+            'inputs': normalize_trip_inputs(inputs),
+            'settings': settings,
+            'itinerary': result.itinerary,
+            'calendar_events': result.calendar_events,
+            'ics': base64.b64encode(result.ics).decode('ascii'),
+        })
+
+
+class StageCache(_CacheBase):
+    """Persistent cache of individual task outputs.
+
+    Each entry is keyed on the task's interpolated description and expected
+    output, the agent that runs it, the model and tools it runs with, and a
+    hash of the upstream context it was given, so a stage is only reused when
+    nothing it depends on has changed.
+    Shares the ``TRAVEL_AGENT_CACHE_*`` settings with ``ResultCache``.
+    """
+
+    subdirectory = 'stages'
+
+    @staticmethod
+    def key_for(description: str, expected_output: str, agent_role: str, context: str,
+                model: str = '', tool_names: Sequence[str] = ()) -> str:
+        """Return the cache key for one task execution."""
+        return hash_payload({
+            'description': description,
+            'expected_output': expected_output,
+            'agent': agent_role,
+            'model': model,
+            'tools': sorted(tool_names),
+            'context': hashlib.sha256((context or '').encode('utf-8')).hexdigest(),
+        })
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the raw task output stored under key, if any."""
+        value = self.store.get(key)
+        return value.get('raw') if value else None
+
+    def put(self, key: str, raw: str) -> None:
+        """Store a task's raw output under key."""
+        if raw:
+            self.store.set(key, {'raw': raw})
+
+
+def normalize_question(question: str) -> str:
+    """Canonicalize a chat question so trivially different phrasings share a key."""
+    text = question.casefold().replace('’', "'")
+    text = re.sub(r"\b(what|where|when|how|who)'s\b", r'\1 is', text)
+    text = re.sub(r"[^\w\s]", ' ', text)
+    words = [word for word in text.split() if word not in ('please', 'pls')]
+    return ' '.join(words)
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256((text or '').encode('utf-8')).hexdigest()
+
+
+class AnswerCache(_CacheBase):
+    """Persistent cache of chat answers, scoped to the itinerary they are about.
+
+    Keys combine the itinerary's hash, the model and the normalized question,
+    so a new or edited itinerary never gets answers meant for another one.
+    Follow-ups such as "and the day after?" also pass the earlier turns they
+    depend on (see ``qa_context.cache_history``), so they are only reused
+    after the same conversation; other questions pass none. Shares the
+    ``TRAVEL_AGENT_CACHE_*`` settings with ``ResultCache``; the least recently
+    used answers are evicted first.
+    """
+
+    subdirectory = 'answers'
+
+    @staticmethod
+    def key_for(itinerary: str, question: str, model: str, history: Sequence[Dict[str, str]] = ()) -> str:
+        return hash_payload({
+            'itinerary': text_hash(itinerary),
+            'model': model,
+            'question': normalize_question(question),
+            # Left out for standalone questions, so their keys stay the same as the chat goes on
+            **({'history': text_hash(json.dumps(list(history), sort_keys=True, ensure_ascii=False))}
+               if history else {}),
+        })
+
+    def get(self, itinerary: str, question: str, model: str,
+            history: Sequence[Dict[str, str]] = ()) -> Optional[str]:
+        """Return the stored answer to this question about this itinerary (after this history), if any."""
+        value = self.store.get(self.key_for(itinerary, question, model, history))
+        return value.get('answer') if value else None
+
+    def put(self, itinerary: str, question: str, model: str, answer: str,
+            history: Sequence[Dict[str, str]] = ()) -> None:
+        if answer:
+            self.store.set(self.key_for(itinerary, question, model, history), {'answer': answer})
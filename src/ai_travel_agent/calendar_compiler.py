@@ -0,0 +1,164 @@
+"""
+Deterministic itinerary-to-calendar compiler.
+
+Turns the markdown written by plan_itinerary_task into calendar events without
+an LLM call. It relies on the layout that task's expected_output asks for:
+day headers such as "Day 1: [Date]" and activities with time ranges such as
+"9:00 AM - 12:00 PM".
+"""
+
+import re
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+DEFAULT_DURATION = timedelta(hours=1)
+
+# Descriptions are for the calendar entry, not a copy of the whole day
+MAX_DESCRIPTION_LENGTH = 500
+
+DAY_HEADER = re.compile(r'^\W*day\s+(\d+)\b\W*(.*)$', re.IGNORECASE)
+
+_TIME = r'\d{1,2}(?::\d{2})?\s*(?:[ap]\.?\s?m\.?)?'
+TIME_RANGE = re.compile(
+    rf'(?P<start>{_TIME})\s*(?:-|–|—|to|until)\s*(?P<end>{_TIME})(?!\w)', re.IGNORECASE
+)
+# A single time only starts an event when it leads the line ("12:30 PM: Lunch at ...")
+LEADING_TIME = re.compile(rf'^(?P<start>{_TIME})(?!\w)', re.IGNORECASE)
+
+FIELD_LINE = re.compile(r'^(location|address|where)\s*:\s*(.+)$', re.IGNORECASE)
+
+ISO_DATE = re.compile(r'\d{4}-\d{2}-\d{2}')
+_MONTH = r'(?P<month>jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?'
+_DAY = r'(?P<day>\d{1,2})(?:st|nd|rd|th)?'
+_YEAR = r'(?:,?\s+(?P<year>\d{4}))?'
+WRITTEN_DATES = [
+    re.compile(rf'\b{_MONTH}\s+{_DAY}\b{_YEAR}', re.IGNORECASE),
+    re.compile(rf'\b{_DAY}\s+{_MONTH}{_YEAR}', re.IGNORECASE),
+]
+
+
+def _clean(text: str) -> str:
+    """Strip markdown decoration and list markers from a line."""
+    text = re.sub(r'[*_`#>]', '', text)
+    text = re.sub(r'^\s*(?:[-+•]|\d+[.)])\s+', '', text)
+    return re.sub(r'\s+', ' ', text).strip(' \t-–—:|,')
+
+
+def parse_time(text: str) -> Optional[str]:
+    """Normalize a clock time like '9 am', '9:30 P.M.' or '14:00' to 24-hour HH:MM."""
+    match = re.fullmatch(r'(\d{1,2})(?::(\d{2}))?\s*(?:([ap])\.?\s?m\.?)?', text.strip(), re.IGNORECASE)
+    if not match:
+        return None
+    hour, minute, meridiem = int(match.group(1)), int(match.group(2) or 0), (match.group(3) or '').lower()
+    if meridiem:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if meridiem == 'p' else 0)
+    elif match.group(2) is None:
+        # A bare number such as "10" is a count, not a time
+        return None
+    if hour > 23 or minute > 59:
+        return None
+    return f'{hour:02d}:{minute:02d}'
+
+
+def _range_times(start: str, end: str):
+    """Normalize both ends of a range, letting '9 - 11:30 AM' borrow the meridiem of its end."""
+    meridiem = re.search(r'[ap]\.?\s?m\.?$', end.strip(), re.IGNORECASE)
+    start_time = parse_time(start)
+    if start_time is None and meridiem and re.fullmatch(r'\d{1,2}(?::\d{2})?', start.strip()):
+        start_time = parse_time(f'{start.strip()} {meridiem.group(0)}')
+    return start_time, parse_time(end)
+
+
+def parse_day_date(text: str, fallback: datetime) -> datetime:
+    """Find the date written in a day header ("Day 2: Tuesday, June 3" etc.), or use the fallback."""
+    iso = ISO_DATE.search(text)
+    if iso:
+        try:
+            return datetime.strptime(iso.group(0), '%Y-%m-%d')
+        except ValueError:
+            return fallback
+    for pattern in WRITTEN_DATES:
+        match = pattern.search(text)
+        if match:
+            year = match.group('year') or fallback.year
+            try:
+                return datetime.strptime(f"{year} {match.group('month')[:3]} {match.group('day')}", '%Y %b %d')
+            except ValueError:
+                return fallback
+    return fallback
+
+
+def _add_duration(start_time: str) -> str:
+    return (datetime.strptime(start_time, '%H:%M') + DEFAULT_DURATION).strftime('%H:%M')
+
+
+def compile_itinerary(markdown: str, start_date: str) -> List[Dict[str, str]]:
+    """Compile itinerary markdown into event dictionaries for CalendarGeneratorTool.
+
+    Every event has title, date (YYYY-MM-DD), start_time and end_time (24-hour
+    HH:MM), location and description. Lines under an activity become its
+    description, and "Location:"/"Address:" lines its location.
+    """
+    try:
+        trip_start = datetime.strptime(start_date.strip(), '%Y-%m-%d')
+    except ValueError:
+        trip_start = datetime.now()
+
+    events: List[Dict[str, str]] = []
+    current_date: Optional[datetime] = None
+    current: Optional[Dict[str, str]] = None
+
+    for raw_line in markdown.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+
+        header = DAY_HEADER.match(_clean(line)) if len(line) < 120 else None
+        if header:
+            fallback = trip_start + timedelta(days=int(header.group(1)) - 1)
+            current_date = parse_day_date(header.group(2), fallback)
+            current = None
+            continue
+        if current_date is None:
+            continue
+
+        cleaned = _clean(line)
+        times = None
+        time_range = TIME_RANGE.search(cleaned)
+        if time_range:
+            start_time, end_time = _range_times(time_range.group('start'), time_range.group('end'))
+            if start_time and end_time:
+                times = (start_time, end_time, cleaned[:time_range.start()], cleaned[time_range.end():])
+        if times is None:
+            leading = LEADING_TIME.match(cleaned)
+            start_time = parse_time(leading.group('start')) if leading else None
+            if start_time:
+                times = (start_time, _add_duration(start_time), '', cleaned[leading.end():])
+
+        if times:
+            start_time, end_time, before, after = times
+            # "Lunch (12:30 - 1:30 PM) at Café Marly" -> "Lunch at Café Marly"
+            parts = [_clean(before.rstrip(' (')), _clean(after.lstrip(' )'))]
+            title = ' '.join(part for part in parts if part) or 'Travel Activity'
+            if end_time <= start_time:
+                end_time = _add_duration(start_time)
+            current = {
+                'title': title,
+                'date': current_date.strftime('%Y-%m-%d'),
+                'start_time': start_time,
+                'end_time': end_time,
+                'location': '',
+                'description': '',
+            }
+            events.append(current)
+        elif current is not None:
+            field = FIELD_LINE.match(cleaned)
+            if field and not current['location']:
+                current['location'] = field.group(2).strip()
+            elif len(current['description']) < MAX_DESCRIPTION_LENGTH:
+                description = f"{current['description']} {cleaned}".strip()
+                current['description'] = description[:MAX_DESCRIPTION_LENGTH]
+
+    return events
@@ -1,14 +1,80 @@
 from crewai import Agent, Crew, Process, Task
-from crewai.project import CrewBase, agent, crew, task
+from crewai.project import CrewBase, after_kickoff, agent, before_kickoff, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
-from crewai_tools import SerperDevTool
-from typing import List
-from ai_travel_agent.tools.custom_tool import CalendarGeneratorTool
+from crewai.tools import BaseTool
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import copy
+import os
+import queue
+import threading
+import yaml
+from ai_travel_agent.artifacts import ItineraryArtifacts
+from ai_travel_agent.cache import StageCache
+from ai_travel_agent.calendar_compiler import compile_itinerary
+from ai_travel_agent.instrumentation import RunInstrumentation, sinks_from_env
+from ai_travel_agent.run_log import LOG_MODES, RunLog, log_mode as log_mode_from_env
+from ai_travel_agent.streaming import CrewStreamListener, StreamEvent
+from ai_travel_agent.tasks import CachedTask
+from ai_travel_agent.tools.custom_tool import CalendarEvent, CalendarEvents, CalendarGeneratorTool
+from ai_travel_agent.tools.search_cache_tool import CachedSearchTool
+from ai_travel_agent.workspace import CALENDAR_EVENTS_FILENAME, ITINERARY_FILENAME
 
 # If you want to run a snippet of code before or after the crew starts,
 # you can use the @before_kickoff and @after_kickoff decorators
 # https://docs.crewai.com/concepts/crews#example-crew-class-with-decorators
 
+RESEARCH_MODES = ('single', 'fanout')
+
+# "agent" lets the calendar agent write event text and call its tool; "structured"
+# has it return validated CalendarEvents that are compiled into the .ics directly;
+# "compiled" drops the calendar agent and compiles the itinerary without an LLM
+CALENDAR_MODES = ('agent', 'structured', 'compiled')
+
+# Independent research sub-topics (see tasks.yaml) run concurrently in "fanout" mode
+RESEARCH_TOPIC_TASKS = [
+    'research_attractions_task',
+    'research_dining_task',
+    'research_lodging_task',
+    'research_transport_task',
+    'research_weather_task',
+]
+
+
+@lru_cache(maxsize=None)
+def _parse_config(path: str, mtime: float) -> Dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f)
+
+
+def load_config(path) -> Dict:
+    """Parse a YAML config once per file version; callers get their own copy, since CrewBase mutates it"""
+    path = os.fspath(path)
+    return copy.deepcopy(_parse_config(path, os.path.getmtime(path)))
+
+
+_search_tool: Optional[BaseTool] = None
+_search_tool_lock = threading.Lock()
+
+
+def shared_search_tool() -> Optional[BaseTool]:
+    """The process-wide cached Serper tool, created on first use (None if Serper is unavailable)"""
+    global _search_tool
+    if _search_tool is None:
+        with _search_tool_lock:
+            if _search_tool is None:
+                try:
+                    # crewai_tools is slow to import and only needed once a crew is built
+                    from crewai_tools import SerperDevTool
+                    # Popular destinations repeat constantly, so searches go through a local cache;
+                    # sharing it lets identical queries from concurrent runs share one API call
+                    _search_tool = CachedSearchTool(search_tool=SerperDevTool())
+                except Exception as e:
+                    print(f"Warning: SerperDevTool initialization failed: {e}")
+                    return None
+    return _search_tool
+
+
 @CrewBase
 class AiTravelAgent():
     """AiTravelAgent crew for generating personalized travel itineraries"""
@@ -21,24 +87,101 @@ class AiTravelAgent():
     # Tasks: https://docs.crewai.com/concepts/tasks#yaml-configuration-recommended
     
     # Initialize tools
-    def __init__(self):
+    def __init__(self, stage_cache: Optional[StageCache] = None, research_mode: Optional[str] = None,
+                 output_dir: Optional[str] = 'exports', calendar_mode: Optional[str] = None,
+                 metrics_sinks: Optional[List[Any]] = None, log_mode: Optional[str] = None,
+                 search_tool: Optional[BaseTool] = None):
         super().__init__()
-        try:
-            self.search_tool = SerperDevTool()
-        except Exception as e:
-            print(f"Warning: SerperDevTool initialization failed: {e}")
-            self.search_tool = None
-        self.calendar_tool = CalendarGeneratorTool()
+        # CrewBase loads agents.yaml and tasks.yaml through self.load_yaml right after __init__;
+        # read them from the per-process parse cache instead of re-parsing both files every time
+        self.load_yaml = load_config
+        # Every export of this run goes here; give concurrent runs their own directory.
+        # With output_dir=None nothing is written and results are read with artifacts()
+        self.output_dir = output_dir
+        # "single" runs one research task; "fanout" researches sub-topics concurrently
+        self.research_mode = research_mode or os.getenv('TRAVEL_AGENT_RESEARCH_MODE', 'single')
+        if self.research_mode not in RESEARCH_MODES:
+            raise ValueError(f"Unknown research_mode '{self.research_mode}', expected one of {RESEARCH_MODES}")
+        self.calendar_mode = calendar_mode or os.getenv('TRAVEL_AGENT_CALENDAR_MODE', 'agent')
+        if self.calendar_mode not in CALENDAR_MODES:
+            raise ValueError(f"Unknown calendar_mode '{self.calendar_mode}', expected one of {CALENDAR_MODES}")
+        # Per-task memoization: unchanged stages are replayed instead of re-run
+        self.stage_cache = stage_cache if stage_cache is not None else StageCache()
+        # "verbose" prints every agent's reasoning; "quiet" logs sampled summaries and keeps the transcript for failures
+        self.log_mode = log_mode or log_mode_from_env()
+        if self.log_mode not in LOG_MODES:
+            raise ValueError(f"Unknown log_mode '{self.log_mode}', expected one of {LOG_MODES}")
+        self.verbose = self.log_mode == 'verbose'
+        self.run_log = None if self.verbose else RunLog()
+        self.inputs = {}
+        self.compiled_events = None
+        self.search_tool = search_tool if search_tool is not None else shared_search_tool()
+        self.calendar_tool = CalendarGeneratorTool(output_dir=self.output_dir)
+        # Per-task latency, token and cost records (TRAVEL_AGENT_METRICS or metrics_sinks)
+        sinks = metrics_sinks if metrics_sinks is not None else sinks_from_env()
+        self.instrumentation = RunInstrumentation(sinks, search_tool=self.search_tool) if sinks else None
+
+    @before_kickoff
+    def remember_inputs(self, inputs):
+        """Keep the trip inputs around for stages replayed from the cache"""
+        self.inputs = dict(inputs or {})
+        # Records and summaries name agents by their config key, e.g. "itinerary_planner"
+        agent_names = {config['role'].strip(): name for name, config in self.agents_config.items()}
+        if self.instrumentation:
+            self.instrumentation.start(self.crew(), agent_names)
+        if self.run_log:
+            self.run_log.start(self.crew(), agent_names)
+        return inputs
+
+    @after_kickoff
+    def record_metrics(self, output):
+        """Close the run's metrics and log with a summary record"""
+        if self.instrumentation:
+            self.instrumentation.finish()
+        if self.run_log:
+            self.run_log.finish()
+        return output
+
+    def transcript(self) -> str:
+        """The last run's LLM responses and tool calls (quiet mode only; verbose runs print them instead)"""
+        return self.run_log.transcript() if self.run_log else ''
+
+    def rebuild_calendar(self, output):
+        """Generate the .ics file from calendar events the agent did not turn into one itself"""
+        destination = self.inputs.get('destination', 'Trip')
+        start_date = self.inputs.get('start_date', '')
+        if isinstance(output.pydantic, CalendarEvents):
+            events = [event.model_dump() for event in output.pydantic.events]
+            self.calendar_tool.generate_from_events(destination, events, start_date)
+        else:
+            self.calendar_tool._run(destination=destination, events_data=output.raw, start_date=start_date)
+    
+    def compile_calendar(self, output):
+        """Build the calendar events and .ics straight from the itinerary markdown"""
+        start_date = self.inputs.get('start_date', '')
+        self.compiled_events = CalendarEvents(
+            events=[CalendarEvent(**event) for event in compile_itinerary(output.raw, start_date)]
+        )
+        events = [event.model_dump() for event in self.compiled_events.events]
+        self.calendar_tool.generate_from_events(self.inputs.get('destination', 'Trip'), events, start_date)
+
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+            with open(os.path.join(self.output_dir, CALENDAR_EVENTS_FILENAME), 'w', encoding='utf-8') as f:
+                f.write(self.compiled_events.to_text())
     
     # Travel-specific agents
     @agent
     def destination_researcher(self) -> Agent:
         """Agent responsible for researching travel destinations"""
+        return self._build_researcher()
+
+    def _build_researcher(self) -> Agent:
         tools = [self.search_tool] if self.search_tool else []
         return Agent(
             config=self.agents_config['destination_researcher'], # type: ignore[index]
             tools=tools,
-            verbose=True
+            verbose=self.verbose
         )
 
     @agent
@@ -46,58 +189,219 @@ class AiTravelAgent():
         """Agent responsible for creating detailed day-by-day itineraries"""
         return Agent(
             config=self.agents_config['itinerary_planner'], # type: ignore[index]
-            verbose=True
+            verbose=self.verbose
         )
 
     @agent
     def calendar_formatter(self) -> Agent:
         """Agent responsible for formatting itineraries for calendar export"""
+        # In structured mode the .ics is built from the task output, so no tool turn is needed
+        tools = [self.calendar_tool] if self.calendar_mode == 'agent' else []
         return Agent(
             config=self.agents_config['calendar_formatter'], # type: ignore[index]
-            tools=[self.calendar_tool],
-            verbose=True
+            tools=tools,
+            verbose=self.verbose
         )
 
     # Travel-specific tasks
     @task
     def research_destination_task(self) -> Task:
         """Task for researching travel destinations"""
-        return Task(
+        return CachedTask(
             config=self.tasks_config['research_destination_task'], # type: ignore[index]
+            stage_cache=self.stage_cache
         )
 
     @task
     def plan_itinerary_task(self) -> Task:
         """Task for planning the detailed itinerary"""
-        import os
-        os.makedirs('exports', exist_ok=True)
-        return Task(
-            config=self.tasks_config['plan_itinerary_task'], # type: ignore[index]
-            output_file='exports/travel_itinerary.md'
-        )
+        return self._build_plan_itinerary_task()
 
     @task
     def format_calendar_task(self) -> Task:
         """Task for formatting itinerary as calendar events"""
-        import os
-        os.makedirs('exports', exist_ok=True)
-        return Task(
+        return self._build_format_calendar_task()
+
+    def _build_plan_itinerary_task(self, **overrides) -> Task:
+        if self.calendar_mode == 'compiled':
+            # Runs for fresh and replayed outputs alike
+            overrides.setdefault('callback', self.compile_calendar)
+        return CachedTask(
+            config=self.tasks_config['plan_itinerary_task'], # type: ignore[index]
+            name='plan_itinerary_task',
+            export_file=self._export_path(ITINERARY_FILENAME),
+            stage_cache=self.stage_cache,
+            **overrides
+        )
+
+    def _build_format_calendar_task(self, **overrides) -> Task:
+        if self.calendar_mode == 'structured':
+            return CachedTask(
+                config=self.tasks_config['format_calendar_structured_task'], # type: ignore[index]
+                name='format_calendar_task',
+                output_pydantic=CalendarEvents,
+                export_file=self._export_path(CALENDAR_EVENTS_FILENAME),
+                stage_cache=self.stage_cache,
+                callback=self.rebuild_calendar,  # Runs for fresh and replayed outputs alike
+                **overrides
+            )
+        return CachedTask(
             config=self.tasks_config['format_calendar_task'], # type: ignore[index]
-            output_file='exports/calendar_events.txt'
+            name='format_calendar_task',
+            export_file=self._export_path(CALENDAR_EVENTS_FILENAME),
+            stage_cache=self.stage_cache,
+            on_cache_hit=self.rebuild_calendar,  # The agent normally writes the .ics via its tool
+            **overrides
         )
 
+    def _export_path(self, filename: str) -> Optional[str]:
+        return os.path.join(self.output_dir, filename) if self.output_dir else None
+
+    def fanout_tasks(self) -> List[Task]:
+        """Research sub-topics concurrently, then merge them into the itinerary plan"""
+        # Each sub-topic gets its own researcher: an Agent can only run one task at a time
+        research_tasks = [
+            CachedTask(
+                config=self.tasks_config[name], # type: ignore[index]
+                name=name,
+                agent=self._build_researcher(),
+                stage_cache=self.stage_cache
+            )
+            for name in RESEARCH_TOPIC_TASKS
+        ]
+
+        plan_task = self._build_plan_itinerary_task(context=research_tasks)
+        calendar_task = self._build_format_calendar_task(context=[plan_task])
+        return research_tasks + [plan_task, calendar_task]
+
+    def artifacts(self) -> ItineraryArtifacts:
+        """Collect the finished run's itinerary, calendar events and .ics from memory"""
+        outputs = {t.name: t.output for t in self.crew().tasks if t.output is not None}
+        plan = outputs.get('plan_itinerary_task')
+        events = outputs.get('format_calendar_task')
+        destination = self.inputs.get('destination', '')
+        start_date = self.inputs.get('start_date', '')
+
+        events_text = events.raw if events else ''
+        if events and isinstance(events.pydantic, CalendarEvents):
+            events_text = events.pydantic.to_text()
+        elif self.compiled_events is not None:
+            events_text = self.compiled_events.to_text()
+        ics = self.calendar_tool.last_ics
+        if not ics and events_text:
+            # The formatter agent did not call its tool; build the calendar ourselves
+            ics, _ = self.calendar_tool.build_calendar(destination or 'Trip', events_text, start_date)
+
+        return ItineraryArtifacts(
+            itinerary=plan.raw if plan else '',
+            calendar_events=events_text,
+            ics=ics,
+            destination=destination,
+            start_date=start_date,
+        )
+
+    async def kickoff_async(self, inputs: dict):
+        """Run the crew without blocking the event loop"""
+        return await self.crew().kickoff_async(inputs=inputs)
+
+    def kickoff_streaming(self, inputs: dict, on_event: Callable[[StreamEvent], None]):
+        """Run the crew, reporting task progress and LLM tokens to on_event as they happen"""
+        crew = self.crew()
+        for member in crew.agents:
+            if hasattr(member.llm, 'stream'):
+                member.llm.stream = True
+
+        with CrewStreamListener(crew.tasks, on_event):
+            result = crew.kickoff(inputs=inputs)
+
+        on_event(StreamEvent('done', output=result))
+        return result
+
+    def stream(self, inputs: dict) -> Iterator[StreamEvent]:
+        """Run the crew in the background and yield its progress events"""
+        events: queue.Queue = queue.Queue()
+        errors = []
+
+        def worker():
+            try:
+                self.kickoff_streaming(inputs, events.put)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                events.put(None)
+
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+        while (event := events.get()) is not None:
+            yield event
+        thread.join()
+
+        if errors:
+            raise errors[0]
+
     @crew
     def crew(self) -> Crew:
         """Creates the AiTravelAgent crew"""
         # To learn how to add knowledge sources to your crew, check out the documentation:
         # https://docs.crewai.com/concepts/knowledge#what-is-knowledge
 
+        tasks = self.fanout_tasks() if self.research_mode == 'fanout' else list(self.tasks)
+        if self.calendar_mode == 'compiled':
+            # The .ics is compiled from the itinerary, so the calendar agent never runs
+            tasks = [t for t in tasks if t.name != 'format_calendar_task']
+        agents = list({id(t.agent): t.agent for t in tasks}.values())
+
         return Crew(
-            agents=self.agents, # Automatically created by the @agent decorator
-            tasks=self.tasks, # Automatically created by the @task decorator
+            agents=agents, # Automatically created by the @agent decorator
+            tasks=tasks, # Automatically created by the @task decorator
             process=Process.sequential,
-            verbose=True,
+            verbose=self.verbose,
             memory=False,  # Disable memory to avoid timeout prompts
             embedder=None,  # Disable embedder
             # process=Process.hierarchical, # In case you wanna use that instead https://docs.crewai.com/how-to/Hierarchical/
         )
+
+
+class CrewFactory:
+    """Builds AiTravelAgent instances for successive runs from shared, long-lived parts.
+
+    The stage cache and metrics sinks are created once per factory, the search
+    tool is shared process-wide and the YAML configs are parsed once.
+    Each ``create()`` still returns a new AiTravelAgent with its own agents,
+    tasks and calendar tool, so runs never share task state.
+    """
+
+    def __init__(self, **settings: Any):
+        self.settings = settings
+        self._shared: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def _shared_parts(self) -> Dict[str, Any]:
+        if self._shared is None:
+            with self._lock:
+                if self._shared is None:
+                    sinks = self.settings.get('metrics_sinks')
+                    self._shared = {
+                        **self.settings,
+                        'stage_cache': self.settings.get('stage_cache') or StageCache(),
+                        # One set of sinks for every run, so e.g. Prometheus counters accumulate across runs
+                        'metrics_sinks': sinks if sinks is not None else sinks_from_env(),
+                    }
+        return self._shared
+
+    def create(self, **overrides: Any) -> AiTravelAgent:
+        """A fresh AiTravelAgent for one run; ``overrides`` replace the factory's settings"""
+        return AiTravelAgent(**{**self._shared_parts(), **overrides})
+
+
+_factories: Dict[tuple, CrewFactory] = {}
+_factories_lock = threading.Lock()
+
+
+def crew_factory(**settings: Any) -> CrewFactory:
+    """The process-wide CrewFactory for a set of settings (e.g. ``output_dir=None``), created on first use"""
+    key = tuple(sorted((name, repr(value)) for name, value in settings.items()))
+    with _factories_lock:
+        if key not in _factories:
+            _factories[key] = CrewFactory(**settings)
+        return _factories[key]
@@ -0,0 +1,90 @@
+"""
+Per-run routing of crewai events.
+
+The crewai event bus is process-wide and keeps its handlers in plain lists
+that ``emit`` walks without a lock, so adding and removing handlers for each
+run races with concurrent runs emitting on other threads (a removal can make
+another run skip its next handler). Instead one dispatcher is registered on
+the bus, once, and listeners subscribe here under the ids of the crew, tasks
+and agents of their run. Each event is delivered only to the subscriptions
+whose ids it carries.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Type
+
+from crewai.events import crewai_event_bus
+from crewai.events.base_events import BaseEvent
+
+Handler = Callable[[Any, Any], None]
+
+
+class Subscription:
+    """One listener's handlers, reached through the ids of its run's crew, tasks and agents."""
+
+    def __init__(self, keys: Iterable[Any], handlers: Iterable[Tuple[Type[BaseEvent], Handler]]):
+        self.keys = frozenset(str(key) for key in keys if key is not None)
+        self.handlers = list(handlers)
+
+
+def run_keys(crew: Any) -> List[str]:
+    """The ids events of a crew's run are routed by: the crew's, its tasks' and its agents'."""
+    return [str(crew.id)] + [str(t.id) for t in crew.tasks] + [str(a.id) for a in crew.agents]
+
+
+def _event_keys(source: Any, event: BaseEvent) -> List[str]:
+    # Task events carry the task, tool and LLM events its id; agent logs and crew events only have a source
+    values = (
+        getattr(getattr(event, 'task', None), 'id', None),
+        getattr(event, 'task_id', None),
+        getattr(event, 'agent_id', None),
+        getattr(source, 'id', None),
+    )
+    return [str(value) for value in values if value is not None]
+
+
+class EventRouter:
+    """Delivers crewai events to the subscriptions of the run they belong to."""
+
+    def __init__(self, bus: Any = crewai_event_bus):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, List[Subscription]] = {}
+        # Registered for every event once, before any run starts; never removed
+        bus.register_handler(BaseEvent, self._dispatch)
+
+    def subscribe(self, keys: Iterable[Any], handlers: Iterable[Tuple[Type[BaseEvent], Handler]]) -> Subscription:
+        """Deliver events carrying any of ``keys`` to the matching ``(event type, handler)`` pairs."""
+        subscription = Subscription(keys, handlers)
+        with self._lock:
+            for key in subscription.keys:
+                self._routes.setdefault(key, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            for key in subscription.keys:
+                routes = self._routes.get(key, [])
+                if subscription in routes:
+                    routes.remove(subscription)
+                if not routes:
+                    self._routes.pop(key, None)
+
+    def _dispatch(self, source: Any, event: BaseEvent) -> None:
+        with self._lock:
+            # An event can carry several ids of the same run; deliver it once per subscription
+            subscriptions = {
+                id(subscription): subscription
+                for key in _event_keys(source, event)
+                for subscription in self._routes.get(key, ())
+            }
+        for subscription in subscriptions.values():
+            for event_type, handler in subscription.handlers:
+                if isinstance(event, event_type):
+                    try:
+                        handler(source, event)
+                    except Exception as e:
+                        # One failing listener must not starve the others
+                        print(f"Warning: event handler {getattr(handler, '__name__', handler)} failed: {e}")
+
+
+event_router = EventRouter()
@@ -0,0 +1,411 @@
+"""
+Per-stage latency, token and cost instrumentation for crew runs.
+
+While a crew runs, every task and tool call is recorded as a ``StageRecord``:
+wall time, the agent that ran it, LLM prompt and completion tokens, search
+queries and an estimated cost. A run summary follows when the crew finishes.
+Records go to pluggable sinks: an in-memory list (with per-agent p50/p95), a
+JSONL file, or a Prometheus text exposition file.
+"""
+
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from crewai.events.types.crew_events import CrewKickoffFailedEvent
+from crewai.events.types.task_events import TaskCompletedEvent, TaskFailedEvent, TaskStartedEvent
+from crewai.events.types.tool_usage_events import ToolUsageErrorEvent, ToolUsageFinishedEvent
+
+from ai_travel_agent.cache import env_float
+from ai_travel_agent.events import event_router, run_keys
+
+# USD per million (prompt, completion) tokens; the longest matching prefix wins
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    'gpt-4o-mini': (0.15, 0.60),
+    'gpt-4o': (2.50, 10.00),
+    'gpt-4.1-nano': (0.10, 0.40),
+    'gpt-4.1-mini': (0.40, 1.60),
+    'gpt-4.1': (2.00, 8.00),
+    'gpt-4-turbo': (10.00, 30.00),
+    'gpt-4': (30.00, 60.00),
+    'gpt-3.5-turbo': (0.50, 1.50),
+}
+
+# USD per live Serper query (TRAVEL_AGENT_SERPER_COST overrides it)
+DEFAULT_SERPER_COST = 0.001
+
+
+def llm_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimated USD cost of a number of tokens on a model; 0 for unknown models."""
+    model = (model or '').split('/')[-1].lower()
+    matches = [name for name in MODEL_PRICES if model.startswith(name)]
+    if not matches:
+        return 0.0
+    prompt_price, completion_price = MODEL_PRICES[max(matches, key=len)]
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+@dataclass
+class StageRecord:
+    """One measured stage: a task, a tool call or a whole run (kind 'task', 'tool' or 'run')."""
+    kind: str
+    name: str
+    run_id: str
+    agent: str = ''
+    task: str = ''
+    started_at: float = 0.0
+    duration_s: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    llm_calls: int = 0
+    search_queries: int = 0
+    serper_calls: int = 0
+    cost_usd: float = 0.0
+    status: str = 'ok'
+    error: str = ''
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class MemorySink:
+    """Keeps records in memory; ``summary()`` aggregates them per agent."""
+
+    def __init__(self):
+        self.records: List[StageRecord] = []
+        self._lock = threading.Lock()
+
+    def emit(self, record: StageRecord) -> None:
+        with self._lock:
+            self.records.append(record)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Task latency percentiles, tokens and cost for each agent."""
+        by_agent: Dict[str, List[StageRecord]] = defaultdict(list)
+        with self._lock:
+            for record in self.records:
+                if record.kind == 'task':
+                    by_agent[record.agent].append(record)
+        return {
+            agent: {
+                'tasks': len(records),
+                'p50_s': percentile([r.duration_s for r in records], 0.50),
+                'p95_s': percentile([r.duration_s for r in records], 0.95),
+                'prompt_tokens': sum(r.prompt_tokens for r in records),
+                'completion_tokens': sum(r.completion_tokens for r in records),
+                'cost_usd': sum(r.cost_usd for r in records),
+            }
+            for agent, records in by_agent.items()
+        }
+
+
+class JsonlSink:
+    """Appends each record as one JSON line to a file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def emit(self, record: StageRecord) -> None:
+        line = json.dumps(record.to_dict(), ensure_ascii=False)
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+
+
+class PrometheusSink:
+    """Aggregates records into Prometheus metrics, rendered in the text exposition format.
+
+    With a ``path`` the exposition is rewritten after every run, ready for the
+    node_exporter textfile collector; otherwise call ``render()`` to serve it.
+    """
+
+    BUCKETS = (0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300, float('inf'))
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        # (kind, name, agent) -> [per-bucket counts..., sum, count]
+        self._histograms: Dict[Tuple[str, str, str], List[float]] = defaultdict(
+            lambda: [0] * len(self.BUCKETS) + [0.0, 0]
+        )
+        self._counters: Dict[Tuple[str, str, str], float] = defaultdict(float)
+
+    def emit(self, record: StageRecord) -> None:
+        with self._lock:
+            histogram = self._histograms[(record.kind, record.name, record.agent)]
+            for i, bound in enumerate(self.BUCKETS):
+                if record.duration_s <= bound:
+                    histogram[i] += 1
+            histogram[-2] += record.duration_s
+            histogram[-1] += 1
+            if record.kind == 'task':
+                for name, value in (('prompt_tokens', record.prompt_tokens),
+                                    ('completion_tokens', record.completion_tokens),
+                                    ('search_queries', record.search_queries),
+                                    ('cost_usd', record.cost_usd)):
+                    self._counters[(name, record.agent, record.status)] += value
+            elif record.kind == 'run':
+                self._counters[('serper_calls', '', record.status)] += record.serper_calls
+                self._counters[('runs', '', record.status)] += 1
+        if record.kind == 'run' and self.path:
+            self.write(self.path)
+
+    def render(self) -> str:
+        lines = [
+            '# HELP travel_agent_stage_duration_seconds Wall time of crew runs, tasks and tool calls.',
+            '# TYPE travel_agent_stage_duration_seconds histogram',
+        ]
+        with self._lock:
+            for (kind, name, agent), histogram in sorted(self._histograms.items()):
+                labels = f'kind="{kind}",name="{_label(name)}",agent="{_label(agent)}"'
+                for bound, count in zip(self.BUCKETS, histogram):
+                    le = '+Inf' if bound == float('inf') else f'{bound:g}'
+                    lines.append(f'travel_agent_stage_duration_seconds_bucket{{{labels},le="{le}"}} {count}')
+                lines.append(f'travel_agent_stage_duration_seconds_sum{{{labels}}} {histogram[-2]:.6f}')
+                lines.append(f'travel_agent_stage_duration_seconds_count{{{labels}}} {histogram[-1]}')
+
+            declared = set()
+            for (name, agent, status), value in sorted(self._counters.items()):
+                metric = f'travel_agent_{name}_total'
+                if metric not in declared:
+                    lines.append(f'# TYPE {metric} counter')
+                    declared.add(metric)
+                labels = f'status="{status}"' + (f',agent="{_label(agent)}"' if agent else '')
+                lines.append(f'{metric}{{{labels}}} {value:g}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str) -> None:
+        """Atomically replace ``path`` with the current exposition."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(temp_path, path)
+
+
+def _label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', ' ')
+
+
+def sinks_from_env() -> List[Any]:
+    """Sinks configured by TRAVEL_AGENT_METRICS, e.g. "jsonl:metrics.jsonl,prometheus:metrics.prom"."""
+    sinks: List[Any] = []
+    for spec in filter(None, (part.strip() for part in os.getenv('TRAVEL_AGENT_METRICS', '').split(','))):
+        kind, _, target = spec.partition(':')
+        if kind == 'jsonl':
+            sinks.append(JsonlSink(target or 'metrics.jsonl'))
+        elif kind == 'prometheus':
+            sinks.append(PrometheusSink(target or 'metrics.prom'))
+        elif kind == 'memory':
+            sinks.append(MemorySink())
+        else:
+            raise ValueError(f"Unknown metrics sink '{kind}', expected jsonl, prometheus or memory")
+    return sinks
+
+
+@dataclass
+class _TaskState:
+    name: str
+    agent: Any
+    agent_name: str
+    started: float = 0.0
+    started_at: float = 0.0
+    usage: Dict[str, int] = field(default_factory=dict)
+    search_queries: int = 0
+    serper_calls: int = 0
+
+
+class RunInstrumentation:
+    """Records one crew run's tasks and tool calls and sends them to sinks.
+
+    ``start()`` is meant for a before-kickoff hook and ``finish()`` for an
+    after-kickoff hook; a failed kickoff finishes the run by itself. The event
+    bus is process-wide, so only events routed to this run's crew, tasks and
+    agents are recorded. The search tool may be shared by concurrent runs, so
+    live Serper calls are counted from this run's own tool calls.
+    """
+
+    def __init__(self, sinks: Iterable[Any], search_tool: Any = None):
+        self.sinks = list(sinks)
+        # Agent role -> config name ("Expert Travel Itinerary Planner" -> "itinerary_planner")
+        self.agent_names: Dict[str, str] = {}
+        self.search_tool = search_tool
+        self.serper_cost = env_float('TRAVEL_AGENT_SERPER_COST', DEFAULT_SERPER_COST)
+        self.run_id = ''
+        self._tasks: Dict[str, _TaskState] = {}
+        self._records: List[StageRecord] = []
+        self._lock = threading.Lock()
+        self._started = 0.0
+        self._started_at = 0.0
+        self._subscription = None
+        self._crew = None
+        self._handlers = [
+            (TaskStartedEvent, self._on_task_started),
+            (TaskCompletedEvent, self._on_task_completed),
+            (TaskFailedEvent, self._on_task_failed),
+            (ToolUsageFinishedEvent, self._on_tool_finished),
+            (ToolUsageErrorEvent, self._on_tool_error),
+            (CrewKickoffFailedEvent, self._on_kickoff_failed),
+        ]
+
+    @property
+    def records(self) -> List[StageRecord]:
+        """Records of the current (or last) run."""
+        return list(self._records)
+
+    def start(self, crew: Any, agent_names: Optional[Dict[str, str]] = None) -> None:
+        """Start recording a run of ``crew``; ``agent_names`` maps agent roles to the names used in records."""
+        if self._subscription is not None:
+            self._unregister()
+        if agent_names is not None:
+            self.agent_names = agent_names
+        self.run_id = uuid.uuid4().hex[:12]
+        self._crew = crew
+        self._records = []
+        self._tasks = {
+            str(t.id): _TaskState(t.name or t.description[:40], t.agent, self._agent_name(t.agent))
+            for t in crew.tasks
+        }
+        self._started, self._started_at = time.perf_counter(), time.time()
+        self._subscription = event_router.subscribe(run_keys(crew), self._handlers)
+
+    def finish(self, status: str = 'ok', error: str = '') -> Optional[StageRecord]:
+        """Emit the run summary and stop listening; returns the run record."""
+        if self._subscription is None:
+            return None
+        self._unregister()
+        with self._lock:
+            tasks = [r for r in self._records if r.kind == 'task']
+        serper_calls = sum(state.serper_calls for state in self._tasks.values())
+        record = StageRecord(
+            kind='run', name='crew', run_id=self.run_id,
+            started_at=self._started_at,
+            duration_s=time.perf_counter() - self._started,
+            prompt_tokens=sum(r.prompt_tokens for r in tasks),
+            completion_tokens=sum(r.completion_tokens for r in tasks),
+            llm_calls=sum(r.llm_calls for r in tasks),
+            search_queries=sum(r.search_queries for r in tasks),
+            serper_calls=serper_calls,
+            cost_usd=sum(r.cost_usd for r in tasks) + serper_calls * self.serper_cost,
+            status=status, error=error,
+        )
+        self._emit(record)
+        return record
+
+    def _unregister(self) -> None:
+        event_router.unsubscribe(self._subscription)
+        self._subscription = None
+
+    def _agent_name(self, agent: Any) -> str:
+        role = (getattr(agent, 'role', '') or '').strip()
+        return self.agent_names.get(role, role)
+
+    @staticmethod
+    def _usage(agent: Any) -> Dict[str, int]:
+        process = getattr(agent, '_token_process', None)
+        if process is None:
+            return {}
+        summary = process.get_summary()
+        return {
+            'prompt_tokens': summary.prompt_tokens,
+            'completion_tokens': summary.completion_tokens,
+            'llm_calls': summary.successful_requests,
+        }
+
+    def _emit(self, record: StageRecord) -> None:
+        with self._lock:
+            self._records.append(record)
+        for sink in self.sinks:
+            try:
+                sink.emit(record)
+            except Exception as e:
+                # Metrics must never fail a run
+                print(f"Warning: metrics sink {type(sink).__name__} failed: {e}")
+
+    def _state(self, task: Any) -> Optional[_TaskState]:
+        task_id = getattr(task, 'id', task)
+        return self._tasks.get(str(task_id)) if task_id is not None else None
+
+    def _on_task_started(self, source, event: TaskStartedEvent) -> None:
+        state = self._state(event.task)
+        if state:
+            state.started, state.started_at = time.perf_counter(), time.time()
+            state.usage = self._usage(state.agent)
+            state.search_queries = 0
+            state.serper_calls = 0
+
+    def _finish_task(self, task: Any, status: str, error: str = '') -> None:
+        state = self._state(task)
+        if state is None or not state.started:
+            return
+        # An agent runs one task at a time, so its token counter's growth belongs to this task
+        usage = self._usage(state.agent)
+        delta = {key: usage.get(key, 0) - state.usage.get(key, 0) for key in usage}
+        model = getattr(getattr(state.agent, 'llm', None), 'model', '') or ''
+        self._emit(StageRecord(
+            kind='task', name=state.name, run_id=self.run_id, agent=state.agent_name, task=state.name,
+            started_at=state.started_at, duration_s=time.perf_counter() - state.started,
+            prompt_tokens=delta.get('prompt_tokens', 0),
+            completion_tokens=delta.get('completion_tokens', 0),
+            llm_calls=delta.get('llm_calls', 0),
+            search_queries=state.search_queries,
+            cost_usd=llm_cost(model, delta.get('prompt_tokens', 0), delta.get('completion_tokens', 0)),
+            status=status, error=error,
+        ))
+        state.started = 0.0
+
+    def _on_task_completed(self, source, event: TaskCompletedEvent) -> None:
+        self._finish_task(event.task, 'ok')
+
+    def _on_task_failed(self, source, event: TaskFailedEvent) -> None:
+        self._finish_task(event.task, 'failed', str(event.error))
+
+    def _tool_record(self, event, status: str, error: str = '') -> None:
+        state = self._state(event.task_id)
+        if state is None:
+            return
+        if self.search_tool is not None and event.tool_name == getattr(self.search_tool, 'name', None):
+            state.search_queries += 1
+            # Only a cache miss went out to Serper; crewai's own tool cache never reaches the tool
+            take_outcome = getattr(self.search_tool, 'take_outcome', None)
+            if take_outcome and not getattr(event, 'from_cache', False) and take_outcome() == 'miss':
+                state.serper_calls += 1
+        started = getattr(event, 'started_at', None)
+        finished = getattr(event, 'finished_at', None)
+        duration = (finished - started).total_seconds() if started and finished else 0.0
+        self._emit(StageRecord(
+            kind='tool', name=event.tool_name, run_id=self.run_id, agent=state.agent_name, task=state.name,
+            started_at=started.timestamp() if started else time.time(), duration_s=duration,
+            status=status, error=error,
+        ))
+
+    def _on_tool_finished(self, source, event: ToolUsageFinishedEvent) -> None:
+        self._tool_record(event, 'cached' if event.from_cache else 'ok')
+
+    def _on_tool_error(self, source, event: ToolUsageErrorEvent) -> None:
+        self._tool_record(event, 'failed', str(event.error))
+
+    def _on_kickoff_failed(self, source, event: CrewKickoffFailedEvent) -> None:
+        if source is not self._crew:
+            return
+        for task_id, state in list(self._tasks.items()):
+            if state.started:
+                self._finish_task(task_id, 'failed', str(event.error))
+        self.finish('failed', str(event.error))
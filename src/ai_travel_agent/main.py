@@ -1,9 +1,13 @@
 #!/usr/bin/env python
+import os
 import sys
 import warnings
 from datetime import datetime, timedelta
 
-from ai_travel_agent.crew import AiTravelAgent
+from ai_travel_agent.crew import AiTravelAgent, crew_factory
+from ai_travel_agent.cache import ResultCache
+from ai_travel_agent.run_log import log_mode
+from ai_travel_agent.workspace import RunWorkspace
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
@@ -38,17 +42,42 @@ def run():
         '''
     }
     
-    print("\n" + "="*80)
-    print("🌍 AI TRAVEL AGENT - Generating Your Personalized Itinerary")
-    print("="*80)
-    print(f"\n📍 Destination: {inputs['destination']}")
-    print(f"📅 Duration: {inputs['days']} days")
-    print(f"🗓️  Start Date: {inputs['start_date']}")
-    print(f"✨ Preferences: {inputs['preferences'].strip()}")
-    print("\n" + "="*80 + "\n")
+    # TRAVEL_AGENT_LOG_MODE=quiet skips the banners and agent transcripts
+    quiet = log_mode() == 'quiet'
+    if not quiet:
+        print("\n" + "="*80)
+        print("🌍 AI TRAVEL AGENT - Generating Your Personalized Itinerary")
+        print("="*80)
+        print(f"\n📍 Destination: {inputs['destination']}")
+        print(f"📅 Duration: {inputs['days']} days")
+        print(f"🗓️  Start Date: {inputs['start_date']}")
+        print(f"✨ Preferences: {inputs['preferences'].strip()}")
+        print("\n" + "="*80 + "\n")
+    
+    # The CLI keeps writing straight into exports/
+    workspace = RunWorkspace(run_id='cli', directory='exports')
+    result_cache = ResultCache()
+    travel_agent = None
     
     try:
-        result = AiTravelAgent().crew().kickoff(inputs=inputs)
+        artifacts = result_cache.get(inputs)
+        if artifacts:
+            if not quiet:
+                print("⚡ Found a cached itinerary for these inputs - skipping the crew run.")
+        else:
+            travel_agent = crew_factory(output_dir=None).create()
+            travel_agent.crew().kickoff(inputs=inputs)
+            artifacts = travel_agent.artifacts()
+            result_cache.put(inputs, artifacts)
+        
+        artifacts.write_files(
+            workspace.itinerary_path,
+            workspace.calendar_events_path,
+            workspace.ics_path(inputs['destination'])
+        )
+        result = artifacts.itinerary
+        if quiet:
+            return result
         
         print("\n" + "="*80)
         print("✅ ITINERARY GENERATION COMPLETE!")
@@ -62,6 +91,14 @@ def run():
         
         return result
     except Exception as e:
+        transcript = travel_agent.transcript() if travel_agent else ''
+        if transcript:
+            # Quiet runs print nothing, so keep what the agents did for debugging
+            os.makedirs(workspace.directory, exist_ok=True)
+            with open(workspace.transcript_path, 'w', encoding='utf-8') as f:
+                f.write(transcript)
+            raise Exception(f"An error occurred while running the crew: {e} "
+                            f"(transcript saved to {workspace.transcript_path})")
         raise Exception(f"An error occurred while running the crew: {e}")
 
 
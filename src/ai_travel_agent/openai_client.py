@@ -0,0 +1,62 @@
+"""
+Shared, connection-pooled OpenAI client.
+
+Creating an OpenAI client per request throws away its HTTP connection pool,
+so every chat question paid for a new TCP and TLS handshake. One client per
+process keeps connections alive between questions and across Streamlit
+sessions. Its pool size caps the number of concurrent requests, and failed
+requests (connection errors, 429s and 5xx responses) are retried with
+exponential backoff by the OpenAI SDK.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+from openai import OpenAI
+
+from ai_travel_agent.cache import env_float
+
+DEFAULT_MAX_CONNECTIONS = 10
+DEFAULT_KEEPALIVE_SECONDS = 60.0
+DEFAULT_TIMEOUT_SECONDS = 60.0
+DEFAULT_MAX_RETRIES = 3
+
+
+@dataclass(frozen=True)
+class ClientSettings:
+    """Connection pool and retry settings for the shared client."""
+    max_connections: int = DEFAULT_MAX_CONNECTIONS
+    keepalive_seconds: float = DEFAULT_KEEPALIVE_SECONDS
+    timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS
+    max_retries: int = DEFAULT_MAX_RETRIES
+
+    @classmethod
+    def from_env(cls) -> 'ClientSettings':
+        return cls(
+            max_connections=max(1, int(env_float('TRAVEL_AGENT_OPENAI_MAX_CONNECTIONS', DEFAULT_MAX_CONNECTIONS))),
+            keepalive_seconds=env_float('TRAVEL_AGENT_OPENAI_KEEPALIVE', DEFAULT_KEEPALIVE_SECONDS),
+            timeout_seconds=env_float('TRAVEL_AGENT_OPENAI_TIMEOUT', DEFAULT_TIMEOUT_SECONDS),
+            max_retries=max(0, int(env_float('TRAVEL_AGENT_OPENAI_MAX_RETRIES', DEFAULT_MAX_RETRIES))),
+        )
+
+
+def create_client(settings: Optional[ClientSettings] = None, api_key: Optional[str] = None) -> OpenAI:
+    """Build an OpenAI client on a keep-alive connection pool."""
+    settings = settings or ClientSettings.from_env()
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            # Requests beyond the pool size wait for a free connection
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_connections,
+            keepalive_expiry=settings.keepalive_seconds,
+        ),
+        timeout=httpx.Timeout(settings.timeout_seconds, connect=10.0),
+    )
+    return OpenAI(
+        api_key=api_key or os.getenv('OPENAI_API_KEY'),
+        http_client=http_client,
+        max_retries=settings.max_retries,
+    )
+
@@ -0,0 +1,261 @@
+"""
+Token-budgeted itinerary context for chat questions.
+
+Pasting a whole 14-day itinerary into every chat prompt costs thousands of
+tokens per question. The itinerary is split into chunks by day and section,
+indexed with BM25, and only the chunks relevant to the question are sent,
+within a token budget. Itineraries that already fit the budget are sent whole.
+
+The system message holds only what is fixed for an itinerary (the
+instructions and either the whole itinerary or its outline of headings), so
+every question about it starts with the same prompt prefix and provider-side
+prompt caching can reuse it. Chunks picked for a question go in the last
+message, with the question.
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+from ai_travel_agent.cache import env_float
+
+DEFAULT_CONTEXT_TOKENS = 1500
+
+# Earlier chat messages sent along with a question
+HISTORY_MESSAGES = 5
+
+SYSTEM_INSTRUCTIONS = (
+    "You are a helpful travel assistant. Answer questions about the itinerary below, provide "
+    "suggestions, and help the user modify their plans. Be concise, helpful, and friendly."
+)
+
+# Rough size of a token in English prose; avoids shipping a tokenizer model
+CHARS_PER_TOKEN = 4
+
+HEADING = re.compile(r'^\s*(?:(?P<level>#{1,6})\s+(?P<md>.+?)|\*\*(?P<bold>[^*]+)\*\*:?)\s*$')
+DAY_HEADING = re.compile(r'\bday\s+(\d+)\b', re.IGNORECASE)
+WORD = re.compile(r'\w+')
+
+# Words and openings that point back at earlier turns ("how much is it?", "and the day after?")
+FOLLOW_UP_WORDS = frozenset(
+    'it its that this these those they them their he she him her same else instead another '
+    'previous earlier above former latter'.split()
+)
+FOLLOW_UP_START = re.compile(r'^\W*(?:and|but|or|so|also|then|why|what about|how about)\b', re.IGNORECASE)
+
+STOPWORDS = frozenset(
+    'a an and are at be can do does for from how i in is it me my of on or should the there '
+    'this to us we what when where which who will with you your'.split()
+)
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def context_budget() -> int:
+    """Token budget for the itinerary part of a chat prompt (TRAVEL_AGENT_QA_CONTEXT_TOKENS)."""
+    return int(env_float('TRAVEL_AGENT_QA_CONTEXT_TOKENS', DEFAULT_CONTEXT_TOKENS))
+
+
+def tokenize(text: str) -> List[str]:
+    return [word for word in WORD.findall(text.casefold()) if word not in STOPWORDS]
+
+
+@dataclass
+class Chunk:
+    """A section of the itinerary: its heading, text and the day it belongs to (if any)."""
+    heading: str
+    text: str
+    day: Optional[int] = None
+    # Heading of the enclosing day, for sub-sections such as "Evening"
+    parent: str = ''
+    tokens: int = field(init=False)
+
+    def __post_init__(self):
+        self.tokens = estimate_tokens(self.text)
+
+
+def split_itinerary(markdown: str) -> List[Chunk]:
+    """Split itinerary markdown at headings, keeping each chunk's day."""
+    chunks: List[Chunk] = []
+    day: Optional[int] = None
+    day_heading, day_level = '', 0
+    heading, lines = '', []
+
+    def flush():
+        text = '\n'.join(lines).strip()
+        if text:
+            chunks.append(Chunk(heading, text, day, '' if heading == day_heading else day_heading))
+
+    for line in markdown.splitlines():
+        match = HEADING.match(line)
+        if match:
+            flush()
+            title = (match.group('md') or match.group('bold')).strip()
+            # Bold lines rank below every markdown heading
+            level = len(match.group('level') or '#######')
+            day_match = DAY_HEADING.search(title)
+            if day_match:
+                day, day_heading, day_level = int(day_match.group(1)), title, level
+                heading = title
+            else:
+                if day_heading and level <= day_level:
+                    # A heading at the day's level ("## Budget Summary") closes the day
+                    day, day_heading, day_level = None, '', 0
+                heading = title
+            lines = [line]
+            continue
+        lines.append(line)
+    flush()
+    return chunks
+
+
+class BM25Index:
+    """Okapi BM25 over a list of chunks (a sub-section's day heading counts as part of its text)."""
+
+    def __init__(self, chunks: List[Chunk], k1: float = 1.5, b: float = 0.75):
+        self.k1, self.b = k1, b
+        self.term_counts: List[Counter] = [Counter(tokenize(f'{chunk.parent}\n{chunk.text}')) for chunk in chunks]
+        self.lengths = [sum(counts.values()) for counts in self.term_counts]
+        self.average_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+        document_frequency: Counter = Counter()
+        for counts in self.term_counts:
+            document_frequency.update(counts.keys())
+        total = len(chunks)
+        self.idf: Dict[str, float] = {
+            term: math.log(1 + (total - df + 0.5) / (df + 0.5)) for term, df in document_frequency.items()
+        }
+
+    def scores(self, query: str) -> List[float]:
+        terms = [term for term in tokenize(query) if term in self.idf]
+        results = []
+        for counts, length in zip(self.term_counts, self.lengths):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * length / (self.average_length or 1))
+            for term in terms:
+                frequency = counts.get(term)
+                if frequency:
+                    score += self.idf[term] * frequency * (self.k1 + 1) / (frequency + norm)
+            results.append(score)
+        return results
+
+
+class ItineraryContext:
+    """The chunked and indexed form of one itinerary; build it once per itinerary with ``for_itinerary``."""
+
+    def __init__(self, itinerary: str):
+        self.itinerary = itinerary
+        self.tokens = estimate_tokens(itinerary)
+        self.chunks = split_itinerary(itinerary)
+        self.index = BM25Index(self.chunks)
+        # Top-level headings in itinerary order ("Day 1: Arrival", "Budget Summary")
+        self.outline = list(dict.fromkeys(chunk.heading for chunk in self.chunks if chunk.heading and not chunk.parent))
+
+    def fits(self, budget: Optional[int] = None) -> bool:
+        """Whether the whole itinerary fits the token budget."""
+        return self.tokens <= (context_budget() if budget is None else budget) or not self.chunks
+
+    @classmethod
+    @lru_cache(maxsize=32)
+    def for_itinerary(cls, itinerary: str) -> 'ItineraryContext':
+        return cls(itinerary)
+
+    def build(self, question: str, budget: Optional[int] = None) -> str:
+        """The itinerary text to send with a question, at most ``budget`` tokens.
+
+        Chunks of the days the question names ("day 3") come first, then the
+        rest by BM25 score; the selection is returned in itinerary order.
+        """
+        budget = context_budget() if budget is None else budget
+        if self.fits(budget):
+            return self.itinerary
+
+        days = {int(day) for day in DAY_HEADING.findall(question)}
+        scores = self.index.scores(question)
+        ranked = sorted(
+            range(len(self.chunks)),
+            key=lambda i: (self.chunks[i].day in days, scores[i]),
+            reverse=True,
+        )
+
+        selected, used = [], 0
+        for i in ranked:
+            chunk = self.chunks[i]
+            if scores[i] <= 0 and chunk.day not in days:
+                break
+            cost = chunk.tokens + (estimate_tokens(chunk.parent) + 1 if chunk.parent else 0)
+            if used + cost > budget:
+                continue
+            selected.append(i)
+            used += cost
+
+        if not selected:
+            # Nothing matched: the start of the itinerary still tells the model what trip this is
+            return self.itinerary[:budget * CHARS_PER_TOKEN]
+        parts, shown = [], set()
+        for i in sorted(selected):
+            chunk = self.chunks[i]
+            if chunk.parent and chunk.parent not in shown:
+                # Keep "Evening" tied to its day when the day's own chunk was left out
+                parts.append(f'[{chunk.parent}]')
+            shown.add(chunk.parent or chunk.heading)
+            parts.append(chunk.text)
+        return '\n\n'.join(parts)
+
+
+def build_context(itinerary: str, question: str, budget: Optional[int] = None) -> str:
+    """Select the parts of an itinerary relevant to a question within a token budget."""
+    return ItineraryContext.for_itinerary(itinerary).build(question, budget)
+
+
+def recent_history(history: Iterable[Dict[str, str]]) -> List[Dict[str, str]]:
+    """The earlier chat messages sent along with a question (the last HISTORY_MESSAGES)."""
+    recent = [msg for msg in history if msg.get('role') in ('user', 'assistant')][-HISTORY_MESSAGES:]
+    return [{"role": msg['role'], "content": msg['content']} for msg in recent]
+
+
+def is_follow_up(question: str) -> bool:
+    """Whether a question refers back to earlier turns, so its answer depends on the chat history."""
+    if FOLLOW_UP_START.match(question):
+        return True
+    return any(word in FOLLOW_UP_WORDS for word in WORD.findall(question.casefold()))
+
+
+def cache_history(question: str, history: Iterable[Dict[str, str]]) -> List[Dict[str, str]]:
+    """The earlier turns a cached answer is keyed on: the recent history for follow-ups, none otherwise.
+
+    The selected itinerary chunks depend only on the question, so a question
+    that stands on its own gets the same answer however the chat got there.
+    """
+    return recent_history(history) if is_follow_up(question) else []
+
+
+def build_messages(itinerary: Optional[str], question: str, history: Iterable[Dict[str, str]] = (),
+                   budget: Optional[int] = None) -> List[Dict[str, str]]:
+    """Chat messages for a question about an itinerary.
+
+    The system message is the same for every question about an itinerary: the
+    instructions and the whole itinerary, or its outline when it is over the
+    budget. The recent history follows, then the question together with the
+    itinerary chunks selected for it.
+    """
+    messages = []
+    content = question
+    if itinerary:
+        context = ItineraryContext.for_itinerary(itinerary)
+        if context.fits(budget):
+            messages.append({"role": "system", "content": f"{SYSTEM_INSTRUCTIONS}\n\nItinerary:\n\n{itinerary}"})
+        else:
+            outline = '\n'.join(f"- {heading}" for heading in context.outline)
+            messages.append({"role": "system", "content": (
+                f"{SYSTEM_INSTRUCTIONS}\n\nItinerary outline:\n\n{outline}\n\n"
+                "The parts of the itinerary relevant to each question are sent with it."
+            )})
+            content = f"Relevant parts of the itinerary:\n\n{context.build(question, budget)}\n\nQuestion: {question}"
+    messages.extend(recent_history(history))
+    messages.append({"role": "user", "content": content})
+    return messages
@@ -0,0 +1,221 @@
+"""
+Quiet logging for crew runs.
+
+With ``verbose=True`` every agent streams its full reasoning transcript to
+stdout, which is slow to print and floods log shipping in production. In
+"quiet" mode agents and the crew run silently; each run instead logs one
+structured (JSON) summary per task and per run to the ``ai_travel_agent.runs``
+logger, for a sampled fraction of runs. The logger keeps its latest records in
+an in-memory ring buffer. The run's transcript (each agent step: its thoughts,
+tool calls and tool results) is kept in a bounded buffer as well and logged
+only when the run fails.
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from crewai.events.types.crew_events import CrewKickoffFailedEvent
+from crewai.events.types.logging_events import AgentLogsExecutionEvent
+from crewai.events.types.task_events import TaskCompletedEvent, TaskFailedEvent, TaskStartedEvent
+
+from ai_travel_agent.cache import env_float
+from ai_travel_agent.events import event_router, run_keys
+
+LOG_MODES = ('verbose', 'quiet')
+
+# Fraction of successful runs whose summaries are logged; failures always are
+DEFAULT_SAMPLE_RATE = 0.1
+DEFAULT_TRANSCRIPT_ENTRIES = 500
+DEFAULT_BUFFER_RECORDS = 1000
+
+logger = logging.getLogger('ai_travel_agent.runs')
+
+
+def log_mode() -> str:
+    """The logging mode from TRAVEL_AGENT_LOG_MODE ("verbose" unless set)."""
+    return os.getenv('TRAVEL_AGENT_LOG_MODE', 'verbose').strip().lower() or 'verbose'
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the latest ``capacity`` records in memory, optionally forwarding each to ``target``."""
+
+    def __init__(self, capacity: int = DEFAULT_BUFFER_RECORDS, target: Optional[logging.Handler] = None):
+        super().__init__()
+        self.buffer: Deque[logging.LogRecord] = deque(maxlen=capacity)
+        self.target = target
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.buffer.append(record)
+        if self.target is not None:
+            self.target.handle(record)
+
+    @property
+    def records(self) -> List[logging.LogRecord]:
+        return list(self.buffer)
+
+    def dump(self) -> List[str]:
+        """The buffered records, formatted."""
+        return [self.format(record) for record in list(self.buffer)]
+
+
+_buffer: Optional[RingBufferHandler] = None
+_buffer_lock = threading.Lock()
+
+
+def log_buffer() -> RingBufferHandler:
+    """The ring buffer attached to the run logger, created on first use (TRAVEL_AGENT_LOG_BUFFER records)."""
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = RingBufferHandler(int(env_float('TRAVEL_AGENT_LOG_BUFFER', DEFAULT_BUFFER_RECORDS)))
+                logger.addHandler(_buffer)
+                if logger.level == logging.NOTSET:
+                    logger.setLevel(logging.INFO)
+    return _buffer
+
+
+class RunLog:
+    """Logs sampled summaries of one crew run and keeps its transcript for failures.
+
+    Like ``RunInstrumentation``, ``start()`` belongs in a before-kickoff hook
+    and ``finish()`` in an after-kickoff hook; a failed kickoff finishes the
+    run by itself. Only events routed to this run's crew, tasks and agents are
+    recorded.
+    """
+
+    def __init__(self, sample_rate: Optional[float] = None, transcript_entries: Optional[int] = None,
+                 run_logger: Optional[logging.Logger] = None):
+        self.sample_rate = env_float('TRAVEL_AGENT_LOG_SAMPLE', DEFAULT_SAMPLE_RATE) if sample_rate is None else sample_rate
+        entries = transcript_entries or int(env_float('TRAVEL_AGENT_LOG_TRANSCRIPT', DEFAULT_TRANSCRIPT_ENTRIES))
+        self.logger = run_logger or logger
+        if run_logger is None:
+            log_buffer()
+        self.run_id = ''
+        self.sampled = False
+        self.agent_names: Dict[str, str] = {}
+        self._transcript: Deque[str] = deque(maxlen=entries)
+        self._tasks: Dict[str, str] = {}
+        self._started: Dict[str, float] = {}
+        # Agent id -> name of the task it is running; an agent runs one task at a time
+        self._agent_tasks: Dict[int, str] = {}
+        self._run_started = 0.0
+        self._crew = None
+        self._subscription = None
+        self._lock = threading.Lock()
+        self._handlers = [
+            (TaskStartedEvent, self._on_task_started),
+            (TaskCompletedEvent, self._on_task_completed),
+            (TaskFailedEvent, self._on_task_failed),
+            (AgentLogsExecutionEvent, self._on_agent_step),
+            (CrewKickoffFailedEvent, self._on_kickoff_failed),
+        ]
+
+    def start(self, crew: Any, agent_names: Optional[Dict[str, str]] = None) -> None:
+        """Start a run of ``crew``; ``agent_names`` maps agent roles to the names used in summaries."""
+        if self._subscription is not None:
+            self._unregister()
+        if agent_names is not None:
+            self.agent_names = agent_names
+        self.run_id = uuid.uuid4().hex[:12]
+        # Sampling is per run, so a logged run has all of its task summaries
+        self.sampled = random.random() < self.sample_rate
+        self._crew = crew
+        self._tasks = {str(t.id): t.name or t.description[:40] for t in crew.tasks}
+        self._started = {}
+        self._agent_tasks = {}
+        self._transcript.clear()
+        self._run_started = time.perf_counter()
+        self._subscription = event_router.subscribe(run_keys(crew), self._handlers)
+
+    def finish(self, status: str = 'ok', error: str = '') -> None:
+        """Log the run summary (and the transcript, if the run failed) and stop listening."""
+        if self._subscription is None:
+            return
+        self._unregister()
+        summary = {'event': 'run_finished', 'run_id': self.run_id, 'status': status,
+                   'tasks': len(self._tasks), 'duration_s': round(time.perf_counter() - self._run_started, 3)}
+        if status == 'ok':
+            self._summary(logging.INFO, summary)
+        else:
+            summary['error'] = error
+            self._summary(logging.ERROR, summary, transcript=self.transcript())
+
+    def transcript(self) -> str:
+        """The run's most recent agent steps, oldest first."""
+        with self._lock:
+            return '\n\n'.join(self._transcript)
+
+    def _unregister(self) -> None:
+        event_router.unsubscribe(self._subscription)
+        self._subscription = None
+
+    def _summary(self, level: int, summary: Dict[str, Any], transcript: Optional[str] = None) -> None:
+        if level < logging.WARNING and not self.sampled:
+            return
+        extra = {'summary': summary}
+        if transcript is not None:
+            # Kept out of the message; handlers that want it read record.transcript
+            extra['transcript'] = transcript
+        self.logger.log(level, json.dumps(summary, default=str), extra=extra)
+
+    def _record(self, task_name: str, role: str, text: str) -> None:
+        role = role.strip()
+        with self._lock:
+            self._transcript.append(
+                f"[{time.strftime('%H:%M:%S')}] {task_name} | {self.agent_names.get(role, role)}\n{text.strip()}"
+            )
+
+    def _on_task_started(self, source, event: TaskStartedEvent) -> None:
+        task_id = str(getattr(event.task, 'id', ''))
+        if task_id in self._tasks:
+            self._started[task_id] = time.perf_counter()
+            self._agent_tasks[id(event.task.agent)] = self._tasks[task_id]
+
+    def _task_summary(self, task: Any, status: str) -> Optional[Dict[str, Any]]:
+        task_id = str(getattr(task, 'id', ''))
+        if task_id not in self._tasks:
+            return None
+        started = self._started.pop(task_id, None)
+        role = (getattr(getattr(task, 'agent', None), 'role', '') or '').strip()
+        return {
+            'event': 'task_finished', 'run_id': self.run_id, 'task': self._tasks[task_id],
+            'agent': self.agent_names.get(role, role), 'status': status,
+            'duration_s': round(time.perf_counter() - started, 3) if started else None,
+        }
+
+    def _on_task_completed(self, source, event: TaskCompletedEvent) -> None:
+        summary = self._task_summary(event.task, 'ok')
+        if summary:
+            summary['output_chars'] = len(getattr(event.output, 'raw', '') or '')
+            self._summary(logging.INFO, summary)
+
+    def _on_task_failed(self, source, event: TaskFailedEvent) -> None:
+        summary = self._task_summary(event.task, 'failed')
+        if summary:
+            summary['error'] = str(event.error)
+            self._record(summary['task'], getattr(event.task.agent, 'role', '') or '', f"Task failed: {event.error}")
+            self._summary(logging.WARNING, summary)
+
+    def _on_agent_step(self, source, event: AgentLogsExecutionEvent) -> None:
+        # The same step verbose mode prints: the raw LLM text, plus the tool result for tool calls
+        task_name = self._agent_tasks.get(id(source))
+        if task_name is None:
+            return
+        step = event.formatted_answer
+        text = getattr(step, 'text', '') or str(step)
+        result = getattr(step, 'result', None)
+        if result:
+            text = f"{text}\nObservation: {result}"
+        self._record(task_name, event.agent_role, text)
+
+    def _on_kickoff_failed(self, source, event: CrewKickoffFailedEvent) -> None:
+        if source is self._crew:
+            self.finish('failed', str(event.error))
@@ -0,0 +1,85 @@
+"""
+Live progress events for crew runs.
+
+Forwards task-level and token-level updates from the crewai event bus to a
+callback so a UI can show research progress and render the itinerary while
+it is being written, instead of waiting for the whole crew to finish.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from crewai.events.types.llm_events import LLMStreamChunkEvent
+from crewai.events.types.task_events import TaskCompletedEvent, TaskFailedEvent, TaskStartedEvent
+
+from ai_travel_agent.events import event_router
+
+
+@dataclass
+class StreamEvent:
+    """One progress update from a running crew.
+
+    kind is one of: task_started, token, task_completed, task_failed, done.
+    """
+    kind: str
+    task_name: str = ''
+    text: str = ''
+    output: Any = None
+
+
+def final_answer_text(text: str) -> str:
+    """Strip the agent's reasoning preamble from streamed text, if present."""
+    marker = 'Final Answer:'
+    index = text.rfind(marker)
+    return text[index + len(marker):].lstrip() if index != -1 else text
+
+
+class CrewStreamListener:
+    """Context manager that forwards one crew's events to a callback.
+
+    The crewai event bus is process-wide, so events are routed by task id to
+    keep concurrent crews from seeing each other's progress.
+    """
+
+    def __init__(self, tasks: Iterable[Any], on_event: Callable[[StreamEvent], None]):
+        self.task_names: Dict[str, str] = {str(t.id): t.name or t.description[:40] for t in tasks}
+        self.on_event = on_event
+        self._subscription = None
+        self._handlers = [
+            (TaskStartedEvent, self._on_task_started),
+            (TaskCompletedEvent, self._on_task_completed),
+            (TaskFailedEvent, self._on_task_failed),
+            (LLMStreamChunkEvent, self._on_chunk),
+        ]
+
+    def __enter__(self) -> 'CrewStreamListener':
+        self._subscription = event_router.subscribe(self.task_names, self._handlers)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._subscription is not None:
+            event_router.unsubscribe(self._subscription)
+            self._subscription = None
+
+    def _task_name(self, task_id: Any) -> Optional[str]:
+        return self.task_names.get(str(task_id)) if task_id is not None else None
+
+    def _on_task_started(self, source, event: TaskStartedEvent) -> None:
+        name = self._task_name(getattr(event.task, 'id', None))
+        if name:
+            self.on_event(StreamEvent('task_started', name))
+
+    def _on_task_completed(self, source, event: TaskCompletedEvent) -> None:
+        name = self._task_name(getattr(event.task, 'id', None))
+        if name:
+            self.on_event(StreamEvent('task_completed', name, event.output.raw, event.output))
+
+    def _on_task_failed(self, source, event: TaskFailedEvent) -> None:
+        name = self._task_name(getattr(event.task, 'id', None))
+        if name:
+            self.on_event(StreamEvent('task_failed', name, event.error))
+
+    def _on_chunk(self, source, event: LLMStreamChunkEvent) -> None:
+        name = self._task_name(event.task_id)
+        if name and event.chunk and not event.tool_call:
+            self.on_event(StreamEvent('token', name, event.chunk))
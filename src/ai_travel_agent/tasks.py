@@ -0,0 +1,127 @@
+import datetime
+import os
+from typing import Any, Callable, Optional
+
+from crewai import Task
+from crewai.events import crewai_event_bus
+from crewai.events.types.task_events import TaskCompletedEvent, TaskStartedEvent
+from crewai.tasks.task_output import TaskOutput
+from pydantic import Field
+
+from ai_travel_agent.tools.custom_tool import CalendarEvents
+
+
+class CachedTask(Task):
+    """A Task that reuses its previous output when none of its inputs changed.
+
+    The lookup happens right before the agent would run, once the description
+    has been interpolated and the upstream context is known, so a stage is
+    skipped exactly when its prompt and everything feeding into it match an
+    earlier run.
+
+    Unlike ``output_file``, ``export_file`` may be any path (including absolute
+    paths outside the working directory), which lets each run write into its
+    own workspace.
+    """
+
+    stage_cache: Optional[Any] = Field(
+        default=None,
+        description="StageCache used to memoize this task's output.",
+        exclude=True,
+    )
+    on_cache_hit: Optional[Callable[[TaskOutput], None]] = Field(
+        default=None,
+        description="Called with the replayed output to redo side effects the agent would have performed.",
+        exclude=True,
+    )
+    export_file: Optional[str] = Field(
+        default=None,
+        description="Path the task output is written to once the task finishes.",
+        exclude=True,
+    )
+
+    def _execute_core(self, agent, context, tools) -> TaskOutput:
+        task_output = self._execute_cached(agent, context, tools)
+        if self.export_file:
+            self._write_export(task_output)
+        return task_output
+
+    def _execute_cached(self, agent, context, tools) -> TaskOutput:
+        if self.stage_cache is None or not self.stage_cache.enabled:
+            return super()._execute_core(agent, context, tools)
+
+        agent = agent or self.agent
+        llm = getattr(agent, 'llm', None)
+        key = self.stage_cache.key_for(
+            self.description,
+            self.expected_output,
+            agent.role if agent else '',
+            context or '',
+            model=getattr(llm, 'model', None) or str(llm or ''),
+            tool_names=[tool.name for tool in (tools if tools is not None else self.tools or [])],
+        )
+
+        raw = self.stage_cache.get(key)
+        if raw is None:
+            task_output = super()._execute_core(agent, context, tools)
+            self.stage_cache.put(key, task_output.raw)
+            return task_output
+
+        return self._replay_output(agent, context, raw)
+
+    def _replay_output(self, agent, context, raw: str) -> TaskOutput:
+        """Rebuild the task output from a cached result without calling the agent."""
+        self.agent = agent
+        self.start_time = datetime.datetime.now()
+        self.prompt_context = context
+        crewai_event_bus.emit(self, TaskStartedEvent(context=context, task=self))
+
+        pydantic_output, json_output = self._export_output(raw)
+        task_output = TaskOutput(
+            name=self.name or self.description,
+            description=self.description,
+            expected_output=self.expected_output,
+            raw=raw,
+            pydantic=pydantic_output,
+            json_dict=json_output,
+            agent=agent.role if agent else '',
+            output_format=self._get_output_format(),
+        )
+
+        self.output = task_output
+        self.end_time = datetime.datetime.now()
+
+        if self.on_cache_hit:
+            self.on_cache_hit(task_output)
+
+        if self.callback:
+            self.callback(task_output)
+
+        crew = getattr(agent, 'crew', None)
+        if crew and crew.task_callback and crew.task_callback != self.callback:
+            crew.task_callback(task_output)
+
+        if self.output_file:
+            content = (
+                json_output
+                if json_output
+                else (pydantic_output.model_dump_json() if pydantic_output else raw)
+            )
+            self._save_file(content)
+
+        crewai_event_bus.emit(self, TaskCompletedEvent(output=task_output, task=self))
+        return task_output
+
+    def _write_export(self, task_output: TaskOutput) -> None:
+        directory = os.path.dirname(self.export_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if isinstance(task_output.pydantic, CalendarEvents):
+            # The same "Title: / Date:" text the agent and compiled modes export
+            content = task_output.pydantic.to_text()
+        elif task_output.pydantic:
+            content = task_output.pydantic.model_dump_json(indent=2)
+        else:
+            content = task_output.raw
+        with open(self.export_file, 'w', encoding='utf-8') as f:
+            f.write(content)
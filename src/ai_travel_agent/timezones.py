@@ -0,0 +1,146 @@
+"""
+Offline destination to IANA timezone resolution.
+
+Itinerary times are local to the destination ("9:00 AM at the Senso-ji"), so
+calendar events need the destination's timezone. The lookup index is built
+from pytz's timezone and country tables plus a list of well-known places,
+pickled into the cache directory on first use, and queried with plain dict
+lookups. Resolved destinations are memoized.
+"""
+
+import os
+import pickle
+import re
+import tempfile
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Optional
+
+import pytz
+
+from ai_travel_agent.cache import cache_root
+
+INDEX_VERSION = 1
+
+# Popular destinations that are not timezone cities, and sensible defaults for
+# countries that span several timezones
+ALIASES = {
+    # Countries
+    'usa': 'America/New_York', 'us': 'America/New_York', 'united states': 'America/New_York',
+    'united states of america': 'America/New_York', 'america': 'America/New_York',
+    'uk': 'Europe/London', 'england': 'Europe/London', 'scotland': 'Europe/London',
+    'wales': 'Europe/London', 'great britain': 'Europe/London', 'northern ireland': 'Europe/London',
+    'canada': 'America/Toronto', 'australia': 'Australia/Sydney', 'brazil': 'America/Sao_Paulo',
+    'russia': 'Europe/Moscow', 'mexico': 'America/Mexico_City', 'indonesia': 'Asia/Jakarta',
+    'china': 'Asia/Shanghai', 'argentina': 'America/Argentina/Buenos_Aires', 'chile': 'America/Santiago',
+    'spain': 'Europe/Madrid', 'portugal': 'Europe/Lisbon', 'new zealand': 'Pacific/Auckland',
+    'ecuador': 'America/Guayaquil', 'malaysia': 'Asia/Kuala_Lumpur', 'kazakhstan': 'Asia/Almaty',
+    'mongolia': 'Asia/Ulaanbaatar', 'south korea': 'Asia/Seoul', 'korea': 'Asia/Seoul',
+    'vietnam': 'Asia/Ho_Chi_Minh', 'uae': 'Asia/Dubai', 'czech republic': 'Europe/Prague',
+    'germany': 'Europe/Berlin', 'ukraine': 'Europe/Kyiv', 'french polynesia': 'Pacific/Tahiti',
+    # Cities and regions
+    'kyoto': 'Asia/Tokyo', 'osaka': 'Asia/Tokyo', 'hiroshima': 'Asia/Tokyo', 'sapporo': 'Asia/Tokyo',
+    'beijing': 'Asia/Shanghai', 'hangzhou': 'Asia/Shanghai', 'xian': 'Asia/Shanghai', 'guangzhou': 'Asia/Shanghai',
+    'delhi': 'Asia/Kolkata', 'new delhi': 'Asia/Kolkata', 'mumbai': 'Asia/Kolkata', 'goa': 'Asia/Kolkata',
+    'jaipur': 'Asia/Kolkata', 'bangalore': 'Asia/Kolkata', 'agra': 'Asia/Kolkata',
+    'hanoi': 'Asia/Ho_Chi_Minh', 'saigon': 'Asia/Ho_Chi_Minh', 'phuket': 'Asia/Bangkok',
+    'chiang mai': 'Asia/Bangkok', 'bali': 'Asia/Makassar', 'siem reap': 'Asia/Phnom_Penh',
+    'abu dhabi': 'Asia/Dubai', 'petra': 'Asia/Amman', 'cappadocia': 'Europe/Istanbul',
+    'barcelona': 'Europe/Madrid', 'seville': 'Europe/Madrid', 'valencia': 'Europe/Madrid',
+    'ibiza': 'Europe/Madrid', 'mallorca': 'Europe/Madrid', 'porto': 'Europe/Lisbon',
+    'nice': 'Europe/Paris', 'lyon': 'Europe/Paris', 'marseille': 'Europe/Paris', 'bordeaux': 'Europe/Paris',
+    'florence': 'Europe/Rome', 'venice': 'Europe/Rome', 'milan': 'Europe/Rome', 'naples': 'Europe/Rome',
+    'amalfi coast': 'Europe/Rome', 'tuscany': 'Europe/Rome', 'sicily': 'Europe/Rome',
+    'munich': 'Europe/Berlin', 'hamburg': 'Europe/Berlin', 'frankfurt': 'Europe/Berlin',
+    'edinburgh': 'Europe/London', 'manchester': 'Europe/London', 'liverpool': 'Europe/London',
+    'santorini': 'Europe/Athens', 'mykonos': 'Europe/Athens', 'crete': 'Europe/Athens',
+    'salzburg': 'Europe/Vienna', 'interlaken': 'Europe/Zurich', 'geneva': 'Europe/Zurich',
+    'krakow': 'Europe/Warsaw', 'dubrovnik': 'Europe/Zagreb', 'split': 'Europe/Zagreb',
+    'reykjavik': 'Atlantic/Reykjavik', 'marrakech': 'Africa/Casablanca', 'marrakesh': 'Africa/Casablanca',
+    'cape town': 'Africa/Johannesburg', 'zanzibar': 'Africa/Dar_es_Salaam',
+    'new york city': 'America/New_York', 'nyc': 'America/New_York', 'washington dc': 'America/New_York',
+    'washington': 'America/New_York', 'boston': 'America/New_York', 'miami': 'America/New_York',
+    'orlando': 'America/New_York', 'atlanta': 'America/New_York', 'philadelphia': 'America/New_York',
+    'chicago': 'America/Chicago', 'new orleans': 'America/Chicago', 'austin': 'America/Chicago',
+    'houston': 'America/Chicago', 'dallas': 'America/Chicago', 'nashville': 'America/Chicago',
+    'denver': 'America/Denver', 'salt lake city': 'America/Denver', 'phoenix': 'America/Phoenix',
+    'los angeles': 'America/Los_Angeles', 'san francisco': 'America/Los_Angeles',
+    'las vegas': 'America/Los_Angeles', 'san diego': 'America/Los_Angeles', 'seattle': 'America/Los_Angeles',
+    'portland': 'America/Los_Angeles', 'hawaii': 'Pacific/Honolulu', 'maui': 'Pacific/Honolulu',
+    'alaska': 'America/Anchorage', 'montreal': 'America/Toronto', 'quebec': 'America/Toronto',
+    'quebec city': 'America/Toronto', 'ottawa': 'America/Toronto', 'banff': 'America/Edmonton',
+    'calgary': 'America/Edmonton', 'tulum': 'America/Cancun', 'playa del carmen': 'America/Cancun',
+    'rio de janeiro': 'America/Sao_Paulo', 'rio': 'America/Sao_Paulo', 'cusco': 'America/Lima',
+    'machu picchu': 'America/Lima', 'patagonia': 'America/Argentina/Buenos_Aires',
+    'galapagos': 'Pacific/Galapagos', 'melbourne': 'Australia/Melbourne', 'cairns': 'Australia/Brisbane',
+    'queenstown': 'Pacific/Auckland', 'bora bora': 'Pacific/Tahiti', 'fiji': 'Pacific/Fiji',
+}
+
+
+def normalize_place(name: str) -> str:
+    """Lowercase, strip accents and punctuation: 'Zürich ' -> 'zurich'."""
+    name = unicodedata.normalize('NFKD', name or '')
+    name = ''.join(c for c in name if not unicodedata.combining(c)).casefold()
+    name = re.sub(r"[^\w\s]", ' ', name.replace('_', ' '))
+    return re.sub(r'\s+', ' ', name).strip()
+
+
+def build_index() -> Dict[str, str]:
+    """Map normalized city, region and country names to IANA timezone names."""
+    index: Dict[str, str] = {}
+    for zone in pytz.common_timezones:
+        # "America/Argentina/Buenos_Aires" -> "buenos aires"
+        index.setdefault(normalize_place(zone.rsplit('/', 1)[-1]), zone)
+    for code, zones in pytz.country_timezones.items():
+        if zones:
+            index.setdefault(normalize_place(pytz.country_names.get(code, '')), zones[0])
+            index.setdefault(code.lower(), zones[0])
+    for alias, zone in ALIASES.items():
+        index[normalize_place(alias)] = zone
+    index.pop('', None)
+    return index
+
+
+def _index_path() -> str:
+    return os.path.join(cache_root(), f'tz_index-v{INDEX_VERSION}-{pytz.__version__}.pickle')
+
+
+@lru_cache(maxsize=1)
+def load_index() -> Dict[str, str]:
+    """Load the pickled index from the cache directory, building it on first use."""
+    path = _index_path()
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+
+    index = build_index()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+    except OSError:
+        # A read-only cache directory only costs rebuilding the index per process
+        pass
+    return index
+
+
+@lru_cache(maxsize=1024)
+def resolve_timezone(destination: str) -> Optional[str]:
+    """Return the IANA timezone for a destination such as 'Kyoto, Japan', or None if unknown.
+
+    The most specific part wins: the whole name, then each comma-separated part
+    from the city to the country.
+    """
+    index = load_index()
+    normalized = normalize_place(destination)
+    if normalized in index:
+        return index[normalized]
+    for part in destination.split(','):
+        zone = index.get(normalize_place(part))
+        if zone:
+            return zone
+    return None
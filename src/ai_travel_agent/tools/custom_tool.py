@@ -1,11 +1,148 @@
 from crewai.tools import BaseTool
-from typing import Type, List, Dict
-from pydantic import BaseModel, Field
-from datetime import datetime, timedelta
-from icalendar import Calendar, Event
+from functools import lru_cache
+from collections import Counter
+from typing import Type, BinaryIO, Iterable, Iterator, List, Dict, Optional, Tuple, Union
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
+from datetime import date, datetime, timedelta
+from icalendar import Calendar, Event, Timezone
 import pytz
 import os
 import re
+import tempfile
+from io import BytesIO
+
+from ai_travel_agent.timezones import resolve_timezone
+from ai_travel_agent.tools.event_conflicts import (
+    CONFLICT_POLICIES, DEFAULT_TRANSFER_TIME, Conflict, ScheduledEvent, ScheduleValidator,
+)
+from ai_travel_agent.tools.ics_incremental import CalendarDiff, stable_uid, update_calendar
+from ai_travel_agent.tools.ics_writer import IcsStreamWriter
+
+
+# One pattern recognizes every "Field: value" line of the events text ("- Title: ..." or "Title: ...")
+EVENT_FIELD = re.compile(r'^(?:- )?(Title|Date|Start Time|End Time|Location|Description):(.*)$')
+EVENT_FIELD_KEYS = {
+    'Title': 'title',
+    'Date': 'date',
+    'Start Time': 'start_time',
+    'End Time': 'end_time',
+    'Location': 'location',
+    'Description': 'description',
+}
+
+DATE_FORMATS = ['%Y-%m-%d', '%B %d, %Y', '%b %d, %Y', '%d/%m/%Y', '%m/%d/%Y']
+TIME_FORMATS = ['%I:%M %p', '%H:%M', '%I %p', '%H']
+ISO_DATE = re.compile(r'(\d{4})-(\d{2})-(\d{2})')
+
+# "icalendar" builds the whole Calendar in memory; "stream" writes VEVENTs as they are produced
+ICS_BACKENDS = ('icalendar', 'stream')
+
+# Distinct (date, time) pairs remembered per document
+DATETIME_CACHE_SIZE = 512
+
+
+class EventDateError(ValueError):
+    """Raised when an event's date or time cannot be read in any known format."""
+
+
+def iter_events(lines: Iterable[str]) -> Iterator[Dict]:
+    """Yield event dictionaries from the formatted events text, one line at a time.
+
+    Accepts any iterable of lines (a list, an open file, a generator), so large
+    documents never need to be held in memory as a whole.
+    """
+    current_event = {}
+    for line in lines:
+        line = line.strip()
+        if not line:
+            if current_event:
+                yield current_event
+                current_event = {}
+            continue
+
+        match = EVENT_FIELD.match(line)
+        if not match:
+            continue
+        key = EVENT_FIELD_KEYS[match.group(1)]
+        if key == 'title':
+            if current_event:
+                yield current_event
+            current_event = {}
+        current_event[key] = match.group(2).strip()
+
+    # Add the last event if exists
+    if current_event:
+        yield current_event
+
+
+class FormatDetector:
+    """Parses values with a list of strptime formats, trying the last one that worked first.
+
+    Values within one document almost always share a format, so after the
+    first success each value is usually parsed with a single strptime call.
+    """
+
+    def __init__(self, formats: List[str]):
+        self.formats = formats
+        self.learned: Optional[str] = None
+
+    def parse(self, value: str) -> Optional[datetime]:
+        if self.learned:
+            try:
+                return datetime.strptime(value, self.learned)
+            except ValueError:
+                pass
+        for fmt in self.formats:
+            if fmt == self.learned:
+                continue
+            try:
+                parsed = datetime.strptime(value, fmt)
+            except ValueError:
+                continue
+            self.learned = fmt
+            return parsed
+        return None
+
+
+class DocumentFormats:
+    """The date and time formats learned while parsing one events document.
+
+    Results are memoized in bounded LRU caches, since the same day shows up
+    for every event on it and the same times repeat across days.
+    """
+
+    def __init__(self, cache_size: int = DATETIME_CACHE_SIZE):
+        self.date = FormatDetector(DATE_FORMATS)
+        self.time = FormatDetector(TIME_FORMATS)
+        self._date_cached = lru_cache(maxsize=cache_size)(self._parse_date)
+        self._time_cached = lru_cache(maxsize=cache_size)(self.time.parse)
+        self._datetime_cached = lru_cache(maxsize=cache_size)(self._parse_datetime)
+
+    def _parse_date(self, date_str: str) -> Optional[datetime]:
+        date_obj = self.date.parse(date_str)
+        if not date_obj:
+            # Try to extract date from string
+            date_match = ISO_DATE.search(date_str)
+            if date_match:
+                try:
+                    date_obj = datetime(int(date_match.group(1)), int(date_match.group(2)), int(date_match.group(3)))
+                except ValueError:
+                    return None
+        return date_obj
+
+    def _parse_datetime(self, date_str: str, time_str: str) -> datetime:
+        date_obj = self._date_cached(date_str)
+        if not date_obj:
+            raise EventDateError(f"Unrecognized date: '{date_str}'")
+        time_obj = self._time_cached(time_str.strip())
+        if not time_obj:
+            # Falling back to midnight would quietly move the event to the start of the day
+            raise EventDateError(f"Unrecognized time: '{time_str}'")
+        return datetime.combine(date_obj.date(), time_obj.time())
+
+    def parse_datetime(self, date_str: str, time_str: str) -> datetime:
+        """Combine an event's date and time, raising EventDateError when either cannot be read."""
+        return self._datetime_cached(date_str, time_str)
 
 
 class CalendarGeneratorInput(BaseModel):
@@ -15,6 +152,46 @@ class CalendarGeneratorInput(BaseModel):
     start_date: str = Field(..., description="Trip start date in YYYY-MM-DD format")
 
 
+class CalendarEvent(BaseModel):
+    """A single calendar entry of the itinerary."""
+    title: str = Field(..., description="Activity name")
+    date: str = Field(..., description="Event date in YYYY-MM-DD format")
+    start_time: str = Field(..., description="Start time in 24-hour HH:MM format")
+    end_time: str = Field(..., description="End time in 24-hour HH:MM format")
+    location: str = Field(default='', description="Venue or address")
+    description: str = Field(default='', description="Activity details, tips and estimated cost")
+
+
+class CalendarEvents(BaseModel):
+    """Structured output of format_calendar_task in the "structured" calendar mode."""
+    events: List[CalendarEvent] = Field(..., description="All itinerary events in chronological order")
+
+    def to_text(self) -> str:
+        """Render the events in the same layout the text-based calendar task produces."""
+        blocks = []
+        for event in self.events:
+            lines = [
+                f"- Title: {event.title}",
+                f"- Date: {event.date}",
+                f"- Start Time: {event.start_time}",
+                f"- End Time: {event.end_time}",
+            ]
+            if event.location:
+                lines.append(f"- Location: {event.location}")
+            if event.description:
+                lines.append(f"- Description: {event.description}")
+            blocks.append('\n'.join(lines))
+        return '\n\n'.join(blocks)
+
+
+@lru_cache(maxsize=64)
+def timezone_component(zone: str, year: int) -> bytes:
+    """VTIMEZONE for a zone over the years around ``year``; expanding the transitions is slow, so it is built once."""
+    component = Timezone.from_tzinfo(pytz.timezone(zone), tzid=zone,
+                                     first_date=date(year - 1, 1, 1), last_date=date(year + 2, 1, 1))
+    return component.to_ical()
+
+
 class CalendarGeneratorTool(BaseTool):
     name: str = "Travel Calendar Generator"
     description: str = (
@@ -23,150 +200,346 @@ class CalendarGeneratorTool(BaseTool):
         "imported into Google Calendar, Apple Calendar, Outlook, and other calendar applications."
     )
     args_schema: Type[BaseModel] = CalendarGeneratorInput
+    output_dir: Optional[str] = Field(
+        default='exports', description="Directory the .ics file is written to; None keeps it in memory only"
+    )
+    ics_backend: str = Field(
+        default_factory=lambda: os.getenv('TRAVEL_AGENT_ICS_BACKEND', 'icalendar'),
+        description="How the .ics is serialized: 'icalendar' (in memory) or 'stream' (incremental)",
+    )
+    timezone: Optional[str] = Field(
+        default=None,
+        description="IANA timezone of the event times; resolved from the destination when not set",
+    )
+    incremental: bool = Field(
+        default_factory=lambda: os.getenv('TRAVEL_AGENT_ICS_INCREMENTAL', '').lower() in ('1', 'true', 'yes'),
+        description="Update the previous calendar (SEQUENCE bumps, CANCELLED events) instead of replacing it",
+    )
+    write_delta: bool = Field(
+        default=False, description="In incremental mode, also write only the changes to <name>.delta.ics"
+    )
+    conflict_policy: str = Field(
+        default_factory=lambda: os.getenv('TRAVEL_AGENT_CALENDAR_CONFLICTS', 'report'),
+        description="Overlapping or back-to-back events at different venues: 'off', 'report' or 'shift'",
+    )
+    transfer_minutes: int = Field(
+        default=int(DEFAULT_TRANSFER_TIME.total_seconds() // 60),
+        description="Minimum time between events at different venues",
+    )
+
+    @field_validator('ics_backend')
+    @classmethod
+    def _check_ics_backend(cls, value: str) -> str:
+        value = value.strip().lower()
+        if value not in ICS_BACKENDS:
+            raise ValueError(f"Unknown ics_backend '{value}', expected one of {ICS_BACKENDS}")
+        return value
+
+    @field_validator('conflict_policy')
+    @classmethod
+    def _check_conflict_policy(cls, value: str) -> str:
+        value = value.strip().lower()
+        if value not in CONFLICT_POLICIES:
+            raise ValueError(f"Unknown conflict_policy '{value}', expected one of {CONFLICT_POLICIES}")
+        return value
+
+    _last_ics: bytes = PrivateAttr(default=b'')
+    _last_ics_path: Optional[str] = PrivateAttr(default=None)
+    _last_skipped: List[str] = PrivateAttr(default_factory=list)
+    _last_delta: bytes = PrivateAttr(default=b'')
+    _last_diff: Optional[CalendarDiff] = PrivateAttr(default=None)
+    _last_conflicts: List[Conflict] = PrivateAttr(default_factory=list)
+
+    @property
+    def last_ics(self) -> bytes:
+        """The calendar most recently generated by this tool."""
+        if not self._last_ics and self._last_ics_path and os.path.exists(self._last_ics_path):
+            # Streamed straight to disk; only read it back when someone asks
+            with open(self._last_ics_path, 'rb') as f:
+                return f.read()
+        return self._last_ics
+
+    @property
+    def last_delta(self) -> bytes:
+        """In incremental mode, a calendar holding only the added, changed and cancelled events."""
+        return self._last_delta
+
+    @property
+    def last_diff(self) -> Optional[CalendarDiff]:
+        """In incremental mode, how the most recent calendar differs from the previous one."""
+        return self._last_diff
+
+    @property
+    def last_conflicts(self) -> List[Conflict]:
+        """Scheduling conflicts found (and, with the "shift" policy, resolved) in the most recent calendar."""
+        return self._last_conflicts
+
+    @property
+    def last_skipped(self) -> List[str]:
+        """Events left out of the most recent calendar because their date could not be read."""
+        return self._last_skipped
+
+    def _parse_events(self, events_data: Union[str, Iterable[str]], start_date_str: str) -> List[Dict]:
+        """Parse the formatted events data (a string or an iterable of lines) into event dictionaries."""
+        lines = events_data.strip().splitlines() if isinstance(events_data, str) else events_data
+        return list(iter_events(lines))
+
+    def _create_datetime(self, date_str: str, time_str: str,
+                         formats: Optional[DocumentFormats] = None) -> datetime:
+        """Create a datetime object from date and time strings.
 
-    def _parse_events(self, events_data: str, start_date_str: str) -> List[Dict]:
-        """Parse the formatted events data into structured event dictionaries."""
-        events = []
-        current_event = {}
+        Raises EventDateError when the date or time cannot be read.
+        """
+        return (formats or DocumentFormats()).parse_datetime(date_str, time_str)
+
+    def build_calendar(self, destination: str, events_data: Union[str, Iterable[str]],
+                       start_date: str) -> Tuple[bytes, int]:
+        """Build the .ics calendar in memory, returning its bytes and the number of events."""
+        return self.build_calendar_from_events(destination, self._parse_events(events_data, start_date), start_date)
+
+    def _resolve_timezone(self, destination: str) -> Optional[pytz.BaseTzInfo]:
+        """The destination's timezone; None keeps event times floating."""
+        zone = self.timezone or resolve_timezone(destination)
+        try:
+            return pytz.timezone(zone) if zone else None
+        except pytz.UnknownTimeZoneError:
+            return None
+
+    def _calendar_properties(self, destination: str, tz: Optional[pytz.BaseTzInfo] = None) -> List[Tuple[str, str]]:
+        return [
+            ('prodid', '-//AI Travel Agent//Travel Itinerary//EN'),
+            ('version', '2.0'),
+            ('calscale', 'GREGORIAN'),
+            ('method', 'PUBLISH'),
+            ('x-wr-calname', f'{destination} Travel Itinerary'),
+            ('x-wr-timezone', tz.zone if tz else 'UTC'),
+        ]
+
+    def _timezone_components(self, tz: Optional[pytz.BaseTzInfo], start_date: str) -> List[bytes]:
+        """The VTIMEZONE definition for the trip's timezone, covering the years around the trip."""
+        if tz is None:
+            return []
+        year = int(start_date[:4]) if start_date[:4].isdigit() else datetime.now().year
+        return [timezone_component(tz.zone, year)]
+
+    def _scheduled_events(self, events: Iterable[Dict], start_date: str) -> Iterator[ScheduledEvent]:
+        """Parse each event's start and end, recording events whose date or time cannot be read."""
+        self._last_skipped = []
         
-        # Split by lines and process
-        lines = events_data.strip().split('\n')
+        # Formats learned from the first events speed up parsing the rest
+        formats = DocumentFormats()
         
-        for line in lines:
-            line = line.strip()
-            if not line:
-                if current_event:
-                    events.append(current_event)
-                    current_event = {}
+        for event_data in events:
+            # Create datetime objects
+            try:
+                start_dt = self._create_datetime(
+                    event_data.get('date', start_date),
+                    event_data.get('start_time', '09:00 AM'),
+                    formats
+                )
+                end_dt = self._create_datetime(
+                    event_data.get('date', start_date),
+                    event_data.get('end_time', '10:00 AM'),
+                    formats
+                )
+            except EventDateError as e:
+                self._last_skipped.append(f"{event_data.get('title', 'Travel Activity')} ({e})")
                 continue
             
-            # Parse event fields
-            if line.startswith('- Title:') or line.startswith('Title:'):
-                if current_event:
-                    events.append(current_event)
-                current_event = {'title': line.split(':', 1)[1].strip()}
-            elif line.startswith('- Date:') or line.startswith('Date:'):
-                current_event['date'] = line.split(':', 1)[1].strip()
-            elif line.startswith('- Start Time:') or line.startswith('Start Time:'):
-                current_event['start_time'] = line.split(':', 1)[1].strip()
-            elif line.startswith('- End Time:') or line.startswith('End Time:'):
-                current_event['end_time'] = line.split(':', 1)[1].strip()
-            elif line.startswith('- Location:') or line.startswith('Location:'):
-                current_event['location'] = line.split(':', 1)[1].strip()
-            elif line.startswith('- Description:') or line.startswith('Description:'):
-                current_event['description'] = line.split(':', 1)[1].strip()
+            # Ensure end is after start
+            if end_dt <= start_dt:
+                end_dt = start_dt + timedelta(hours=1)
+            
+            yield ScheduledEvent(start_dt, end_dt, event_data)
+
+    def _event_properties(self, events: Iterable[Dict], start_date: str,
+                          tz: Optional[pytz.BaseTzInfo] = None) -> Iterator[List[Tuple[str, object]]]:
+        """Yield the VEVENT properties for each event, after checking the schedule for conflicts."""
+        scheduled = self._scheduled_events(events, start_date)
+        self._last_conflicts = []
+        if self.conflict_policy != 'off':
+            validator = ScheduleValidator(
+                shift=self.conflict_policy == 'shift', transfer_time=timedelta(minutes=self.transfer_minutes)
+            )
+            self._last_conflicts = validator.conflicts
+            # The streaming backend sorts one day at a time to keep memory bounded
+            scheduled = (validator.validate_by_day(scheduled) if self.ics_backend == 'stream'
+                         else validator.validate(scheduled))
         
-        # Add the last event if exists
-        if current_event:
-            events.append(current_event)
+        occurrences = Counter()
         
-        return events
-
-    def _create_datetime(self, date_str: str, time_str: str) -> datetime:
-        """Create a datetime object from date and time strings."""
-        try:
-            # Try to parse the date
-            date_formats = ['%Y-%m-%d', '%B %d, %Y', '%b %d, %Y', '%d/%m/%Y', '%m/%d/%Y']
-            date_obj = None
+        for scheduled_event in scheduled:
+            event_data, start_dt, end_dt = scheduled_event.data, scheduled_event.start, scheduled_event.end
+            if tz is not None:
+                # Itinerary times are local to the destination
+                start_dt, end_dt = tz.localize(start_dt), tz.localize(end_dt)
             
-            for fmt in date_formats:
-                try:
-                    date_obj = datetime.strptime(date_str, fmt)
-                    break
-                except ValueError:
-                    continue
+            properties = [
+                ('summary', event_data.get('title', 'Travel Activity')),
+                ('dtstart', start_dt),
+                ('dtend', end_dt),
+                ('dtstamp', datetime.now(pytz.utc)),
+            ]
             
-            if not date_obj:
-                # Try to extract date from string
-                date_match = re.search(r'(\d{4})-(\d{2})-(\d{2})', date_str)
-                if date_match:
-                    date_obj = datetime(int(date_match.group(1)), int(date_match.group(2)), int(date_match.group(3)))
+            if event_data.get('location'):
+                properties.append(('location', event_data['location']))
             
-            # Parse time
-            time_formats = ['%I:%M %p', '%H:%M', '%I %p', '%H']
-            time_obj = None
+            if event_data.get('description'):
+                properties.append(('description', event_data['description']))
             
-            for fmt in time_formats:
-                try:
-                    time_obj = datetime.strptime(time_str.strip(), fmt)
-                    break
-                except ValueError:
-                    continue
+            # Add a unique ID that stays the same when the event's time or details change
+            # (repeated titles on the same day, e.g. "Free time", are numbered)
+            base_uid = stable_uid(event_data.get('title', 'event'), start_dt.date())
+            occurrences[base_uid] += 1
+            properties.append(('uid', stable_uid(event_data.get('title', 'event'), start_dt.date(), occurrences[base_uid])))
             
-            if date_obj and time_obj:
-                return datetime.combine(date_obj.date(), time_obj.time())
-            elif date_obj:
-                return date_obj
-            
-            # Fallback to current time
-            return datetime.now()
-        except Exception:
-            return datetime.now()
+            yield properties
+
+    def build_calendar_from_events(self, destination: str, events: Iterable[Dict], start_date: str) -> Tuple[bytes, int]:
+        """Build the .ics calendar from already structured event dictionaries."""
+        if self.ics_backend == 'stream':
+            buffer = BytesIO()
+            event_count = self.stream_calendar(destination, events, start_date, buffer)
+            return (buffer.getvalue(), event_count) if event_count else (b'', 0)
+        
+        # Create calendar
+        tz = self._resolve_timezone(destination)
+        cal = Calendar()
+        for name, value in self._calendar_properties(destination, tz):
+            cal.add(name, value)
+        for component in self._timezone_components(tz, start_date):
+            cal.add_component(Timezone.from_ical(component))
+        
+        # Add events to calendar
+        event_count = 0
+        for properties in self._event_properties(events, start_date, tz):
+            event = Event()
+            for name, value in properties:
+                event.add(name, value)
+            cal.add_component(event)
+            event_count += 1
+        
+        if not event_count:
+            return b'', 0
+        return cal.to_ical(), event_count
+
+    def stream_calendar(self, destination: str, events: Iterable[Dict], start_date: str, stream: BinaryIO) -> int:
+        """Write the .ics calendar to a binary stream one VEVENT at a time; returns the number of events.
+
+        Pass a generator of events (e.g. from iter_events over an open file) to keep memory flat.
+        """
+        tz = self._resolve_timezone(destination)
+        with IcsStreamWriter(stream, self._calendar_properties(destination, tz),
+                             self._timezone_components(tz, start_date)) as writer:
+            for properties in self._event_properties(events, start_date, tz):
+                writer.write_event(properties)
+        return writer.events_written
 
     def _run(self, destination: str, events_data: str, start_date: str) -> str:
         """Generate an .ics calendar file from the events data."""
         try:
-            # Create calendar
-            cal = Calendar()
-            cal.add('prodid', '-//AI Travel Agent//Travel Itinerary//EN')
-            cal.add('version', '2.0')
-            cal.add('calscale', 'GREGORIAN')
-            cal.add('method', 'PUBLISH')
-            cal.add('x-wr-calname', f'{destination} Travel Itinerary')
-            cal.add('x-wr-timezone', 'UTC')
+            return self.generate_from_events(destination, self._parse_events(events_data, start_date), start_date)
+        except Exception as e:
+            return f"Error generating calendar file: {str(e)}"
+
+    def generate_from_events(self, destination: str, events: Iterable[Dict], start_date: str) -> str:
+        """Generate the .ics calendar file from structured events, skipping text parsing."""
+        try:
+            filename = f"{destination.replace(' ', '_')}_itinerary.ics"
+            
+            if self.incremental:
+                return self._update_calendar(destination, events, start_date, filename)
             
-            # Parse events
-            events = self._parse_events(events_data, start_date)
+            self._last_ics, self._last_ics_path = b'', None
+            if self.ics_backend == 'stream' and self.output_dir:
+                event_count = self._stream_to_file(destination, events, start_date, filename)
+                ics = b''
+            else:
+                ics, event_count = self.build_calendar_from_events(destination, events, start_date)
             
-            if not events:
+            if not event_count:
+                if self._last_skipped:
+                    return f"Error: None of the events had a readable date and time: {'; '.join(self._last_skipped[:5])}"
                 return "Error: No events could be parsed from the provided data."
             
-            # Add events to calendar
-            for event_data in events:
-                event = Event()
-                
-                # Set event properties
-                event.add('summary', event_data.get('title', 'Travel Activity'))
-                
-                # Create datetime objects
-                start_dt = self._create_datetime(
-                    event_data.get('date', start_date),
-                    event_data.get('start_time', '09:00 AM')
-                )
-                
-                end_dt = self._create_datetime(
-                    event_data.get('date', start_date),
-                    event_data.get('end_time', '10:00 AM')
-                )
-                
-                # Ensure end is after start
-                if end_dt <= start_dt:
-                    end_dt = start_dt + timedelta(hours=1)
-                
-                event.add('dtstart', start_dt)
-                event.add('dtend', end_dt)
-                event.add('dtstamp', datetime.now(pytz.utc))
-                
-                if event_data.get('location'):
-                    event.add('location', event_data['location'])
-                
-                if event_data.get('description'):
-                    event.add('description', event_data['description'])
-                
-                # Add unique ID
-                event.add('uid', f"{start_dt.strftime('%Y%m%d%H%M%S')}-{event_data.get('title', 'event').replace(' ', '-')}@ai-travel-agent")
-                
-                cal.add_component(event)
+            self._last_ics = ics
+            skipped = (
+                f"\nSkipped {len(self._last_skipped)} event(s) with unreadable dates or times: {'; '.join(self._last_skipped[:5])}"
+                if self._last_skipped else ""
+            )
             
-            # Save to file in exports directory
-            os.makedirs('exports', exist_ok=True)
-            filename = f"{destination.replace(' ', '_')}_itinerary.ics"
-            filepath = os.path.join(os.getcwd(), 'exports', filename)
+            # Save to file in this run's export directory, if any
+            if self.output_dir and ics:
+                os.makedirs(self.output_dir, exist_ok=True)
+                with open(os.path.join(self.output_dir, filename), 'wb') as f:
+                    f.write(ics)
             
-            with open(filepath, 'wb') as f:
-                f.write(cal.to_ical())
-            
-            return f"Calendar file successfully created: {filename}\nTotal events added: {len(events)}\nYou can import this file into Google Calendar, Apple Calendar, Outlook, or any other calendar application."
+            return f"Calendar file successfully created: {filename}\nTotal events added: {event_count}{skipped}{self._conflict_report()}\nYou can import this file into Google Calendar, Apple Calendar, Outlook, or any other calendar application."
         
         except Exception as e:
             return f"Error generating calendar file: {str(e)}"
+
+    def _conflict_report(self) -> str:
+        if not self._last_conflicts:
+            return ""
+        shown = '; '.join(str(conflict) for conflict in self._last_conflicts[:5])
+        more = f" and {len(self._last_conflicts) - 5} more" if len(self._last_conflicts) > 5 else ""
+        if self.conflict_policy == 'shift':
+            return f"\nShifted {len(self._last_conflicts)} event(s) to resolve scheduling conflicts: {shown}{more}"
+        return f"\nFound {len(self._last_conflicts)} scheduling conflict(s): {shown}{more}"
+
+    def _stream_to_file(self, destination: str, events: Iterable[Dict], start_date: str, filename: str) -> int:
+        """Stream the calendar into the export directory, replacing the file only if it has events."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        filepath = os.path.join(self.output_dir, filename)
+        fd, temp_path = tempfile.mkstemp(dir=self.output_dir, prefix=f"{filename}.", suffix='.part')
+        
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                event_count = self.stream_calendar(destination, events, start_date, f)
+            if event_count:
+                os.replace(temp_path, filepath)
+                self._last_ics_path = filepath
+        finally:
+            # A failed or empty stream (bad event, full disk) leaves nothing behind
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return event_count
+
+    def _update_calendar(self, destination: str, events: Iterable[Dict], start_date: str, filename: str) -> str:
+        """Diff the events against the previous calendar and write the updated calendar (and delta)."""
+        filepath = os.path.join(self.output_dir, filename) if self.output_dir else None
+        previous = self.last_ics
+        if filepath and os.path.exists(filepath):
+            with open(filepath, 'rb') as f:
+                previous = f.read()
+        
+        tz = self._resolve_timezone(destination)
+        ics, delta, diff = update_calendar(
+            self._calendar_properties(destination, tz),
+            self._event_properties(events, start_date, tz),
+            previous,
+            self._timezone_components(tz, start_date),
+        )
+        event_count = len(diff.added) + len(diff.changed) + len(diff.unchanged)
+        if not event_count and not diff.cancelled:
+            if self._last_skipped:
+                return f"Error: None of the events had a readable date and time: {'; '.join(self._last_skipped[:5])}"
+            return "Error: No events could be parsed from the provided data."
+        
+        self._last_ics, self._last_ics_path = ics, None
+        self._last_delta, self._last_diff = delta, diff
+        
+        if previous and not diff.has_changes:
+            # Leave the file alone so clients (and file watchers) see nothing to re-import
+            return f"Calendar file unchanged: {filename}\nChanges: {diff.summary()}{self._conflict_report()}"
+        
+        if filepath:
+            os.makedirs(self.output_dir, exist_ok=True)
+            with open(filepath, 'wb') as f:
+                f.write(ics)
+            if self.write_delta:
+                with open(f"{filepath[:-len('.ics')]}.delta.ics", 'wb') as f:
+                    f.write(delta)
+        
+        return f"Calendar file successfully updated: {filename}\nChanges: {diff.summary()}{self._conflict_report()}\nYou can import this file into Google Calendar, Apple Calendar, Outlook, or any other calendar application."
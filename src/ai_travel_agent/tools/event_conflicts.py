@@ -0,0 +1,141 @@
+"""
+Schedule validation for calendar events.
+
+Checks a trip's events for double-booked slots (overlapping events) and
+impossible transitions (back-to-back events at different places with no time
+to get from one to the other). Events are sorted once and checked with a single
+sweep that keeps the latest-ending event seen so far, so validation is
+O(n log n) even for large group itineraries. Conflicts are either reported or
+resolved by shifting the later event, keeping its duration. For streamed
+calendars, ``validate_by_day`` sorts one day's events at a time so memory is
+bounded by the busiest day rather than the whole trip.
+"""
+
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from itertools import groupby
+from typing import Any, Dict, Generator, Iterable, Iterator, List, Optional
+
+# "off" skips validation, "report" lists conflicts, "shift" also moves events to resolve them
+CONFLICT_POLICIES = ('off', 'report', 'shift')
+
+# Time allowed for getting from one venue to the next
+DEFAULT_TRANSFER_TIME = timedelta(minutes=15)
+
+
+@dataclass
+class ScheduledEvent:
+    """An event with its parsed (local) start and end times."""
+    start: datetime
+    end: datetime
+    data: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def title(self) -> str:
+        return self.data.get('title', 'Travel Activity')
+
+    @property
+    def location(self) -> str:
+        return self.data.get('location', '')
+
+
+@dataclass(frozen=True)
+class Conflict:
+    """A scheduling problem between two events; ``shifted_by`` is set when it was resolved."""
+    kind: str  # 'overlap' or 'transition'
+    first: str
+    second: str
+    at: datetime
+    shifted_by: Optional[timedelta] = None
+
+    def __str__(self) -> str:
+        when = self.at.strftime('%Y-%m-%d %H:%M')
+        if self.kind == 'overlap':
+            text = f"'{self.second}' overlaps '{self.first}' at {when}"
+        else:
+            text = f"no time to travel from '{self.first}' to '{self.second}' at {when}"
+        if self.shifted_by:
+            text += f" (moved {int(self.shifted_by.total_seconds() // 60)} min later)"
+        return text
+
+
+def _place(location: str) -> str:
+    return re.sub(r'\W+', ' ', location.casefold()).strip()
+
+
+def same_place(first: str, second: str) -> bool:
+    """Whether two locations are the same venue: unknown, equal, or one naming part of the other."""
+    first, second = _place(first), _place(second)
+    if not first or not second:
+        return True
+    return first == second or first in second or second in first
+
+
+class ScheduleValidator:
+    """Finds, and optionally resolves, conflicts in a sequence of scheduled events."""
+
+    def __init__(self, shift: bool = False, transfer_time: timedelta = DEFAULT_TRANSFER_TIME):
+        self.shift = shift
+        self.transfer_time = transfer_time
+        self.conflicts: List[Conflict] = []
+
+    def validate(self, events: Iterable[ScheduledEvent]) -> Iterator[ScheduledEvent]:
+        """Yield the events in chronological order, recording conflicts in ``self.conflicts``.
+
+        In shift mode a conflicting event is moved to start once the previous
+        event (plus the transfer time, when the venue changes) is over. Shifted
+        events can only move later, so the output stays sorted.
+        """
+        yield from self._sweep(events, None)
+
+    def validate_by_day(self, events: Iterable[ScheduledEvent]) -> Iterator[ScheduledEvent]:
+        """Like ``validate``, but holding only one day's events at a time.
+
+        Consecutive events with the same start date form a window that is
+        sorted and swept, carrying the latest-ending event over to the next
+        day. Itineraries list their days in order; a window dated before the
+        previous one starts a fresh sweep instead of being compared with later
+        days, so the output is only sorted within each day.
+        """
+        latest: Optional[ScheduledEvent] = None
+        last_day = None
+        for day, window in groupby(events, key=lambda event: event.start.date()):
+            if last_day is not None and day < last_day:
+                latest = None
+            last_day = day
+            latest = yield from self._sweep(window, latest)
+
+    def _sweep(self, events: Iterable[ScheduledEvent],
+               latest: Optional[ScheduledEvent]) -> Generator[ScheduledEvent, None, Optional[ScheduledEvent]]:
+        """Sort events and check each against the latest-ending one before it; returns the last latest."""
+        # Stable sort: events starting together keep their original order
+        ordered = sorted(events, key=lambda event: (event.start, event.end))
+
+        for event in ordered:
+            if latest is not None:
+                conflict = self._check(latest, event)
+                if conflict:
+                    self.conflicts.append(conflict)
+            if latest is None or event.end > latest.end:
+                latest = event
+            yield event
+        return latest
+
+    def _check(self, previous: ScheduledEvent, event: ScheduledEvent) -> Optional[Conflict]:
+        """Compare an event with the latest-ending event before it."""
+        if event.start < previous.end:
+            kind, earliest = 'overlap', previous.end
+        else:
+            earliest = previous.end + self.transfer_time
+            if event.start >= earliest or same_place(previous.location, event.location):
+                return None
+            kind = 'transition'
+        if kind == 'overlap' and not same_place(previous.location, event.location):
+            earliest += self.transfer_time
+
+        shifted_by = None
+        if self.shift:
+            shifted_by = earliest - event.start
+            event.start, event.end = earliest, event.end + shifted_by
+        return Conflict(kind, previous.title, event.title, event.start - (shifted_by or timedelta(0)), shifted_by)
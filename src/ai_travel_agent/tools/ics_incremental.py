@@ -0,0 +1,140 @@
+"""
+Incremental calendar updates.
+
+Re-planning a trip should not make calendar clients re-import every event.
+Events get UIDs derived from their content (title and day), so they keep the
+same identity when their time, place or description changes. A new calendar is
+diffed against the previous one: unchanged events are carried over as they
+were, changed events get their SEQUENCE bumped and a new DTSTAMP, and events
+that disappeared are published as CANCELLED (with a new DTSTAMP as well).
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from io import BytesIO
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from icalendar import Calendar, Event
+
+from ai_travel_agent.tools.ics_writer import IcsStreamWriter, format_value
+
+# Properties whose change makes an event "changed" for calendar clients
+CHANGE_FIELDS = ('SUMMARY', 'DTSTART', 'DTEND', 'LOCATION', 'DESCRIPTION')
+
+Properties = List[Tuple[str, Any]]
+
+
+def stable_uid(title: str, day: date, occurrence: int = 1) -> str:
+    """UID that survives edits to an event's time, location and description."""
+    normalized = re.sub(r'\W+', ' ', title.casefold()).strip()
+    digest = hashlib.sha1(f"{normalized}|{day.isoformat()}|{occurrence}".encode('utf-8')).hexdigest()[:16]
+    return f"{day.strftime('%Y%m%d')}-{digest}@ai-travel-agent"
+
+
+def _names(properties: Properties) -> Dict[str, Any]:
+    return {name.split(';', 1)[0].upper(): value for name, value in properties}
+
+
+def _fingerprint(values: Dict[str, Any]) -> Tuple[str, ...]:
+    return tuple(format_value(getattr(values.get(name), 'dt', values.get(name)) or '') for name in CHANGE_FIELDS)
+
+
+def load_events(ics: bytes) -> Dict[str, Event]:
+    """Index the VEVENTs of a serialized calendar by UID."""
+    if not ics:
+        return {}
+    calendar = Calendar.from_ical(ics)
+    return {str(event.get('UID')): event for event in calendar.walk('VEVENT') if event.get('UID')}
+
+
+@dataclass
+class CalendarDiff:
+    """How a regenerated calendar differs from the previous one."""
+    added: List[Properties] = field(default_factory=list)
+    changed: List[Properties] = field(default_factory=list)
+    unchanged: List[Properties] = field(default_factory=list)
+    cancelled: List[Event] = field(default_factory=list)
+    # Events cancelled in an earlier update; kept as they are
+    already_cancelled: List[Event] = field(default_factory=list)
+    # Every current event in its original order, tagged 'added', 'changed' or 'unchanged'
+    ordered: List[Tuple[str, Properties]] = field(default_factory=list)
+
+    def _record(self, status: str, properties: Properties) -> None:
+        getattr(self, status).append(properties)
+        self.ordered.append((status, properties))
+
+    @property
+    def has_changes(self) -> bool:
+        """Whether any event was added, changed or cancelled since the previous calendar."""
+        return bool(self.added or self.changed or self.cancelled)
+
+    def summary(self) -> str:
+        return (f"{len(self.added)} added, {len(self.changed)} changed, "
+                f"{len(self.cancelled)} cancelled, {len(self.unchanged)} unchanged")
+
+
+def diff_events(events: Iterable[Properties], previous: Dict[str, Event]) -> CalendarDiff:
+    """Match new events to the previous calendar by UID and assign their SEQUENCE."""
+    diff = CalendarDiff()
+    seen = set()
+
+    for properties in events:
+        values = _names(properties)
+        uid = str(values['UID'])
+        seen.add(uid)
+        old = previous.get(uid)
+        if old is None:
+            diff._record('added', properties + [('sequence', 0)])
+            continue
+
+        sequence = int(old.get('SEQUENCE', 0))
+        if str(old.get('STATUS', '')).upper() != 'CANCELLED' and _fingerprint(values) == _fingerprint(old):
+            # Keep the old stamp too, so clients see an identical event
+            carried = [(name, old['DTSTAMP'].dt if name.upper() == 'DTSTAMP' and 'DTSTAMP' in old else value)
+                       for name, value in properties]
+            diff._record('unchanged', carried + [('sequence', sequence)])
+        else:
+            diff._record('changed', properties + [('sequence', sequence + 1)])
+
+    for uid, old in previous.items():
+        if uid in seen:
+            continue
+        if str(old.get('STATUS', '')).upper() == 'CANCELLED':
+            diff.already_cancelled.append(old)
+            continue
+        cancelled = Event.from_ical(old.to_ical())
+        for name in ('SEQUENCE', 'STATUS', 'DTSTAMP'):
+            cancelled.pop(name, None)
+        cancelled.add('dtstamp', datetime.now(timezone.utc))
+        cancelled.add('sequence', int(old.get('SEQUENCE', 0)) + 1)
+        cancelled.add('status', 'CANCELLED')
+        diff.cancelled.append(cancelled)
+
+    return diff
+
+
+def write_calendar(stream, calendar_properties: Properties, diff: CalendarDiff, delta_only: bool = False,
+                   components: Iterable[bytes] = ()) -> int:
+    """Write the updated calendar (or only its changes) and return the number of VEVENTs written."""
+    with IcsStreamWriter(stream, calendar_properties, components) as writer:
+        for status, properties in diff.ordered:
+            if not (delta_only and status == 'unchanged'):
+                writer.write_event(properties)
+        components = diff.cancelled if delta_only else diff.already_cancelled + diff.cancelled
+        for component in components:
+            writer.write_raw(component.to_ical())
+            writer.events_written += 1
+    return writer.events_written
+
+
+def update_calendar(calendar_properties: Properties, events: Iterable[Properties],
+                    previous_ics: Optional[bytes], components: Iterable[bytes] = ()) -> Tuple[bytes, bytes, CalendarDiff]:
+    """Diff events against a previous calendar; returns the full calendar, the delta and the diff."""
+    diff = diff_events(events, load_events(previous_ics or b''))
+    components = list(components)
+    full, delta = BytesIO(), BytesIO()
+    write_calendar(full, calendar_properties, diff, components=components)
+    write_calendar(delta, calendar_properties, diff, delta_only=True, components=components)
+    return full.getvalue(), delta.getvalue(), diff
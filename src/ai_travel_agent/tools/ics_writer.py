@@ -0,0 +1,131 @@
+"""
+Streaming iCalendar (RFC 5545) writer.
+
+Writes calendar components one at a time to any binary stream (a file, a
+socket's makefile('wb'), a BytesIO), so memory use does not grow with the
+number of events the way building a whole icalendar.Calendar does.
+"""
+
+from datetime import date, datetime, timezone
+from typing import Any, BinaryIO, Iterable, Optional, Tuple
+
+# Content lines are folded so no line exceeds 75 octets, excluding the CRLF
+MAX_LINE_OCTETS = 75
+CRLF = b'\r\n'
+
+
+def escape_text(value: str) -> str:
+    """Escape a TEXT property value."""
+    return (
+        value.replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\r\n', '\\n')
+        .replace('\n', '\\n')
+        .replace('\r', '\\n')
+    )
+
+
+def tzid(value: datetime) -> Optional[str]:
+    """The IANA name of an aware, non-UTC datetime's timezone (pytz or zoneinfo)."""
+    if value.tzinfo is None:
+        return None
+    zone = getattr(value.tzinfo, 'zone', None) or getattr(value.tzinfo, 'key', None)
+    return None if zone in ('UTC', 'Etc/UTC') else zone
+
+
+def format_value(value: Any, escape: bool = True) -> str:
+    """Serialize a property value: datetimes, dates, numbers and (escaped) text."""
+    if isinstance(value, datetime):
+        if value.tzinfo is not None and tzid(value) is None:
+            # UTC, or an offset without a zone name
+            return value.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        # Naive ("floating") times and local times qualified by a TZID parameter
+        return value.strftime('%Y%m%dT%H%M%S')
+    if isinstance(value, date):
+        return value.strftime('%Y%m%d')
+    if isinstance(value, (int, float)):
+        return str(value)
+    text = str(value)
+    if not escape:
+        # Still keep the value on one content line
+        return text.replace('\r\n', '\\n').replace('\n', '\\n')
+    return escape_text(text)
+
+
+def fold_line(line: str) -> bytes:
+    """Encode a content line, folding it at 75 octets without splitting UTF-8 sequences."""
+    data = line.encode('utf-8')
+    if len(data) <= MAX_LINE_OCTETS:
+        return data + CRLF
+
+    chunks = []
+    start, limit = 0, MAX_LINE_OCTETS
+    while start < len(data):
+        end = min(start + limit, len(data))
+        # Back off so a multi-byte character is never cut in half
+        while end < len(data) and (data[end] & 0xC0) == 0x80:
+            end -= 1
+        chunks.append(data[start:end])
+        start = end
+        # Continuation lines start with a space, which counts towards the limit
+        limit = MAX_LINE_OCTETS - 1
+    return b'\r\n '.join(chunks) + CRLF
+
+
+class IcsStreamWriter:
+    """Writes a VCALENDAR incrementally.
+
+    Use as a context manager: the calendar header is written on enter and the
+    closing line on exit. Aware datetimes get their TZID parameter
+    automatically; the matching VTIMEZONE components are passed, already
+    serialized, as ``components`` and written right after the header.
+    """
+
+    def __init__(self, stream: BinaryIO, properties: Iterable[Tuple[str, Any]] = (),
+                 components: Iterable[bytes] = ()):
+        self.stream = stream
+        self.properties = list(properties)
+        self.components = list(components)
+        self.events_written = 0
+
+    def __enter__(self) -> 'IcsStreamWriter':
+        self.begin('VCALENDAR')
+        for name, value in self.properties:
+            self.write_property(name, value)
+        for component in self.components:
+            self.write_raw(component)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.end('VCALENDAR')
+        self.stream.flush()
+
+    def begin(self, component: str) -> None:
+        self.stream.write(f'BEGIN:{component}'.encode('ascii') + CRLF)
+
+    def end(self, component: str) -> None:
+        self.stream.write(f'END:{component}'.encode('ascii') + CRLF)
+
+    def write_property(self, name: str, value: Any) -> None:
+        # Only the name is case-insensitive; parameter values such as a TZID are kept as given
+        prop, separator, params = name.partition(';')
+        prop = prop.upper()
+        zone = tzid(value) if isinstance(value, datetime) else None
+        if zone and 'TZID=' not in params.upper():
+            params, separator = f'{params};TZID={zone}'.lstrip(';'), ';'
+        # Like icalendar, non-standard X- properties are written without TEXT escaping
+        value = format_value(value, escape=not prop.startswith('X-'))
+        self.stream.write(fold_line(f'{prop}{separator}{params}:{value}'))
+
+    def write_raw(self, data: bytes) -> None:
+        """Write already serialized content lines, e.g. a VTIMEZONE component."""
+        self.stream.write(data)
+
+    def write_event(self, properties: Iterable[Tuple[str, Any]]) -> None:
+        """Write one VEVENT with the given (name, value) properties."""
+        self.begin('VEVENT')
+        for name, value in properties:
+            self.write_property(name, value)
+        self.end('VEVENT')
+        self.events_written += 1
@@ -0,0 +1,166 @@
+from crewai.tools import BaseTool
+from concurrent.futures import Future
+from typing import Any, Dict, Optional, Type
+from pydantic import BaseModel, Field, PrivateAttr
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+from ai_travel_agent.cache import cache_root, env_float
+
+DEFAULT_SEARCH_TTL_SECONDS = 24 * 60 * 60
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a search query so trivially different spellings share a cache entry."""
+    query = unicodedata.normalize('NFKC', query or '').casefold()
+    query = re.sub(r'\s+', ' ', query).strip()
+    return query.strip('"\'').rstrip('?.! ')
+
+
+class SQLiteSearchStore:
+    """Search results persisted in a local SQLite database with TTL expiry."""
+
+    def __init__(self, path: Optional[str] = None, ttl_seconds: Optional[float] = None):
+        self.path = path or os.path.join(cache_root(), 'search.sqlite3')
+        self.ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None
+            else env_float('TRAVEL_AGENT_SEARCH_TTL', DEFAULT_SEARCH_TTL_SECONDS)
+        )
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS search_results ('
+                'key TEXT PRIMARY KEY, query TEXT, result TEXT, created REAL)'
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # A connection per call keeps the store safe to share across threads
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT result, created FROM search_results WHERE key = ?', (key,)
+            ).fetchone()
+        if row is None or time.time() - row[1] > self.ttl_seconds:
+            return None
+        return json.loads(row[0])
+
+    def set(self, key: str, query: str, result: Any) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO search_results (key, query, result, created) VALUES (?, ?, ?, ?)',
+                (key, query, json.dumps(result, ensure_ascii=False), now),
+            )
+            conn.execute('DELETE FROM search_results WHERE created < ?', (now - self.ttl_seconds,))
+
+
+class FixtureSearchStore:
+    """Read-mostly store backed by a JSON file of normalized query -> result.
+
+    Lets the researcher run offline (tests, demos) behind the same interface
+    as the SQLite store. New results are kept in memory only.
+    """
+
+    def __init__(self, path: Optional[str] = None, results: Optional[Dict[str, Any]] = None):
+        self.path = path
+        self.results: Dict[str, Any] = {}
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.results.update(json.load(f))
+        if results:
+            self.results.update(results)
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.results.get(key)
+
+    def set(self, key: str, query: str, result: Any) -> None:
+        self.results[key] = result
+
+
+class CachedSearchInput(BaseModel):
+    """Input schema for CachedSearchTool."""
+    search_query: str = Field(..., description="Mandatory search query you want to use to search the internet")
+
+
+class CachedSearchTool(BaseTool):
+    name: str = "Search the internet with Serper"
+    description: str = (
+        "A tool that can be used to search the internet with a search_query. "
+        "Results for recently searched queries are returned instantly from a local cache."
+    )
+    args_schema: Type[BaseModel] = CachedSearchInput
+    search_tool: Optional[BaseTool] = Field(
+        default=None, description="Live search tool used on cache misses (e.g. SerperDevTool)."
+    )
+    store: Any = Field(
+        default_factory=SQLiteSearchStore, description="Result store with get(key) and set(key, query, result)."
+    )
+
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _in_flight: Dict[str, Future] = PrivateAttr(default_factory=dict)
+    _hits: int = PrivateAttr(default=0)
+    _misses: int = PrivateAttr(default=0)
+    _coalesced: int = PrivateAttr(default=0)
+    # Outcome of each thread's latest lookup; crewai runs a tool and emits its usage event on the same thread
+    _last: threading.local = PrivateAttr(default_factory=threading.local)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters; coalesced counts callers that waited on an identical in-flight query."""
+        with self._lock:
+            return {'hits': self._hits, 'misses': self._misses, 'coalesced': self._coalesced}
+
+    def take_outcome(self) -> Optional[str]:
+        """Outcome of the calling thread's latest lookup ('hit', 'miss' or 'coalesced'), cleared once read."""
+        outcome = getattr(self._last, 'outcome', None)
+        self._last.outcome = None
+        return outcome
+
+    def _run(self, search_query: str, **kwargs: Any) -> Any:
+        key = normalize_query(search_query)
+
+        cached = self.store.get(key)
+        if cached is not None:
+            with self._lock:
+                self._hits += 1
+            self._last.outcome = 'hit'
+            return cached
+
+        # Merge identical queries that are already being fetched by another thread
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+                self._misses += 1
+            else:
+                self._coalesced += 1
+        self._last.outcome = 'miss' if leader else 'coalesced'
+
+        if not leader:
+            return future.result()
+
+        try:
+            if self.search_tool is None:
+                result = f"Error: No cached results for '{search_query}' and live search is unavailable."
+            else:
+                result = self.search_tool._run(search_query=search_query, **kwargs)
+                self.store.set(key, search_query, result)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
@@ -0,0 +1,359 @@
+"""
+Styles for the Streamlit app's dark theme.
+
+Kept out of ``app.py`` so the string is built once per process on import
+instead of on every script rerun.
+"""
+
+THEME_CSS = """
+<style>
+    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
+    
+    * {
+        font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
+    }
+    
+    /* Hide Streamlit branding */
+    #MainMenu {visibility: hidden;}
+    footer {visibility: hidden;}
+    
+    /* Main app background */
+    .main {
+        background-color: #0f1419;
+    }
+    
+    /* Header styling - Dark theme */
+    .main-header {
+        background: linear-gradient(135deg, #1a1f2e 0%, #2d3748 100%);
+        padding: 2.5rem;
+        border-radius: 12px;
+        color: #e2e8f0;
+        text-align: center;
+        margin-bottom: 2rem;
+        border: 1px solid #2d3748;
+    }
+    
+    .main-header h1 {
+        margin: 0;
+        font-size: 2.5rem;
+        font-weight: 700;
+        letter-spacing: -0.5px;
+        color: #ffffff;
+    }
+    
+    .main-header p {
+        margin: 0.75rem 0 0 0;
+        font-size: 1.05rem;
+        opacity: 0.8;
+        font-weight: 400;
+        color: #94a3b8;
+    }
+    
+    /* Sidebar dark theme */
+    section[data-testid="stSidebar"] {
+        background-color: #1a1f2e;
+        border-right: 1px solid #2d3748;
+    }
+    
+    section[data-testid="stSidebar"] > div {
+        padding: 2rem 1rem;
+    }
+    
+    /* Sidebar headings */
+    section[data-testid="stSidebar"] h1 {
+        color: #ffffff;
+        font-size: 1.5rem;
+        font-weight: 700;
+        margin-bottom: 1.5rem;
+    }
+    
+    section[data-testid="stSidebar"] h3 {
+        color: #e2e8f0;
+        font-weight: 700;
+        margin-top: 0.5rem;
+    }
+    
+    /* Sidebar text */
+    section[data-testid="stSidebar"] label {
+        color: #cbd5e1;
+        font-weight: 600;
+        font-size: 0.9rem;
+    }
+    
+    section[data-testid="stSidebar"] p {
+        color: #94a3b8;
+    }
+    
+    /* Chat message styling - Dark theme */
+    .chat-message {
+        padding: 1.25rem 1.5rem;
+        border-radius: 10px;
+        margin-bottom: 1rem;
+        border: 1px solid #2d3748;
+        animation: fadeIn 0.3s ease-in;
+        line-height: 1.6;
+    }
+    
+    @keyframes fadeIn {
+        from { opacity: 0; transform: translateY(10px); }
+        to { opacity: 1; transform: translateY(0); }
+    }
+    
+    .user-message {
+        background-color: #1e293b;
+        border-left: 3px solid #3b82f6;
+        margin-left: 2rem;
+        color: #e2e8f0;
+        font-weight: 400;
+    }
+    
+    .assistant-message {
+        background-color: #1a2332;
+        border-left: 3px solid #10b981;
+        margin-right: 2rem;
+        color: #e2e8f0;
+        font-weight: 400;
+    }
+    
+    .system-message {
+        background-color: #1f2937;
+        border-left: 3px solid #f59e0b;
+        color: #e2e8f0;
+        font-weight: 400;
+    }
+    
+    .chat-message strong {
+        display: block;
+        margin-bottom: 0.5rem;
+        font-size: 0.75rem;
+        font-weight: 600;
+        text-transform: uppercase;
+        letter-spacing: 1px;
+        opacity: 0.7;
+        color: #94a3b8;
+    }
+    
+    /* Button styling - Dark theme */
+    .stButton > button {
+        border-radius: 8px;
+        padding: 0.65rem 1.5rem;
+        font-weight: 600;
+        transition: all 0.2s ease;
+        border: 1px solid #2d3748;
+        font-size: 0.95rem;
+        width: 100%;
+        background-color: #1e293b;
+        color: #ffffff;
+    }
+    
+    .stButton > button:hover {
+        background-color: #334155;
+        border-color: #475569;
+        transform: translateY(-1px);
+    }
+    
+    /* Primary button */
+    button[kind="primary"] {
+        background-color: #3b82f6 !important;
+        color: white !important;
+        border: 1px solid #2563eb !important;
+    }
+    
+    button[kind="primary"]:hover {
+        background-color: #2563eb !important;
+        border-color: #1d4ed8 !important;
+    }
+    
+    /* Control section styling - Dark theme */
+    .control-header {
+        font-size: 0.85rem;
+        font-weight: 700;
+        color: #94a3b8;
+        margin: 1.5rem 0 1rem 0;
+        padding-bottom: 0.5rem;
+        border-bottom: 1px solid #2d3748;
+        text-transform: uppercase;
+        letter-spacing: 1px;
+    }
+    
+    /* Stats box - Dark theme */
+    .stats-container {
+        background-color: #1e293b;
+        padding: 1.25rem;
+        border-radius: 10px;
+        margin-top: 1rem;
+        border: 1px solid #2d3748;
+        border-left: 3px solid #3b82f6;
+    }
+    
+    .stats-container h3 {
+        margin: 0 0 0.75rem 0;
+        font-size: 0.85rem;
+        font-weight: 700;
+        color: #cbd5e1;
+        text-transform: uppercase;
+        letter-spacing: 1px;
+    }
+    
+    .stats-container p {
+        margin: 0.4rem 0;
+        font-size: 0.9rem;
+        color: #94a3b8;
+        font-weight: 400;
+    }
+    
+    .stats-container strong {
+        color: #e2e8f0;
+    }
+    
+    /* Info boxes - Dark theme */
+    .info-box {
+        background-color: #1e293b;
+        padding: 1.25rem;
+        border-radius: 10px;
+        border-left: 3px solid #10b981;
+        border: 1px solid #2d3748;
+        margin: 1rem 0;
+    }
+    
+    .success-box {
+        background-color: #1e293b;
+        padding: 1.75rem;
+        border-radius: 10px;
+        border: 1px solid #10b981;
+        margin: 1rem 0;
+    }
+    
+    /* Tab styling - Dark theme */
+    .stTabs [data-baseweb="tab-list"] {
+        gap: 8px;
+        background-color: #1a1f2e;
+        padding: 0.5rem;
+        border-radius: 10px;
+        border-bottom: 1px solid #2d3748;
+    }
+    
+    .stTabs [data-baseweb="tab"] {
+        border-radius: 8px;
+        padding: 0.75rem 1.5rem;
+        font-weight: 600;
+        color: #94a3b8;
+        background-color: transparent;
+    }
+    
+    .stTabs [data-baseweb="tab"][aria-selected="true"] {
+        background-color: #1e293b;
+        color: #e2e8f0;
+    }
+    
+    /* Input fields - Dark theme */
+    .stTextInput input, .stTextArea textarea, .stNumberInput input {
+        border-radius: 8px;
+        border: 1px solid #2d3748;
+        padding: 0.6rem;
+        font-size: 0.95rem;
+        background-color: #1e293b;
+        color: #e2e8f0;
+    }
+    
+    .stTextInput input:focus, .stTextArea textarea:focus, .stNumberInput input:focus {
+        border-color: #3b82f6;
+        box-shadow: 0 0 0 2px rgba(59, 130, 246, 0.2);
+        background-color: #1e293b;
+    }
+    
+    /* Expander - Dark theme */
+    .streamlit-expanderHeader {
+        background-color: #1e293b !important;
+        border-radius: 8px;
+        font-weight: 600;
+        border: 1px solid #2d3748 !important;
+        color: #e2e8f0 !important;
+    }
+    
+    .streamlit-expanderHeader:hover {
+        border-color: #3b82f6 !important;
+        background-color: #1e293b !important;
+    }
+    
+    /* Expander content */
+    .streamlit-expanderContent {
+        background-color: #1a1f2e !important;
+        border: 1px solid #2d3748;
+        border-top: none;
+        border-radius: 0 0 8px 8px;
+        padding: 1.5rem !important;
+    }
+    
+    /* Ensure all sidebar inputs are visible - Dark theme */
+    section[data-testid="stSidebar"] input,
+    section[data-testid="stSidebar"] textarea,
+    section[data-testid="stSidebar"] [data-baseweb="select"],
+    section[data-testid="stSidebar"] [data-baseweb="input"] {
+        background-color: #1e293b !important;
+        color: #e2e8f0 !important;
+        border: 1px solid #2d3748 !important;
+    }
+    
+    section[data-testid="stSidebar"] input:focus,
+    section[data-testid="stSidebar"] textarea:focus {
+        border-color: #3b82f6 !important;
+        background-color: #1e293b !important;
+        box-shadow: 0 0 0 2px rgba(59, 130, 246, 0.2) !important;
+    }
+    
+    /* Date picker in sidebar */
+    section[data-testid="stSidebar"] [data-testid="stDateInput"] > div > div {
+        background-color: #1e293b !important;
+        border-color: #2d3748 !important;
+    }
+    
+    section[data-testid="stSidebar"] [data-testid="stDateInput"] input {
+        color: #e2e8f0 !important;
+        background-color: #1e293b !important;
+    }
+    
+    /* Number input in sidebar */
+    section[data-testid="stSidebar"] [data-testid="stNumberInput"] input {
+        background-color: #1e293b !important;
+        color: #e2e8f0 !important;
+    }
+    
+    /* Sidebar dividers */
+    section[data-testid="stSidebar"] hr {
+        margin: 1.5rem 0;
+        border-color: #2d3748;
+    }
+    
+    /* Streamlit specific overrides for dark theme */
+    [data-testid="stMarkdownContainer"] {
+        color: #e2e8f0;
+    }
+    
+    .stMarkdown {
+        color: #e2e8f0;
+    }
+    
+    /* Alert boxes dark theme */
+    .stAlert {
+        background-color: #1e293b;
+        border: 1px solid #2d3748;
+        color: #e2e8f0;
+    }
+    
+    .stWarning {
+        background-color: #1e293b;
+        border-left: 3px solid #f59e0b;
+    }
+    
+    .stInfo {
+        background-color: #1e293b;
+        border-left: 3px solid #3b82f6;
+    }
+    
+    .stSuccess {
+        background-color: #1e293b;
+        border-left: 3px solid #10b981;
+    }
+</style>
+"""
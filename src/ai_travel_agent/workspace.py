@@ -0,0 +1,82 @@
+"""
+Per-run export workspaces.
+
+Every crew run writes its itinerary, calendar events and .ics file into its own
+directory keyed by a run ID, so concurrent runs in one process never overwrite
+each other's files.
+"""
+
+import os
+import shutil
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+from ai_travel_agent.cache import env_float
+
+RUNS_DIR = os.path.join('exports', 'runs')
+
+ITINERARY_FILENAME = 'travel_itinerary.md'
+CALENDAR_EVENTS_FILENAME = 'calendar_events.txt'
+TRANSCRIPT_FILENAME = 'failed_run_transcript.log'
+
+# Run folders kept under RUNS_DIR (TRAVEL_AGENT_KEEP_RUNS overrides it, 0 keeps all)
+DEFAULT_KEEP_RUNS = 50
+
+
+def new_run_id() -> str:
+    """Return a sortable, collision-free identifier for a crew run."""
+    return f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+
+def prune_runs(base_dir: str = RUNS_DIR, keep: Optional[int] = None) -> List[str]:
+    """Delete all but the newest ``keep`` run folders under base_dir; returns the deleted paths.
+
+    Run IDs start with their creation time, so name order is age order (to the second).
+    """
+    keep = int(env_float('TRAVEL_AGENT_KEEP_RUNS', DEFAULT_KEEP_RUNS)) if keep is None else keep
+    if keep <= 0 or not os.path.isdir(base_dir):
+        return []
+    runs = sorted(entry.name for entry in os.scandir(base_dir) if entry.is_dir())
+    removed = [os.path.join(base_dir, name) for name in runs[:-keep]]
+    for path in removed:
+        # Another session may be pruning at the same time
+        shutil.rmtree(path, ignore_errors=True)
+    return removed
+
+
+def ics_filename(destination: str) -> str:
+    """Name of the calendar file the CalendarGeneratorTool writes for a destination."""
+    return f"{destination.replace(' ', '_')}_itinerary.ics"
+
+
+@dataclass
+class RunWorkspace:
+    """The export directory owned by a single crew run."""
+    run_id: str
+    directory: str
+
+    @classmethod
+    def create(cls, base_dir: str = RUNS_DIR, run_id: Optional[str] = None) -> 'RunWorkspace':
+        """Create a fresh workspace directory under base_dir."""
+        run_id = run_id or new_run_id()
+        directory = os.path.join(base_dir, run_id)
+        os.makedirs(directory, exist_ok=True)
+        return cls(run_id=run_id, directory=directory)
+
+    @property
+    def itinerary_path(self) -> str:
+        return os.path.join(self.directory, ITINERARY_FILENAME)
+
+    @property
+    def calendar_events_path(self) -> str:
+        return os.path.join(self.directory, CALENDAR_EVENTS_FILENAME)
+
+    @property
+    def transcript_path(self) -> str:
+        return os.path.join(self.directory, TRANSCRIPT_FILENAME)
+
+    def ics_path(self, destination: str) -> str:
+        return os.path.join(self.directory, ics_filename(destination))
+
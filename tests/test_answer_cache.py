@@ -0,0 +1,55 @@
+import pytest
+
+from ai_travel_agent.cache import AnswerCache
+from ai_travel_agent.qa_context import cache_history, is_follow_up
+
+ITINERARY = "# Paris\n\n## Day 1\n\nLouvre, then dinner at Le Procope.\n\n## Day 2\n\nOrsay and Montmartre."
+MODEL = 'gpt-4o'
+
+
+@pytest.fixture
+def answer_cache(tmp_path):
+    return AnswerCache(directory=str(tmp_path), ttl_seconds=60, max_bytes=1024 * 1024)
+
+
+def ask(answer_cache, question, history):
+    """Look the question up as the chat does; on a miss, answer and store it. Returns whether it hit."""
+    key_history = cache_history(question, history)
+    hit = answer_cache.get(ITINERARY, question, MODEL, key_history) is not None
+    if not hit:
+        answer_cache.put(ITINERARY, question, MODEL, f"answer to {question}", key_history)
+    history.extend([{'role': 'user', 'content': question}, {'role': 'assistant', 'content': 'ok'}])
+    return hit
+
+
+def test_repeated_question_hits_after_other_turns(answer_cache):
+    history = []
+    assert not ask(answer_cache, "What's for dinner on day 1?", history)
+    assert not ask(answer_cache, "Which museums are on day 2?", history)
+    assert not ask(answer_cache, "Where do we stay?", history)
+
+    assert ask(answer_cache, "what is for dinner on day 1", history)
+
+
+def test_follow_up_only_hits_after_the_same_turns(answer_cache):
+    history = []
+    ask(answer_cache, "What's for dinner on day 1?", history)
+    assert not ask(answer_cache, "How much does it cost?", history)
+
+    other = []
+    ask(answer_cache, "Which museums are on day 2?", other)
+    assert not ask(answer_cache, "How much does it cost?", other)
+
+    assert ask(answer_cache, "How much does it cost?", history[:2])
+
+
+@pytest.mark.parametrize('question, expected', [
+    ("What's for dinner on day 2?", False),
+    ("Where do we stay?", False),
+    ("And the day after?", True),
+    ("How much does it cost?", True),
+    ("What about Saturday?", True),
+    ("Can you suggest something else?", True),
+])
+def test_is_follow_up(question, expected):
+    assert is_follow_up(question) is expected
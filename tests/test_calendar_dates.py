@@ -0,0 +1,31 @@
+from datetime import datetime
+
+import pytest
+
+from ai_travel_agent.tools.custom_tool import CalendarGeneratorTool, DocumentFormats, EventDateError
+
+
+def events_text(start_time: str) -> str:
+    return '\n\n'.join([
+        "- Title: Louvre\n- Date: 2025-11-05\n- Start Time: 09:00\n- End Time: 11:00",
+        f"- Title: Dinner\n- Date: 2025-11-05\n- Start Time: {start_time}\n- End Time: 21:00",
+    ])
+
+
+@pytest.mark.parametrize('time_str', ['7.30pm', 'evening', ''])
+def test_unreadable_time_raises(time_str):
+    with pytest.raises(EventDateError, match='Unrecognized time'):
+        DocumentFormats().parse_datetime('2025-11-05', time_str)
+
+
+def test_readable_time_is_combined_with_the_date():
+    assert DocumentFormats().parse_datetime('2025-11-05', '7:30 PM') == datetime(2025, 11, 5, 19, 30)
+
+
+def test_event_with_unreadable_time_is_skipped_and_reported():
+    tool = CalendarGeneratorTool(output_dir=None)
+    ics, count = tool.build_calendar('Paris, France', events_text('7.30pm'), '2025-11-05')
+
+    assert count == 1
+    assert b'Dinner' not in ics
+    assert tool.last_skipped == ["Dinner (Unrecognized time: '7.30pm')"]